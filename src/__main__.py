@@ -1,3 +1,4 @@
+import asyncio
 import importlib.metadata
 import sys
 from contextlib import asynccontextmanager
@@ -10,13 +11,19 @@ from fastapi.responses import ORJSONResponse
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from fastapi_pagination import add_pagination
+from sqlalchemy.exc import SQLAlchemyError
 
 from common.services.telemetry import setup_telemetry
 from config.config import ServerEnv
 from src.api.di.db_helper import db_helper
 from src.api.di.di import ResourceModule
+from src.api.middleware.body_size_middleware import BodySizeLimitMiddleware
 from src.api.middleware.logging_middleware import LoggingMiddleware
 from src.api.routes import router
+from src.api.services.catalogue_service import catalogue_service
+from src.api.services.image_upload_service import image_upload_queue
+from src.api.services.stock_service import StockReservationService
+from src.common.services.job_queue import JobQueue
 from src.common.services.redis_service import RedisService
 from src.common.services.s3_service import S3Service
 from src.config.config import settings
@@ -32,6 +39,16 @@ async def check_health(app: FastAPI):
     logger.info("[+] Redis connection established")
 
 
+async def warm_catalogue_tree():
+    try:
+        async with db_helper.AsyncSessionFactory() as session:
+            await catalogue_service.load(session)
+        logger.info("[+] Category tree loaded")
+    except SQLAlchemyError as e:
+        # not fatal: the tree is loaded lazily on the first request
+        logger.warning("[!] Unable to preload category tree: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("[!] Initializing resources...")
@@ -44,7 +61,13 @@ async def lifespan(app: FastAPI):
         region=settings.AWS.S3_DEFAULT_REGION,
         endpoint=settings.AWS.S3_ENDPOINT_URL,
         bucket=settings.AWS.S3_BUCKET_NAME,
+        max_pool_connections=settings.AWS.S3_MAX_POOL_CONNECTIONS,
+        keepalive_timeout=settings.AWS.S3_KEEPALIVE_TIMEOUT,
+        upload_concurrency=settings.AWS.S3_UPLOAD_CONCURRENCY,
     )
+    await app.state.s3.open()
+    # Heavy work is queued for python -m src.worker
+    app.state.jobs = JobQueue(app.state.redis)
     logger.info("[+] Resources initialized successfully")
 
     # Redis Cache
@@ -53,11 +76,25 @@ async def lifespan(app: FastAPI):
     # Check health of services
     await check_health(app)
 
+    # In-process category tree + pub/sub invalidation
+    await warm_catalogue_tree()
+    catalogue_listener = asyncio.create_task(catalogue_service.listen(app.state.redis))
+    # Expired stock reservations
+    stock_reaper = asyncio.create_task(
+        StockReservationService.run_reaper(app.state.redis)
+    )
+    # Post-commit image uploads
+    image_upload_queue.start(app.state.s3, app.state.redis)
+
     try:
         yield
     finally:
         logger.warning("[!] Shutting down the application...")
+        catalogue_listener.cancel()
+        stock_reaper.cancel()
+        await image_upload_queue.close()
         await app.state.redis_service.close()
+        await app.state.s3.close()
         await db_helper.dispose()
 
 
@@ -92,6 +129,8 @@ add_pagination(app)
 #        FastAPI Middleware (FE + Logging)
 # --------------------------------------------------
 app.middleware("http")(LoggingMiddleware())
+# outermost: oversized uploads are cut off before anything reads them
+app.add_middleware(BodySizeLimitMiddleware)
 
 
 @app.exception_handler(RequestValidationError)
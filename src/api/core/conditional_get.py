@@ -0,0 +1,89 @@
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Header, HTTPException, Request, Response, status
+
+
+def cache_validators(
+    request: Request, last_modified: datetime | None, count: int
+) -> dict[str, str]:
+    """
+    ETag / Last-Modified headers from a DAO watermark (see BaseDAO.get_watermark).
+    The query string is part of the ETag: every page/filter has its own tag.
+    """
+    raw = f"{request.url.query}|{last_modified.isoformat() if last_modified else ''}|{count}"
+    headers = {"ETag": f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def entity_validators(entity, *embedded) -> dict[str, str]:
+    """
+    Headers of a single versioned entity: the strong `version` ETag, which
+    PATCH takes back as If-Match, and Last-Modified of the entity and the
+    parents nested into its response (`embedded`).
+    """
+    last_modified = max(row.updated_at for row in (entity, *embedded))
+    return {
+        **version_etag(entity),
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison: W/"x" == "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: str) -> bool:
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified(request: Request, validators: dict[str, str]) -> Response | None:
+    """
+    304 response if the client's copy is still valid, otherwise None.
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.2.2).
+    """
+    if if_none_match := request.headers.get("If-None-Match"):
+        matches = _etag_matches(if_none_match, validators["ETag"])
+    elif (if_modified_since := request.headers.get("If-Modified-Since")) and (
+        last_modified := validators.get("Last-Modified")
+    ):
+        matches = _not_modified_since(if_modified_since, last_modified)
+    else:
+        matches = False
+
+    if matches:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+    return None
+
+
+def if_match_version(if_match: str | None = Header(None)) -> int | None:
+    """
+    Route dependency for PATCH of versioned entities.
+    `If-Match: "<version>"` (the `version` field / ETag of the last response)
+    makes the update conditional; no header or `*` - unconditional update.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='If-Match must be an entity version, e.g. If-Match: "3"',
+        )
+
+
+def version_etag(entity) -> dict[str, str]:
+    return {"ETag": f'"{entity.version}"'}
@@ -1,16 +1,29 @@
-from typing import Annotated, Any, Sequence
+from typing import Annotated, Any
 
 from fastapi import HTTPException, UploadFile, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.exceptions.exceptions import DuplicateNameError
-from common.functions.check_file_mime_type import is_file_mime_type_correct
+from common.services.response_cache import mark_entity_stale
 from common.services.s3_service import S3Service
 from config import settings
+from src.api.services.image_upload_service import ReceivedImage, image_upload_queue
 from utils.logging import logger
 
 
+async def receive_image(
+    image_blob: UploadFile, upload_path: str, s3: S3Service
+) -> ReceivedImage:
+    try:
+        return await image_upload_queue.receive(image_blob, s3, upload_path)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"File contents don’t match the file extension: {e}",
+        )
+
+
 async def create_entity_with_optional_image(
     *,
     payload: BaseModel,
@@ -19,41 +32,34 @@ async def create_entity_with_optional_image(
     upload_path: str,
     db_session: AsyncSession,
     s3: S3Service,
-    refresh_fields: Sequence[str] = (),
     exception_cls: type[Exception] = DuplicateNameError,
 ) -> Annotated[Any | None, "SQLAlchemy Instance"]:
     data = payload.model_dump()
     data["image_url"] = settings.IMAGE_PLACEHOLDER_URL
+    image: ReceivedImage | None = None
 
     if image_blob and image_blob.filename:
-        try:
-            await is_file_mime_type_correct(image_blob)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                detail=f"File contents don’t match the file extension: {e}",
-            )
-
-        image_key = s3.generate_key(image_blob.filename, upload_path)
-        image_url = s3.get_file_url(key=image_key)
-        data["image_url"] = image_url
-
-        await s3.upload_file(
-            file=image_blob.file,
-            key=image_key,
-            extra_args={"ACL": "public-read", "ContentType": image_blob.content_type},
-        )
+        image = await receive_image(image_blob, upload_path, s3)
+        data["image_url"] = image.url
+        data.update(image.state)
 
     try:
         instance = await dao.add(**data, db_session=db_session)
+    except BaseException as e:
+        # the row is not written (or the request cancelled): drop the spooled file
+        if image:
+            image.discard()
+        if isinstance(e, exception_cls):
+            logger.warning(
+                f"Duplicate name/slug: {getattr(payload, 'slug', 'unknown')}"
+            )
+        raise
 
-        if refresh_fields:
-            await db_session.refresh(instance, list(refresh_fields))
-        return instance
-
-    except exception_cls as e:
-        logger.warning(f"Duplicate name/slug: {getattr(payload, 'slug', 'unknown')}")
-        raise e
+    mark_entity_stale(db_session, instance)
+    if image:
+        # uploaded after the commit, unless it is stored already
+        image_upload_queue.stage(db_session, instance, image)
+    return instance
 
 
 async def create_entity_with_image(
@@ -64,38 +70,28 @@ async def create_entity_with_image(
     upload_path: str,
     db_session: AsyncSession,
     s3: S3Service,
-    refresh_fields: Sequence[str] = (),
     exception_cls: type[Exception] = DuplicateNameError,
 ) -> Annotated[Any | None, "SQLAlchemy Instance"]:
-    try:
-        await is_file_mime_type_correct(image_blob)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=f"File contents don’t match the file extension: {e}",
-        )
-
-    image_key = s3.generate_key(image_blob.filename, upload_path)
-    image_url = s3.get_file_url(key=image_key)
+    image = await receive_image(image_blob, upload_path, s3)
 
     data = payload.model_dump()
-    data["image_url"] = image_url
+    data["image_url"] = image.url
+    data.update(image.state)
 
     try:
         instance = await dao.add(**data, db_session=db_session)
+    except BaseException as e:
+        image.discard()
+        if isinstance(e, exception_cls):
+            logger.warning(
+                f"Duplicate name/slug: {getattr(payload, 'slug', 'unknown')}"
+            )
+        raise
 
-        if refresh_fields:
-            await db_session.refresh(instance, list(refresh_fields))
-
-        await s3.upload_file(
-            file=image_blob.file,
-            key=image_key,
-            extra_args={"ACL": "public-read", "ContentType": image_blob.content_type},
-        )
-        return instance
-    except exception_cls as e:
-        logger.warning(f"Duplicate name/slug: {getattr(payload, 'slug', 'unknown')}")
-        raise e
+    mark_entity_stale(db_session, instance)
+    # uploaded after the commit, unless it is stored already
+    image_upload_queue.stage(db_session, instance, image)
+    return instance
 
 
 async def create_entity(
@@ -103,13 +99,11 @@ async def create_entity(
     payload: BaseModel,
     dao: Any,
     db_session: AsyncSession,
-    refresh_fields: Sequence[str] = (),
     exception_cls: type[Exception] = DuplicateNameError,
 ) -> Annotated[Any | None, "SQLAlchemy Instance"]:
     try:
         instance = await dao.add(**payload.model_dump(), db_session=db_session)
-        if refresh_fields:
-            await db_session.refresh(instance, list(refresh_fields))
+        mark_entity_stale(db_session, instance)
         return instance
     except exception_cls as e:
         logger.warning(f"Duplicate name/slug: {getattr(payload, 'slug', 'unknown')}")
@@ -7,6 +7,9 @@ from src.api.dao.category_dao import CategoryDAO
 from src.api.dao.offer_dao import OfferDAO
 from src.api.dao.sub_category_dao import SubCategoryDAO
 
+# the last feed built by the `yml_feed` job
+YML_FEED_KEY = "be-tcf:feed:yml"
+
 
 # --------------------------------------------------------
 # Helper: build YML as string
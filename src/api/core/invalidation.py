@@ -0,0 +1,101 @@
+from fastapi import Depends
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.di.db_helper import after_commit, db_helper
+from src.api.services.catalogue_service import catalogue_service
+from src.api.services.facet_service import FacetService
+from src.api.services.image_upload_service import (
+    IMAGE_UPLOADS_KEY,
+    image_upload_queue,
+)
+from src.api.services.stock_service import STOCK_CHANGES_KEY, StockReservationService
+from src.common.deps.job_queue import get_job_queue
+from src.common.deps.redis_service import get_redis_service
+from src.common.services.job_queue import STAGED_JOBS_KEY, JobQueue
+from src.common.services.response_cache import CACHE_TAGS_KEY, ResponseCache
+
+
+def invalidate_facets(
+    redis: Redis = Depends(get_redis_service),
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+) -> None:
+    """
+    Route dependency for catalogue writes.
+    Drops the cached facets once the `session_getter` transaction
+    has been committed.
+    """
+    after_commit(db_session, FacetService.invalidate, redis)
+
+
+def invalidate_catalogue_tree(
+    redis: Redis = Depends(get_redis_service),
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+) -> None:
+    """
+    Route dependency for category/sub-category writes.
+    Notifies every worker that its in-process category tree is stale
+    once the transaction has been committed: a reload before the commit
+    would keep the old tree until the next write.
+    """
+    after_commit(db_session, catalogue_service.publish_invalidation, redis)
+
+
+def invalidate_response_cache(
+    redis: Redis = Depends(get_redis_service),
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+) -> None:
+    """
+    Route dependency for writes under the response cache.
+    The route shares `db_session`, `mark_stale` collects the written rows' tags
+    into it; they are invalidated once the transaction has been committed.
+    """
+    tags: set[str] = db_session.info.setdefault(CACHE_TAGS_KEY, set())
+    after_commit(db_session, ResponseCache.invalidate, redis, tags)
+
+
+def reconcile_stock(
+    redis: Redis = Depends(get_redis_service),
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+) -> None:
+    """
+    Route dependency for waybill commits.
+    `StockReservationService.track_waybill` collects the committed quantities
+    and fulfilled orders into `db_session`; the reservation counters are
+    reconciled once the transaction has been committed.
+    """
+    changes: dict = db_session.info.setdefault(
+        STOCK_CHANGES_KEY, {"offers": {}, "orders": set()}
+    )
+    after_commit(
+        db_session,
+        StockReservationService.reconcile,
+        redis,
+        changes["offers"],
+        changes["orders"],
+    )
+
+
+def enqueue_image_uploads(
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+) -> None:
+    """
+    Route dependency for writes with an image.
+    `ImageUploadQueue.stage` collects the spooled images into `db_session`;
+    they are queued for upload once the transaction has been committed.
+    """
+    uploads: list = db_session.info.setdefault(IMAGE_UPLOADS_KEY, [])
+    after_commit(db_session, image_upload_queue.put, uploads)
+
+
+def enqueue_jobs(
+    jobs: JobQueue = Depends(get_job_queue),
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+) -> None:
+    """
+    Route dependency for writes that start a background job.
+    `JobQueue.stage` collects the jobs into `db_session`;
+    they are queued once the transaction has been committed.
+    """
+    staged: list = db_session.info.setdefault(STAGED_JOBS_KEY, [])
+    after_commit(db_session, jobs.put, staged)
@@ -0,0 +1,21 @@
+from src.schemas.common.enums import CustomerType
+
+
+def price_for_customer(
+    price_rub: int,
+    super_wholesale_price_rub: int,
+    customer_type: CustomerType | None,
+) -> int:
+    """
+    Offer price for a customer's pricing tier:
+    - USER_SUPER_WHOLESALE: super wholesale price
+    - USER_WHOLESALE: mean of retail and super wholesale prices
+    - USER_RETAIL / anonymous: retail price
+    """
+    match customer_type:
+        case CustomerType.USER_SUPER_WHOLESALE:
+            return super_wholesale_price_rub
+        case CustomerType.USER_WHOLESALE:
+            return round((price_rub + super_wholesale_price_rub) / 2)
+        case _:
+            return price_rub
@@ -1,12 +1,14 @@
 from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import HTTPException, UploadFile, status
+from fastapi import HTTPException, UploadFile
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from common.functions.check_file_mime_type import is_file_mime_type_correct
+from common.services.response_cache import mark_entity_stale
 from common.services.s3_service import S3Service
+from src.api.core.create_entity import receive_image
+from src.api.services.image_upload_service import ReceivedImage, image_upload_queue
 
 
 async def update_entity_with_optional_image(
@@ -18,39 +20,38 @@ async def update_entity_with_optional_image(
     db_session: AsyncSession,
     s3: S3Service,
     image_blob: UploadFile | None = None,
+    expected_version: int | None = None,
 ) -> Annotated[Any | None, "SQLAlchemy Instance"]:
     data = payload.model_dump(exclude_unset=True)
-    image_key: str | None = None
+    image: ReceivedImage | None = None
 
     if image_blob:
-        try:
-            await is_file_mime_type_correct(image_blob)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                detail=f"File contents don’t match the file extension: {e}",
-            )
-
-        image_key = s3.generate_key(image_blob.filename, upload_path)
-        data["image_url"] = s3.get_file_url(key=image_key)
+        image = await receive_image(image_blob, upload_path, s3)
+        data["image_url"] = image.url
+        data.update(image.state)
 
     if not data:
         raise HTTPException(status_code=400, detail="No data provided for update")
 
     try:
-        updated = await dao.update(db_session, filter_by={"id": entity_id}, **data)
-    except Exception as e:
-        raise e
-
-    if not updated:
-        raise HTTPException(status_code=404, detail="Entity not found")
-
-    if image_blob and image_key:
-        await s3.upload_file(
-            file=image_blob.file,
-            key=image_key,
-            extra_args={"ACL": "public-read", "ContentType": image_blob.content_type},
+        updated = await dao.update(
+            db_session,
+            filter_by={"id": entity_id},
+            expected_version=expected_version,
+            **data,
         )
+        if not updated:
+            raise HTTPException(status_code=404, detail="Entity not found")
+    except BaseException:
+        # not found, version conflict, DB error or cancelled: drop the spooled file
+        if image:
+            image.discard()
+        raise
+    mark_entity_stale(db_session, updated, changed=data.keys())
+
+    if image:
+        # uploaded after the commit, unless it is stored already
+        image_upload_queue.stage(db_session, updated, image)
 
     return updated
 
@@ -61,17 +62,24 @@ async def update_entity(
     payload: BaseModel,
     dao: Any,
     db_session: AsyncSession,
+    expected_version: int | None = None,
 ) -> Annotated[Any | None, "SQLAlchemy Instance"]:
     data = payload.model_dump(exclude_unset=True)
 
     if not data:
         raise HTTPException(status_code=400, detail="No data provided for update")
     try:
-        updated = await dao.update(db_session, filter_by={"id": entity_id}, **data)
+        updated = await dao.update(
+            db_session,
+            filter_by={"id": entity_id},
+            expected_version=expected_version,
+            **data,
+        )
     except Exception as e:
         raise e
 
     if not updated:
         raise HTTPException(status_code=404, detail="Entity not found")
+    mark_entity_stale(db_session, updated, changed=data.keys())
 
     return updated
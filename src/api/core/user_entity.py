@@ -40,7 +40,13 @@ async def create_user_entity(
 
     logger.info("[Webhook] Creating user %s", user.email)
     try:
-        await UserDAO.add(db_session, **user.model_dump())
+        # webhooks may be redelivered: an existing user only gets the profile fields
+        await UserDAO.upsert_many(
+            db_session,
+            [user.model_dump()],
+            update_fields=("email", "first_name", "last_name"),
+            options=(),
+        )
         logger.info("[Webhook] User %s is created", user.email)
     except Exception as e:
         logger.error("[Webhook] Error creating user %s: %s", user.email, str(e))
@@ -1,6 +1,9 @@
+from sqlalchemy.orm import joinedload
+
 from src.api.dao.base import BaseDAO
 from src.models import AuditLog
 
 
 class AuditLogDAO(BaseDAO):
     model = AuditLog
+    load_options = (joinedload(AuditLog.user),)
@@ -1,17 +1,20 @@
+from datetime import datetime
 from typing import Any, Generic, Sequence, Type, TypeVar
 from uuid import UUID
 
 from fastapi_pagination.ext.sqlalchemy import apaginate
 from pydantic import BaseModel
+from sqlalchemy import Select, func, insert, select
 from sqlalchemy import delete as sa_delete
-from sqlalchemy import func, select
 from sqlalchemy import update as sqlalchemy_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeMeta
 
-from src.api.dao.helper import OrderByOption, get_order_by_clause
-from src.common.exceptions.exceptions import DuplicateNameError
+from src.api.dao.helper import LoaderOptions, OrderByOption, get_order_by_clause
+from src.common.exceptions.exceptions import DuplicateNameError, VersionConflictError
+from src.common.services.response_cache import mark_stale
 from src.utils.logging import logger
 from src.utils.pagination import Page
 
@@ -32,12 +35,42 @@ class BaseDAO(Generic[T, S]):
     # TODO: how to add return with generic type T/S?
     model: Type[T] | DeclarativeMeta | None = None
     schema: Type[S] | BaseModel | None = None
+    # loader options needed to build `schema`: relationships are lazy="raise",
+    # so everything the response touches has to be loaded by the query itself
+    load_options: LoaderOptions = ()
+
+    @classmethod
+    def _select(cls, options: LoaderOptions | None = None) -> Select:
+        """
+        SELECT of the model with `options`, `load_options` by default.
+        Pass explicit options when the caller needs less (or more) than `schema`.
+        """
+        return select(cls.model).options(
+            *(cls.load_options if options is None else options)
+        )
+
+    @classmethod
+    async def reload(cls, db_session: AsyncSession, _id: UUID) -> T:
+        """
+        Re-read a written row with `load_options`, overwriting the identity map
+        (relationships loaded before the write are stale).
+        """
+        await db_session.flush()
+        query = (
+            cls._select().filter_by(id=_id).execution_options(populate_existing=True)
+        )
+        result = await db_session.execute(query)
+        return result.unique().scalar_one_or_none()
 
     @classmethod
     async def find_all(
-        cls, db_session: AsyncSession, filter_by: dict, order_by: str = None
+        cls,
+        db_session: AsyncSession,
+        filter_by: dict,
+        order_by: str = None,
+        options: LoaderOptions | None = None,
     ) -> Sequence[T]:
-        query = select(cls.model).filter_by(**filter_by).order_by(order_by)
+        query = cls._select(options).filter_by(**filter_by).order_by(order_by)
         result = await db_session.execute(query)
         res = result.unique().scalars().all()
         return res
@@ -49,7 +82,7 @@ class BaseDAO(Generic[T, S]):
         filter_by: dict | None = None,
         order_by: OrderByOption | None = None,
     ) -> Page[S]:
-        query = select(cls.model).filter_by(**filter_by if filter_by else {})
+        query = cls._select().filter_by(**filter_by if filter_by else {})
 
         if order_by:
             query = query.order_by(get_order_by_clause(cls.model, order_by))
@@ -59,26 +92,57 @@ class BaseDAO(Generic[T, S]):
         return await apaginate(db_session, query)
 
     @classmethod
-    async def find_one_or_none(cls, db_session, filter_by: dict) -> list:
-        query = select(cls.model).filter_by(**filter_by)
+    async def find_page(
+        cls,
+        db_session: AsyncSession,
+        filter_by: dict,
+        limit: int,
+        offset: int,
+        order_by: OrderByOption | None = None,
+    ) -> tuple[Sequence[T], int]:
+        """
+        Same page as find_all_paginate, as (ORM rows, total) for the compiled
+        serializers (src.utils.serializer) instead of a validated Page.
+        """
+        query = cls._select().filter_by(**filter_by)
+        if order_by:
+            query = query.order_by(get_order_by_clause(cls.model, order_by))
+        else:
+            query = query.order_by(cls.model.id.desc())
+
+        rows = await db_session.execute(query.limit(limit).offset(offset))
+        total = await db_session.execute(
+            select(func.count()).select_from(cls.model).filter_by(**filter_by)
+        )
+        return rows.unique().scalars().all(), total.scalar_one()
+
+    @classmethod
+    async def find_one_or_none(
+        cls, db_session, filter_by: dict, options: LoaderOptions | None = None
+    ) -> list:
+        query = cls._select(options).filter_by(**filter_by)
         result = await db_session.execute(query)
         return result.unique().scalar_one_or_none()
 
     @classmethod
-    async def find_by_id(cls, db_session, _id: UUID) -> T:
-        query = select(cls.model).filter_by(id=_id)
+    async def find_by_id(
+        cls, db_session, _id: UUID, options: LoaderOptions | None = None
+    ) -> T:
+        query = cls._select(options).filter_by(id=_id)
         result = await db_session.execute(query)
         res = result.unique().scalar_one_or_none()
         return res
 
     @classmethod
-    async def find_by_slug(cls, db_session, slug: str) -> T:
+    async def find_by_slug(
+        cls, db_session, slug: str, options: LoaderOptions | None = None
+    ) -> T:
         """
         Find a Product by its slug.
         """
-        query = select(cls.model).filter_by(slug=slug)
+        query = cls._select(options).filter_by(slug=slug)
         result = await db_session.execute(query)
-        res = result.scalar_one_or_none()
+        res = result.unique().scalar_one_or_none()
         return res
 
     @classmethod
@@ -94,32 +158,157 @@ class BaseDAO(Generic[T, S]):
         count = result.scalar_one()
         return {"count": count}
 
+    @classmethod
+    async def get_watermark(
+        cls,
+        db_session: AsyncSession,
+        filter_by: dict,
+        embedded: Sequence[Any] = (),
+    ) -> tuple[datetime | None, int]:
+        """
+        Change watermark of the rows matching `filter_by` for conditional GETs:
+        (latest updated_at, count). The count catches hard deletes.
+        `embedded` - models nested into the response schema, their table-wide
+        max(updated_at) is taken into account as well.
+        Backed by the updated_at indexes, no rows are loaded.
+        """
+        query = (
+            select(
+                func.max(cls.model.updated_at),
+                func.count(),
+                *(select(func.max(m.updated_at)).scalar_subquery() for m in embedded),
+            )
+            .select_from(cls.model)
+            .where(*[getattr(cls.model, k) == v for k, v in filter_by.items()])
+        )
+        result = await db_session.execute(query)
+        last_modified, count, *embedded_modified = result.one()
+
+        timestamps = [t for t in (last_modified, *embedded_modified) if t]
+        return (max(timestamps) if timestamps else None), count
+
+    @classmethod
+    async def get_image_urls(cls, db_session: AsyncSession) -> set[str]:
+        """
+        Distinct image_url of all rows (models with an image), image GC
+        """
+        query = select(cls.model.image_url).where(cls.model.image_url.is_not(None))
+        result = await db_session.scalars(query.distinct())
+        return set(result)
+
     # ---------------------------------------
     #            POST Methods
     # ---------------------------------------
     @classmethod
     async def add(cls, db_session: AsyncSession, **values) -> model:
         """
+        Insert one row, see `add_many`.
         More: https://habr.com/ru/articles/828328/, 'Управление транзакциями'
-        :param db_session:
-        :param values:
-        :return:
         """
+        instances = await cls.add_many(db_session, [values])
+        return instances[0]
+
+    @classmethod
+    async def add_many(
+        cls,
+        db_session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        options: LoaderOptions | None = None,
+    ) -> list[T]:
+        """
+        INSERT ... RETURNING: the rows come back with their server defaults
+        from the insert itself, no flush + refresh.
+        Relationships of `schema` (`load_options`, or `options`) are loaded
+        for all rows with one SELECT; pass `options=()` to skip it.
+        """
+        if not rows:
+            return []
+
+        query = insert(cls.model).returning(cls.model, sort_by_parameter_order=True)
         try:
-            new_instance = cls.model(**values)
-            db_session.add(new_instance)
-            await db_session.flush()
-            await db_session.refresh(new_instance)
-            return new_instance
+            result = await db_session.execute(query, list(rows))
+            instances = list(result.scalars())
 
         except IntegrityError as e:
             logger.error("IntegrityError: %s", e)
-            name_value = values.get("name", "N/A")
+            name_value = rows[0].get("name", "N/A")
             raise DuplicateNameError(name=name_value) from e
 
         except SQLAlchemyError as e:
             raise e
 
+        return await cls._load_relationships(db_session, instances, options)
+
+    @classmethod
+    async def upsert_many(
+        cls,
+        db_session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        index_elements: Sequence[str] = ("id",),
+        update_fields: Sequence[str] | None = None,
+        options: LoaderOptions | None = None,
+    ) -> list[T]:
+        """
+        INSERT ... ON CONFLICT (index_elements) DO UPDATE ... RETURNING.
+        On conflict only `update_fields` are overwritten (all given columns
+        except the conflict target by default); versioned rows get version + 1.
+        """
+        if not rows:
+            return []
+
+        query = pg_insert(cls.model).values(list(rows))
+        fields = update_fields or [k for k in rows[0] if k not in index_elements]
+        set_ = {field: query.excluded[field] for field in fields}
+        # onupdate defaults are not applied to ON CONFLICT DO UPDATE
+        set_["updated_at"] = func.now()
+        if "version" in cls.model.__table__.c:
+            set_["version"] = cls.model.version + 1
+
+        query = (
+            query.on_conflict_do_update(index_elements=index_elements, set_=set_)
+            .returning(cls.model)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await db_session.execute(query)
+            instances = list(result.scalars())
+
+        except IntegrityError as e:
+            logger.error("IntegrityError: %s", e)
+            name_value = rows[0].get("name", "N/A")
+            raise DuplicateNameError(name=name_value) from e
+
+        except SQLAlchemyError as e:
+            raise e
+
+        return await cls._load_relationships(db_session, instances, options)
+
+    @classmethod
+    async def _load_relationships(
+        cls,
+        db_session: AsyncSession,
+        instances: list[T],
+        options: LoaderOptions | None = None,
+    ) -> list[T]:
+        """
+        Joined eager loads can't be attached to DML RETURNING:
+        the written rows are re-selected with their relationships in one query.
+        """
+        options = cls.load_options if options is None else options
+        if not options or not instances:
+            return instances
+
+        # populate_existing would overwrite unflushed changes of the loaded parents
+        await db_session.flush()
+        query = (
+            cls._select(options)
+            .where(cls.model.id.in_([instance.id for instance in instances]))
+            .execution_options(populate_existing=True)
+        )
+        result = await db_session.execute(query)
+        loaded = {row.id: row for row in result.unique().scalars()}
+        return [loaded[instance.id] for instance in instances]
+
     @classmethod
     async def add_enum(cls, db_session, model) -> Any:
         db_session.add(model)
@@ -131,24 +320,36 @@ class BaseDAO(Generic[T, S]):
     #            PUT Methods
     # ---------------------------------------
     @classmethod
-    async def update(cls, db_session, filter_by: dict, **values) -> Any:
+    async def update(
+        cls,
+        db_session,
+        filter_by: dict,
+        expected_version: int | None = None,
+        **values,
+    ) -> Any:
+        """
+        UPDATE ... RETURNING the row in one statement.
+        Versioned models get `version = version + 1`; with `expected_version`
+        (the client's If-Match) the row is only written if nobody has changed it
+        since, VersionConflictError (409) otherwise.
+        """
+        where = [getattr(cls.model, k) == v for k, v in filter_by.items()]
+        versioned = "version" in cls.model.__table__.c
+        if versioned:
+            values["version"] = cls.model.version + 1
+            if expected_version is not None:
+                where.append(cls.model.version == expected_version)
+
         query = (
             sqlalchemy_update(cls.model)
-            .where(*[getattr(cls.model, k) == v for k, v in filter_by.items()])
+            .where(*where)
             .values(**values)
-            .execution_options(synchronize_db_session="fetch")
+            .returning(cls.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
         )
         try:
             result = await db_session.execute(query)
-            if result.rowcount == 0:
-                return None
-
-            select_query = select(cls.model).where(
-                *[getattr(cls.model, k) == v for k, v in filter_by.items()]
-            )
-            res = await db_session.execute(select_query)
-            return res.scalar_one_or_none()
-
+            updated = result.scalars().one_or_none()
         except IntegrityError as e:
             logger.error("IntegrityError: %s", e)
             name_value = values.get("name", "N/A")
@@ -157,6 +358,18 @@ class BaseDAO(Generic[T, S]):
         except SQLAlchemyError as e:
             raise e
 
+        if updated is None:
+            if versioned and expected_version is not None:
+                current = await db_session.scalar(
+                    select(cls.model.version).filter_by(**filter_by)
+                )
+                if current is not None:
+                    raise VersionConflictError(expected_version, current)
+            return None
+
+        (updated,) = await cls._load_relationships(db_session, [updated])
+        return updated
+
     # ---------------------------------------
     #            Delete Methods
     # ---------------------------------------
@@ -169,14 +382,17 @@ class BaseDAO(Generic[T, S]):
             True  – if record existed and was removed
             False – if record not found
         """
+        table = cls.model.__table__
         stmt = (
             sa_delete(cls.model)
             .where(cls.model.id == _id)
-            .returning(cls.model.id)  # ← return PK of deleted row
+            .returning(*table.c)  # ← return deleted row (PK + FKs for cache tags)
         )
 
         result = await db.execute(stmt)
-        await db.flush()
+        deleted = result.mappings().one_or_none()
+        if deleted is None:
+            return False
 
-        deleted_id = result.scalar_one_or_none()
-        return deleted_id is not None
+        mark_stale(db, table, deleted)
+        return True
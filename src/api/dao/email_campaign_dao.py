@@ -0,0 +1,81 @@
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, exists, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.base import BaseDAO
+from src.models import EmailCampaign, EmailCampaignRecipient, User
+from src.schemas.common.enums import DeliveryStatus
+
+
+class EmailCampaignDAO(BaseDAO):
+    model = EmailCampaign
+
+    @classmethod
+    async def get_recipients_batch(
+        cls,
+        db_session: AsyncSession,
+        campaign_id: UUID,
+        after_id: UUID | None,
+        limit: int,
+    ) -> Sequence[Row]:
+        """
+        Next `limit` subscribed users after `after_id` (keyset on users.id),
+        without those the campaign has already been sent to.
+        """
+        r = EmailCampaignRecipient
+        query = (
+            select(User.id, User.email, User.first_name, User.last_name)
+            .where(
+                User.mailing.is_(True),
+                User.is_active.is_(True),
+                ~exists().where(
+                    r.campaign_id == campaign_id,
+                    r.user_id == User.id,
+                    r.status == DeliveryStatus.SENT,
+                ),
+            )
+            .order_by(User.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        return (await db_session.execute(query)).all()
+
+    @classmethod
+    async def record_outcomes(
+        cls, db_session: AsyncSession, rows: Sequence[dict[str, Any]]
+    ) -> None:
+        """
+        Upsert the delivery of a batch: {campaign_id, user_id, email, status, error}.
+        """
+        if not rows:
+            return
+        r = EmailCampaignRecipient
+        query = pg_insert(r).values(list(rows))
+        query = query.on_conflict_do_update(
+            index_elements=("campaign_id", "user_id"),
+            set_={
+                "status": query.excluded.status,
+                "error": query.excluded.error,
+                "attempts": r.attempts + 1,
+                "updated_at": func.now(),
+            },
+        )
+        await db_session.execute(query)
+
+    @classmethod
+    async def count_outcomes(
+        cls, db_session: AsyncSession, campaign_id: UUID
+    ) -> dict[DeliveryStatus, int]:
+        r = EmailCampaignRecipient
+        query = (
+            select(r.status, func.count())
+            .where(r.campaign_id == campaign_id)
+            .group_by(r.status)
+        )
+        counts = dict.fromkeys(DeliveryStatus, 0)
+        counts.update((await db_session.execute(query)).tuples().all())
+        return counts
@@ -1,12 +1,15 @@
-from typing import Literal, TypedDict
+from typing import Literal, Sequence, TypedDict
 
 from sqlalchemy import asc, desc
 from sqlalchemy.orm import DeclarativeMeta
 from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.base import ExecutableOption
 
 # reusable literal options
 OrderDirection = Literal["asc", "desc"]
 AvailableFields = Literal["id", "name", "created_at", "updated_at"] | str
+# selectinload / joinedload / contains_eager / load_only ...
+LoaderOptions = Sequence[ExecutableOption]
 
 
 class OrderByOption(TypedDict):
@@ -1,21 +1,29 @@
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import Row, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager, joinedload
 
 from src.api.dao.base import BaseDAO
 from src.config import settings
-from src.models import Offer, Product
+from src.models import Category, Offer, Product, SubCategory
+from src.schemas.common.enums import ImageVariant
 from src.schemas.offer_schema import OfferSchema
+from src.utils.image_variants import variant_key
 from src.utils.pagination import Page
 
 
 class OfferDAO(BaseDAO):
     model = Offer
     schema = OfferSchema
+    # OfferSchema embeds product -> sub-category -> category: many-to-one, one JOIN each
+    load_options = (
+        joinedload(Offer.product, innerjoin=True)
+        .joinedload(Product.sub_category, innerjoin=True)
+        .joinedload(SubCategory.category, innerjoin=True),
+    )
 
     @classmethod
     async def wildcard_search(
@@ -38,7 +46,12 @@ class OfferDAO(BaseDAO):
                     func.lower(o.brand).ilike(search_term),
                 )
             )
-            .options(joinedload(o.product))  # чтобы продукт был доступен
+            # the product is joined for the filter already: reuse that JOIN
+            .options(
+                contains_eager(o.product)
+                .joinedload(Product.sub_category, innerjoin=True)
+                .joinedload(SubCategory.category, innerjoin=True)
+            )
         )
 
         return await paginate(db_session, query)
@@ -79,16 +92,160 @@ class OfferDAO(BaseDAO):
                 ).desc(),
                 o.id.desc(),  # Ensure consistent ordering - no duplicates in Pagination
             )
+            .options(
+                contains_eager(o.product)
+                .joinedload(Product.sub_category, innerjoin=True)
+                .joinedload(SubCategory.category, innerjoin=True)
+            )
         )
         return await paginate(db_session, query)
 
+    @classmethod
+    async def find_compact(
+        cls,
+        db_session: AsyncSession,
+        filter_by: dict,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[dict], int]:
+        """
+        `view=compact` page: a plain column select joined to the product name/image.
+        No ORM hydration, no joined loads of the sub-category/category chain.
+        The image fallback is the one of OfferSchema: offer -> the product's
+        CARD variant (or its original) -> placeholder.
+        Returns (rows as dicts, total).
+        """
+        o = cls.model
+        p = Product
+        where = [getattr(o, k) == v for k, v in filter_by.items()]
+
+        query = (
+            select(
+                o.id,
+                o.product_id,
+                p.name,
+                o.brand,
+                o.manufacturer_number,
+                o.price_rub,
+                o.quantity,
+                func.nullif(o.image_url, "").label("image_url"),
+                func.nullif(p.image_url, "").label("product_image_url"),
+                p.has_image_variants,
+            )
+            .join(p, o.product_id == p.id)
+            .where(*where)
+            .order_by(o.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        total_query = select(func.count()).select_from(o).where(*where)
+
+        rows = (await db_session.execute(query)).mappings().all()
+        total = (await db_session.execute(total_query)).scalar_one()
+
+        items = []
+        for row in rows:
+            item = dict(row)
+            product_image_url = item.pop("product_image_url")
+            if item.pop("has_image_variants") and product_image_url:
+                product_image_url = variant_key(product_image_url, ImageVariant.CARD)
+            item["image_url"] = (
+                item["image_url"] or product_image_url or settings.IMAGE_PLACEHOLDER_URL
+            )
+            items.append(item)
+        return items, total
+
+    @classmethod
+    async def get_quantities(
+        cls, db_session: AsyncSession, ids: Sequence[UUID]
+    ) -> dict[UUID, int]:
+        """
+        offers.quantity by id, seeds/reconciles the stock reservation counters
+        """
+        query = select(cls.model.id, cls.model.quantity).where(cls.model.id.in_(ids))
+        rows = await db_session.execute(query)
+        return {row.id: row.quantity for row in rows}
+
+    @classmethod
+    async def get_prices(
+        cls, db_session: AsyncSession, _id: UUID
+    ) -> tuple[int, int] | None:
+        """
+        (price_rub, super_wholesale_price_rub), to detect a price change on update
+        """
+        query = select(cls.model.price_rub, cls.model.super_wholesale_price_rub).where(
+            cls.model.id == _id
+        )
+        row = (await db_session.execute(query)).one_or_none()
+        return tuple(row) if row else None
+
+    @classmethod
+    async def find_for_quote(
+        cls, db_session: AsyncSession, ids: Sequence[UUID]
+    ) -> list[dict]:
+        """
+        Cart quote: price and stock columns of live offers by ids, one query.
+        Deleted and unknown ids are simply absent from the result.
+        """
+        o = cls.model
+        query = (
+            select(
+                o.id,
+                Product.name,
+                o.brand,
+                o.manufacturer_number,
+                o.price_rub,
+                o.super_wholesale_price_rub,
+                o.quantity,
+            )
+            .join(Product, o.product_id == Product.id)
+            .where(o.id.in_(ids), o.is_deleted.is_(False))
+        )
+        rows = (await db_session.execute(query)).mappings().all()
+        return [dict(row) for row in rows]
+
+    @classmethod
+    async def stream_price_list(
+        cls, db_session: AsyncSession, batch_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Price list rows of live offers in catalogue order, `batch_size` rows at a time.
+        A server-side cursor: only one batch is held in memory.
+        Row: (category, sub_category, product, cross_number, brand,
+              manufacturer_number, sku, price_rub, super_wholesale_price_rub, quantity)
+        """
+        o = cls.model
+        query = (
+            select(
+                Category.name,
+                SubCategory.name,
+                Product.name,
+                Product.cross_number,
+                o.brand,
+                o.manufacturer_number,
+                o.sku,
+                o.price_rub,
+                o.super_wholesale_price_rub,
+                o.quantity,
+            )
+            .join(Product, o.product_id == Product.id)
+            .join(SubCategory, Product.sub_category_id == SubCategory.id)
+            .join(Category, SubCategory.category_id == Category.id)
+            .where(o.is_deleted.is_(False), Product.is_deleted.is_(False))
+            .order_by(Category.name, SubCategory.name, Product.name, o.brand, o.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db_session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
     @classmethod
     async def find_by_ids(
         cls,
         db_session: AsyncSession,
         ids: Sequence[UUID],
     ) -> Page[OfferSchema]:
-        query = select(cls.model).where(cls.model.id.in_(ids)).order_by(cls.model.id)
+        query = cls._select().where(cls.model.id.in_(ids)).order_by(cls.model.id)
         return await paginate(db_session, query)
 
     @classmethod
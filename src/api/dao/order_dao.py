@@ -1,7 +1,10 @@
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import or_, select
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload, selectinload
 
 from src.api.dao.base import BaseDAO
+from src.api.dao.order_offer_dao import OrderOfferDAO
+from src.api.dao.waybill_dao import WaybillDAO
 from src.models import Order, User
 from src.schemas.order_schema import OrderSchema
 from src.utils.pagination import Page
@@ -9,6 +12,12 @@ from src.utils.pagination import Page
 
 class OrderDAO(BaseDAO):
     model = Order
+    # OrderSchema: user, waybill (+ its author/customer), lines -> offers
+    load_options = (
+        joinedload(Order.user, innerjoin=True),
+        selectinload(Order.waybill).options(*WaybillDAO.load_options),
+        selectinload(Order.order_offers).options(*OrderOfferDAO.load_options),
+    )
 
     @classmethod
     async def find_all_paginate(
@@ -20,7 +29,7 @@ class OrderDAO(BaseDAO):
     ) -> Page[OrderSchema]:
         search_term = f"%{search_term}%"
         query = (
-            select(cls.model)
+            cls._select()
             .filter_by(**filter_by)
             .where(
                 or_(
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.base import BaseDAO
+from src.models import OutboxEvent
+
+
+class OutboxDAO(BaseDAO):
+    model = OutboxEvent
+
+    @classmethod
+    async def claim_batch(
+        cls, db_session: AsyncSession, limit: int
+    ) -> Sequence[OutboxEvent]:
+        """
+        Oldest due events, locked until the transaction ends.
+        SKIP LOCKED: concurrent dispatchers take disjoint batches.
+        """
+        query = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.processed_at.is_(None),
+                OutboxEvent.available_at <= func.now(),
+            )
+            .order_by(OutboxEvent.available_at, OutboxEvent.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return (await db_session.execute(query)).scalars().all()
+
+    @classmethod
+    async def mark_processed(
+        cls, db_session: AsyncSession, ids: Sequence[UUID]
+    ) -> None:
+        if not ids:
+            return
+        await db_session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(ids))
+            .values(processed_at=func.now(), attempts=OutboxEvent.attempts + 1)
+        )
+
+    @classmethod
+    async def mark_failed(
+        cls,
+        db_session: AsyncSession,
+        ids: Sequence[UUID],
+        error: str,
+        retry_in: timedelta,
+        max_attempts: int,
+    ) -> None:
+        """
+        Push the events back by `retry_in`;
+        those out of attempts are closed with the error.
+        """
+        if not ids:
+            return
+        attempts = OutboxEvent.attempts + 1
+        await db_session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(ids))
+            .values(
+                attempts=attempts,
+                error=error,
+                available_at=func.now() + retry_in,
+                processed_at=case((attempts >= max_attempts, func.now())),
+            )
+        )
+
+    @classmethod
+    async def delete_processed(cls, db_session: AsyncSession, days: int) -> int:
+        before = datetime.now(timezone.utc) - timedelta(days=days)
+        result = await db_session.execute(
+            delete(OutboxEvent).where(OutboxEvent.processed_at < before)
+        )
+        return result.rowcount
@@ -1,11 +1,13 @@
-from uuid import UUID
+from typing import Sequence
 
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import func, or_, select
+from sqlalchemy import Row, and_, distinct, false, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from src.api.dao.base import BaseDAO
-from src.models import Category, Product, SubCategory
+from src.config import settings
+from src.models import Category, Offer, Product, SubCategory
 from src.schemas.product_schema import ProductSchema
 from src.utils.pagination import Page
 
@@ -13,6 +15,12 @@ from src.utils.pagination import Page
 class ProductDAO(BaseDAO):
     model = Product
     schema = ProductSchema
+    # ProductSchema embeds sub-category -> category
+    load_options = (
+        joinedload(Product.sub_category, innerjoin=True).joinedload(
+            SubCategory.category, innerjoin=True
+        ),
+    )
 
     @classmethod
     async def wildcard_search(
@@ -22,7 +30,7 @@ class ProductDAO(BaseDAO):
     ) -> Page[ProductSchema]:
         search_term = f"%{search_term.replace('.', '')}%"
 
-        query = select(cls.model).where(
+        query = cls._select().where(
             or_(
                 func.replace(cls.model.name, ".", "").ilike(search_term),
                 func.replace(cls.model.cross_number, ".", "").ilike(search_term),
@@ -48,39 +56,100 @@ class ProductDAO(BaseDAO):
         Эта простая идея оказывается очень эффективной для измерения схожести слов на многих естественных языках.
         """
         query = (
-            select(cls.model)
+            cls._select()
             .where(func.similarity(cls.model.name, search_term) > 0.1)
             .order_by(func.similarity(cls.model.name, search_term).desc())
         )
         return await paginate(db_session, query)
 
     @classmethod
-    async def get_product_counts_per_category(cls, db_session: AsyncSession):
+    async def find_compact(
+        cls,
+        db_session: AsyncSession,
+        filter_by: dict,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[dict], int]:
+        """
+        `view=compact` page: a plain column select, ordered by name.
+        No ORM hydration, no joined loads of the sub-category/category.
+        Returns (rows as dicts, total).
+        """
+        p = cls.model
+        where = [getattr(p, k) == v for k, v in filter_by.items()]
+
         query = (
-            select(Category.name, func.count(Product.id))
-            .join(SubCategory, SubCategory.category_id == Category.id)
-            .join(Product, Product.sub_category_id == SubCategory.id)
-            .group_by(Category.name)
+            select(
+                p.id,
+                p.name,
+                p.slug,
+                p.sub_category_id,
+                func.coalesce(
+                    func.nullif(p.image_url, ""), settings.IMAGE_PLACEHOLDER_URL
+                ).label("image_url"),
+            )
+            .where(*where)
+            .order_by(p.name.asc(), p.id)
+            .limit(limit)
+            .offset(offset)
         )
+        total_query = select(func.count()).select_from(p).where(*where)
 
-        result = await db_session.execute(query)
-        rows = result.all()
-        return dict(rows)
+        rows = (await db_session.execute(query)).mappings().all()
+        total = (await db_session.execute(total_query)).scalar_one()
+        return [dict(row) for row in rows], total
 
     @classmethod
-    async def get_product_counts_per_sub_category(
-        cls,
-        db_session: AsyncSession,
-        category_id: UUID,
-    ):
+    async def get_facet_counts(cls, db_session: AsyncSession) -> Sequence[Row]:
+        """
+        Count products/offers for every facet level in a single GROUPING SETS query:
+        category, sub-category, in-stock flag, has-image flag and the grand total.
+        Deleted products and offers are excluded.
+        `g_*` columns are GROUPING() flags: 0 - the row is grouped by that dimension.
+        """
+        p = cls.model
+        placeholder = settings.IMAGE_PLACEHOLDER_URL
+
+        in_stock = func.coalesce(Offer.quantity > 0, false())
+        has_image = func.coalesce(p.image_url, placeholder) != placeholder
+
         query = (
-            select(SubCategory.name, func.count(Product.id))
+            select(
+                Category.id.label("category_id"),
+                Category.name.label("category_name"),
+                Category.slug.label("category_slug"),
+                SubCategory.id.label("sub_category_id"),
+                SubCategory.name.label("sub_category_name"),
+                SubCategory.slug.label("sub_category_slug"),
+                in_stock.label("in_stock"),
+                has_image.label("has_image"),
+                func.grouping(Category.id).label("g_category"),
+                func.grouping(SubCategory.id).label("g_sub_category"),
+                func.grouping(in_stock).label("g_in_stock"),
+                func.grouping(has_image).label("g_has_image"),
+                func.count(distinct(p.id)).label("product_count"),
+                func.count(Offer.id).label("offer_count"),
+            )
+            .select_from(p)
+            .join(SubCategory, SubCategory.id == p.sub_category_id)
             .join(Category, Category.id == SubCategory.category_id)
-            .join(Product, Product.sub_category_id == SubCategory.id)
-            .where(Category.id == category_id)
-            .group_by(SubCategory.name)
+            .outerjoin(Offer, and_(Offer.product_id == p.id, ~Offer.is_deleted))
+            .where(~p.is_deleted)
+            .group_by(
+                func.grouping_sets(
+                    tuple_(Category.id, Category.name, Category.slug),
+                    tuple_(
+                        Category.id,
+                        SubCategory.id,
+                        SubCategory.name,
+                        SubCategory.slug,
+                    ),
+                    tuple_(in_stock),
+                    tuple_(has_image),
+                    tuple_(),
+                )
+            )
         )
 
         result = await db_session.execute(query)
-        rows = result.all()
-        return dict(rows)
+        return result.all()
@@ -0,0 +1,189 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Sequence
+
+from sqlalchemy import Row, cast, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import Date
+
+from src.api.dao.base import BaseDAO
+from src.models import (
+    Offer,
+    Product,
+    ProductSalesStat,
+    SubCategory,
+    User,
+    Waybill,
+    WaybillOffer,
+)
+from src.schemas.common.enums import SalesGroupBy, SalesWindow, WaybillType
+
+
+class ProductSalesStatDAO(BaseDAO):
+    model = ProductSalesStat
+
+    @classmethod
+    async def apply_waybill(cls, db_session: AsyncSession, waybill: Waybill) -> None:
+        """
+        Add the lines of a freshly committed WAYBILL_OUT to today's buckets.
+        Lines are folded per bucket key first, so it is a single upsert statement.
+        """
+        if waybill.waybill_type != WaybillType.WAYBILL_OUT:
+            return
+
+        customer_type = waybill.customer.customer_type
+        totals: dict = defaultdict(lambda: {"sold": 0, "revenue": 0})
+        for item in waybill.waybill_offers:
+            product = item.offer.product
+            bucket = totals[(product.id, item.brand, product.sub_category_id)]
+            bucket["sold"] += item.quantity
+            bucket["revenue"] += item.quantity * item.price_rub
+
+        if not totals:
+            return
+
+        s = cls.model
+        stmt = pg_insert(s).values(
+            [
+                {
+                    "day": func.current_date(),
+                    "product_id": product_id,
+                    "brand": brand,
+                    "sub_category_id": sub_category_id,
+                    "customer_type": customer_type,
+                    "sold": bucket["sold"],
+                    "revenue": bucket["revenue"],
+                }
+                for (product_id, brand, sub_category_id), bucket in totals.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="product_sales_stats_day_key",
+            set_={
+                "sold": s.sold + stmt.excluded.sold,
+                "revenue": s.revenue + stmt.excluded.revenue,
+                "updated_at": func.now(),
+            },
+        )
+        await db_session.execute(stmt)
+
+    @classmethod
+    async def get_best_selling(
+        cls,
+        db_session: AsyncSession,
+        window: SalesWindow = SalesWindow.ALL,
+    ) -> Sequence[Row]:
+        s = cls.model
+        sold = func.sum(s.sold)
+
+        query = (
+            select(
+                Product.name,
+                Product.image_url,
+                sold.label("sold"),
+                func.sum(s.revenue).label("revenue"),
+            )
+            .join(Product, Product.id == s.product_id)
+            .group_by(Product.name, Product.image_url)
+            .order_by(sold.desc())
+        )
+        if window.days:
+            query = query.where(
+                s.day > func.current_date() - timedelta(days=window.days)
+            )
+
+        result = await db_session.execute(query)
+        return result.all()
+
+    @classmethod
+    async def find_period(
+        cls,
+        db_session: AsyncSession,
+        group_by: SalesGroupBy,
+        date_from: date,
+        date_to: date,
+    ) -> Sequence[Row]:
+        """
+        Return (day, key, label, sold, revenue) rows of the buckets in the period,
+        projected on a single dimension. Further bucketing happens in memory.
+        """
+        s = cls.model
+        query = select(s.day)
+
+        match group_by:
+            case SalesGroupBy.PRODUCT:
+                query = query.add_columns(
+                    s.product_id.label("key"), Product.name.label("label")
+                ).join(Product, Product.id == s.product_id)
+            case SalesGroupBy.SUB_CATEGORY:
+                query = query.add_columns(
+                    s.sub_category_id.label("key"), SubCategory.name.label("label")
+                ).join(SubCategory, SubCategory.id == s.sub_category_id)
+            case SalesGroupBy.BRAND:
+                query = query.add_columns(s.brand.label("key"), s.brand.label("label"))
+            case SalesGroupBy.CUSTOMER_TYPE:
+                query = query.add_columns(
+                    s.customer_type.label("key"), s.customer_type.label("label")
+                )
+
+        query = query.add_columns(s.sold, s.revenue).where(
+            s.day.between(date_from, date_to)
+        )
+
+        result = await db_session.execute(query)
+        return result.all()
+
+    @classmethod
+    async def rebuild(cls, db_session: AsyncSession) -> int:
+        """
+        Recreate all buckets from committed WAYBILL_OUT waybills.
+        The commit day of historical waybills is approximated by `waybills.updated_at`.
+        """
+        s = cls.model
+        day = cast(Waybill.updated_at, Date)
+
+        source = (
+            select(
+                func.gen_random_uuid().label("id"),
+                day.label("day"),
+                Offer.product_id,
+                WaybillOffer.brand,
+                Product.sub_category_id,
+                User.customer_type,
+                func.sum(WaybillOffer.quantity).label("sold"),
+                func.sum(WaybillOffer.quantity * WaybillOffer.price_rub).label(
+                    "revenue"
+                ),
+            )
+            .join(Offer, Offer.id == WaybillOffer.offer_id)
+            .join(Product, Product.id == Offer.product_id)
+            .join(Waybill, Waybill.id == WaybillOffer.waybill_id)
+            .join(User, User.id == Waybill.customer_id)
+            .where(~Waybill.is_pending, Waybill.waybill_type == WaybillType.WAYBILL_OUT)
+            .group_by(
+                day,
+                Offer.product_id,
+                WaybillOffer.brand,
+                Product.sub_category_id,
+                User.customer_type,
+            )
+        )
+
+        await db_session.execute(delete(s))
+        result = await db_session.execute(
+            insert(s).from_select(
+                [
+                    "id",
+                    "day",
+                    "product_id",
+                    "brand",
+                    "sub_category_id",
+                    "customer_type",
+                    "sold",
+                    "revenue",
+                ],
+                source,
+            )
+        )
+        return result.rowcount
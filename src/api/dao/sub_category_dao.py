@@ -1,3 +1,5 @@
+from sqlalchemy.orm import joinedload
+
 from src.api.dao.base import BaseDAO
 from src.models import SubCategory
 from src.schemas.sub_category_schema import SubCategorySchema
@@ -6,3 +8,4 @@ from src.schemas.sub_category_schema import SubCategorySchema
 class SubCategoryDAO(BaseDAO):
     model = SubCategory
     schema = SubCategorySchema
+    load_options = (joinedload(SubCategory.category, innerjoin=True),)
@@ -1,4 +1,7 @@
+from sqlalchemy.orm import selectinload
+
 from src.api.dao.base import BaseDAO
+from src.api.dao.waybill_dao import WaybillDAO
 from src.models import UserBalanceHistory
 from src.schemas.user_balance_history import UserBalanceHistorySchema
 
@@ -6,3 +9,6 @@ from src.schemas.user_balance_history import UserBalanceHistorySchema
 class UserBalanceHistoryDAO(BaseDAO):
     model = UserBalanceHistory
     schema = UserBalanceHistorySchema
+    load_options = (
+        selectinload(UserBalanceHistory.waybill).options(*WaybillDAO.load_options),
+    )
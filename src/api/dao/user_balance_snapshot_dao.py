@@ -0,0 +1,110 @@
+from datetime import date
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.base import BaseDAO
+from src.models import UserBalanceSnapshot
+from src.schemas.common.enums import Currency
+
+
+class UserBalanceSnapshotDAO(BaseDAO):
+    model = UserBalanceSnapshot
+
+    @classmethod
+    async def apply_movement(
+        cls,
+        db_session: AsyncSession,
+        user_id: UUID,
+        currency: Currency,
+        balance_before: int,
+        balance_after: int,
+    ) -> None:
+        """
+        Fold a single balance change into today's snapshot row (upsert).
+        The opening balance is kept from the first movement of the day,
+        the closing balance always follows the latest one.
+        """
+        s = cls.model
+        delta = balance_after - balance_before
+
+        stmt = pg_insert(s).values(
+            user_id=user_id,
+            currency=currency,
+            day=func.current_date(),
+            opening_balance=balance_before,
+            closing_balance=balance_after,
+            credit=max(delta, 0),
+            debit=max(-delta, 0),
+            movements=1,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="user_balance_snapshots_day_key",
+            set_={
+                "closing_balance": stmt.excluded.closing_balance,
+                "credit": s.credit + stmt.excluded.credit,
+                "debit": s.debit + stmt.excluded.debit,
+                "movements": s.movements + stmt.excluded.movements,
+                "updated_at": func.now(),
+            },
+        )
+        await db_session.execute(stmt)
+
+    @classmethod
+    async def get_opening_balance(
+        cls,
+        db_session: AsyncSession,
+        user_id: UUID,
+        currency: Currency,
+        day: date,
+    ) -> int | None:
+        """
+        Balance at the start of `day`:
+        closing balance of the last snapshot before it, otherwise the opening
+        balance of the first snapshot on/after it. None if there are no snapshots.
+        """
+        s = cls.model
+        scope = (s.user_id == user_id, s.currency == currency)
+
+        before = (
+            select(s.closing_balance)
+            .where(*scope, s.day < day)
+            .order_by(s.day.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        after = (
+            select(s.opening_balance)
+            .where(*scope, s.day >= day)
+            .order_by(s.day.asc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        result = await db_session.execute(select(func.coalesce(before, after)))
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def find_period(
+        cls,
+        db_session: AsyncSession,
+        user_id: UUID,
+        currency: Currency,
+        date_from: date,
+        date_to: date,
+    ) -> Sequence[UserBalanceSnapshot]:
+        s = cls.model
+        query = (
+            select(s)
+            .where(
+                s.user_id == user_id,
+                s.currency == currency,
+                s.day.between(date_from, date_to),
+            )
+            .order_by(s.day.asc())
+        )
+        result = await db_session.execute(query)
+        return result.scalars().all()
@@ -1,8 +1,12 @@
+from uuid import UUID
+
 from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dao.base import BaseDAO
 from src.models.user import User
+from src.schemas.common.enums import CustomerType
 from src.schemas.user_schema import UserSchema
 from src.utils.pagination import Page
 
@@ -19,7 +23,7 @@ class UserDAO(BaseDAO):
     ) -> Page[UserSchema]:
         search_term = f"%{search_term}%"
         query = (
-            select(cls.model)
+            cls._select()
             .filter_by(**filter_by)
             .where(
                 or_(
@@ -33,3 +37,10 @@ class UserDAO(BaseDAO):
         )
 
         return await paginate(db_session, query)
+
+    @classmethod
+    async def get_customer_type(
+        cls, db_session: AsyncSession, user_id: UUID
+    ) -> CustomerType | None:
+        query = select(cls.model.customer_type).where(cls.model.id == user_id)
+        return (await db_session.execute(query)).scalar_one_or_none()
@@ -1,11 +1,13 @@
 from uuid import UUID
 
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import or_, select
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
 from src.api.dao.base import BaseDAO
-from src.models import Offer, User, Waybill
+from src.common.services.response_cache import mark_entity_stale
+from src.models import Offer, Product, User, Waybill, WaybillOffer
 from src.schemas.common.enums import WaybillType
 from src.schemas.waybill_schema import WaybillSchema
 from src.utils.pagination import Page
@@ -13,6 +15,11 @@ from src.utils.pagination import Page
 
 class WaybillDAO(BaseDAO):
     model = Waybill
+    # WaybillSchema embeds author and customer (both NOT NULL)
+    load_options = (
+        joinedload(Waybill.author, innerjoin=True),
+        joinedload(Waybill.customer, innerjoin=True),
+    )
 
     @classmethod
     async def find_all_paginate(
@@ -23,7 +30,7 @@ class WaybillDAO(BaseDAO):
     ) -> Page[WaybillSchema]:
         search_term = f"%{search_term}%"
         query = (
-            select(cls.model)
+            cls._select()
             .filter_by(**filter_by)
             .where(
                 or_(
@@ -54,11 +61,33 @@ class WaybillDAO(BaseDAO):
     @classmethod
     async def commit_waybill(
         cls, db_session: AsyncSession, waybill_id: UUID, user_id: UUID
-    ):
-        waybill: Waybill = await cls.find_by_id(db_session, waybill_id)
+    ) -> tuple[Waybill | None, bool]:
+        """
+        Commit the pending waybill locked FOR UPDATE: (waybill, True).
+        (waybill, False) if it is already committed, (None, False) if not found.
+        """
+        # lines -> offers for the stock update, product id/sub-category for the sales stats
+        query = (
+            cls._select(
+                (
+                    *cls.load_options,
+                    selectinload(Waybill.waybill_offers)
+                    .joinedload(WaybillOffer.offer, innerjoin=True)
+                    .joinedload(Offer.product, innerjoin=True)
+                    .options(load_only(Product.id, Product.sub_category_id)),
+                )
+            )
+            .filter_by(id=waybill_id)
+            # concurrent commits of the waybill wait here and see it committed
+            .with_for_update(of=Waybill)
+            .execution_options(populate_existing=True)
+        )
+        waybill: Waybill = (
+            (await db_session.execute(query)).unique().scalar_one_or_none()
+        )
 
         if not waybill or not waybill.is_pending:
-            return waybill  # already committed or not found
+            return waybill, False  # already committed or not found
 
         waybill.is_pending = False
 
@@ -75,5 +104,6 @@ class WaybillDAO(BaseDAO):
                 offer.quantity += w_offer.quantity
             else:
                 offer.quantity -= w_offer.quantity
+            mark_entity_stale(db_session, offer)
 
-        return waybill
+        return waybill, True
@@ -1,28 +1,32 @@
-from sqlalchemy.exc import SQLAlchemyError
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from src.api.dao.base import BaseDAO
+from src.api.dao.offer_dao import OfferDAO
 from src.models.waybill_offer import WaybillOffer
-from utils.logging import logger
 
 
 class WaybillOfferDAO(BaseDAO):
     model = WaybillOffer
+    load_options = (
+        joinedload(WaybillOffer.offer, innerjoin=True).options(*OfferDAO.load_options),
+    )
 
     @classmethod
-    async def add(cls, db_session, **values) -> WaybillOffer:
+    async def find_by_waybill(
+        cls, db_session: AsyncSession, waybill_id: UUID
+    ) -> Sequence[WaybillOffer]:
         """
-        More: https://habr.com/ru/articles/828328/, 'Управление транзакциями'
-        :param db_session:
-        :param values:
-        :return:
+        Lines of a waybill in document order, each with its offer -> product ->
+        sub-category -> category: one statement, ordered by the database.
         """
-        try:
-            new_instance = cls.model(**values)
-            db_session.add(new_instance)
-            await db_session.flush()  # Ensure the instance is added to the session
-            await db_session.commit()
-            return new_instance
-
-        except SQLAlchemyError as e:
-            logger.error("SQLAlchemyError: %s", e)
-            raise e
+        query = (
+            cls._select()
+            .where(cls.model.waybill_id == waybill_id)
+            .order_by(cls.model.position)
+        )
+        result = await db_session.execute(query)
+        return result.scalars().all()
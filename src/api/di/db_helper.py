@@ -1,14 +1,50 @@
-from typing import AsyncGenerator
+import inspect
+from typing import Any, AsyncGenerator, Callable
 
-from sqlalchemy import NullPool
+from sqlalchemy import NullPool, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
 
 from src.config import settings
+from src.utils.logging import logger
+
+AFTER_COMMIT_KEY = "after_commit"
+COMMITTED_KEY = "after_commit_ready"
+
+
+def after_commit(db_session: AsyncSession, func: Callable, *args: Any) -> None:
+    """
+    Run `func(*args)` once the session's transaction has been committed,
+    dropped if it is rolled back. Run by the session dependency on exit.
+    """
+    db_session.info.setdefault(AFTER_COMMIT_KEY, []).append((func, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _release_after_commit(session: Session) -> None:
+    if callbacks := session.info.pop(AFTER_COMMIT_KEY, None):
+        session.info.setdefault(COMMITTED_KEY, []).extend(callbacks)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_after_commit(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+async def run_after_commit(db_session: AsyncSession) -> None:
+    for func, args in db_session.info.pop(COMMITTED_KEY, []):
+        try:
+            result = func(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning("[DB] After-commit %s failed: %s", func.__qualname__, e)
 
 
 class DatabaseHelper:
@@ -67,10 +103,14 @@ class DatabaseHelper:
     async def session_getter_manual(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.AsyncSessionFactory() as session:
             yield session
+            await run_after_commit(session)
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
-        async with self.AsyncSessionFactory() as session, session.begin():
-            yield session
+        async with self.AsyncSessionFactory() as session:
+            async with session.begin():
+                yield session
+            # the transaction has been committed: run its side effects
+            await run_after_commit(session)
 
 
 db_helper = DatabaseHelper(
@@ -0,0 +1,97 @@
+import http
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.utils.logging import logger
+
+# room for the form fields sent along with the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class BodyTooLargeError(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """
+    Cuts off multipart bodies over IMAGE_MAX_SIZE while they are received,
+    before Starlette spools the whole upload:
+    - a Content-Length over the limit is answered with 413 at once
+    - a chunked body is counted chunk by chunk, reading stops past the limit
+    Pure ASGI: the body is passed through, never buffered.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int | None = None) -> None:
+        self.app = app
+        self.max_size = (max_size or settings.IMAGE_MAX_SIZE) + MULTIPART_OVERHEAD
+
+    @staticmethod
+    def _is_multipart(scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                return value.startswith(b"multipart/form-data")
+        return False
+
+    async def _reject(self, send: Send) -> None:
+        body = orjson.dumps({"detail": f"Request body is over {self.max_size} bytes."})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": http.HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"").decode()
+        if content_length.isdigit() and int(content_length) > self.max_size:
+            logger.warning(
+                "[BodySize] %s rejected: %s bytes", scope["path"], content_length
+            )
+            await self._reject(send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    exceeded = True
+                    raise BodyTooLargeError
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                # the app answers the aborted form with 400/500: replaced with 413
+                return
+            response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # BodyTooLargeError, possibly re-raised as something else by the app
+            if not exceeded:
+                raise
+        if exceeded and not response_started:
+            logger.warning(
+                "[BodySize] %s rejected: over %s bytes", scope["path"], self.max_size
+            )
+            await self._reject(send)
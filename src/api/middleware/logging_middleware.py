@@ -58,6 +58,9 @@ class LoggingMiddleware:
         return EMPTY_VALUE
 
     async def get_request_body(self, request: Request) -> bytes:
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            # file uploads are streamed to the route, not buffered for the log
+            return b""
         body = await request.body()
 
         request._receive = ReceiveProxy(receive=request.receive, cached_body=body)
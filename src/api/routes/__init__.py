@@ -6,10 +6,12 @@ from api.routes.integrations.integration_router import router as integration_rou
 from api.routes.integrations.mail_router import router as mail_router
 from api.routes.integrations.webhook_router import router as webhook_router
 from api.routes.utils.health_check_router import router as health_check_router
+from api.routes.utils.jobs_router import router as jobs_router
 from api.routes.utils.version_router import router as version_router
 
 from .analytical_router import router as analytical_router
 from .audit_log_router import router as audit_log_router
+from .cart_router import router as cart_router
 from .category_router import router as category_router
 from .offer_router import router as offer_router
 from .order_offers_router import router as order_offers_router
@@ -33,6 +35,7 @@ router.include_router(category_router)
 router.include_router(sub_category_router)
 router.include_router(product_router)
 router.include_router(offer_router)
+router.include_router(cart_router)
 router.include_router(waybill_router)
 router.include_router(waybill_offers_router)
 router.include_router(order_router)
@@ -41,6 +44,7 @@ router.include_router(analytical_router)
 router.include_router(webhook_router)
 router.include_router(health_check_router)
 router.include_router(version_router)
+router.include_router(jobs_router)
 router.include_router(mail_router)
 router.include_router(documents_router)
 router.include_router(integration_router)
@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, status
-from fastapi_cache.decorator import cache
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.auth.better_auth import require_role
 from src.api.di.db_helper import db_helper
 from src.api.services.analytical_service import AnalyticalService
-from src.schemas.analytical_schema import ProductFacetsSchema
-from src.schemas.common.enums import Role
+from src.api.services.facet_service import FacetService
+from src.common.deps.redis_service import get_redis_service
+from src.schemas.analytical_schema import ProductFacetsSchema, SalesReportSchema
+from src.schemas.common.enums import (
+    Role,
+    SalesGranularity,
+    SalesGroupBy,
+    SalesWindow,
+)
 from src.schemas.product_schema import ProductAnalyticalSchema
-from src.utils.cache_coder import ORJsonCoder
 
 router = APIRouter(
     tags=["Analytics"],
@@ -23,14 +31,16 @@ router = APIRouter(
     summary="Return best selling products",
     status_code=status.HTTP_200_OK,
 )
-@cache(60 * 60, coder=ORJsonCoder)
 async def get_best_selling_products(
+    window: SalesWindow = SalesWindow.ALL,
     db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
     """
-    Retrieves the best-selling products from the database and returns them as a list of dictionaries.
+    Retrieves the best-selling products for a time window (7d, 30d, all).
+    Served from the incrementally maintained daily sales buckets, so fresh sales
+    are visible right after the waybill commit.
     """
-    result_rows = await AnalyticalService.get_sold_products(db_session)
+    result_rows = await AnalyticalService.get_sold_products(db_session, window)
     return [
         ProductAnalyticalSchema(
             name=name,
@@ -48,12 +58,39 @@ async def get_best_selling_products(
     summary="Return product facets",
     status_code=status.HTTP_200_OK,
 )
-@cache(60 * 60, coder=ORJsonCoder)
 async def get_product_facets(
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
+):
+    """
+    Retrieves product facets: category, sub-category, in-stock and has-image counts.
+    Served from Redis, recomputed with a single query after catalogue writes.
+    """
+    return await FacetService.get_facets(db_session, redis)
+
+
+@router.get(
+    "/sales",
+    response_model=SalesReportSchema,
+    summary="Return sales time series grouped by a dimension",
+    status_code=status.HTTP_200_OK,
+)
+async def get_sales(
+    group_by: SalesGroupBy = SalesGroupBy.PRODUCT,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    granularity: SalesGranularity = SalesGranularity.DAY,
+    db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
     """
-    Retrieves product facets including category and sub-category counts.
+    Revenue and sold quantity per day/week/month for products, brands,
+    sub-categories or customer types, built from the daily sales buckets.
     """
-    facets = await AnalyticalService.calculate_product_facets(db_session)
-    return facets
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be before or equal to 'to'",
+        )
+    return await AnalyticalService.get_sales_report(
+        db_session, group_by, date_from, date_to, granularity
+    )
@@ -0,0 +1,41 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, status
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.auth.better_auth import require_role
+from src.api.dao.user_dao import UserDAO
+from src.api.di.db_helper import db_helper
+from src.api.services.cart_service import CartService
+from src.common.deps.redis_service import get_redis_service
+from src.schemas.cart_schema import CartItemSchema, CartQuoteSchema
+from src.schemas.common.enums import Role
+
+router = APIRouter(tags=["Cart"], prefix="/cart")
+
+MAX_CART_LINES = 300
+
+
+@router.post(
+    "/quote",
+    response_model=CartQuoteSchema,
+    summary="Price the cart for the current user",
+    status_code=status.HTTP_200_OK,
+)
+async def quote_cart(
+    payload: Annotated[
+        list[CartItemSchema], Body(min_length=1, max_length=MAX_CART_LINES)
+    ],
+    user_id: UUID = Depends(require_role(Role.USER)),
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
+):
+    """
+    Takes the SPA cart `[{offer_id, qty}]` and returns the lines at the user's
+    pricing tier with stock checks and totals. Replaces refreshing the cart
+    through `POST /offers/by-ids`: no COUNT, no page size cap.
+    """
+    customer_type = await UserDAO.get_customer_type(db_session, user_id)
+    return await CartService.quote(db_session, redis, customer_type, payload)
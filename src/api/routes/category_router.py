@@ -2,17 +2,24 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi_pagination import paginate
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from api.dao.helper import OrderByOption
 from src.api.auth.better_auth import require_role
 from src.api.core.create_entity import create_entity_with_image
+from src.api.core.invalidation import (
+    enqueue_image_uploads,
+    invalidate_catalogue_tree,
+    invalidate_facets,
+    invalidate_response_cache,
+)
 from src.api.core.update_entity import (
     update_entity_with_optional_image,
 )
 from src.api.dao.category_dao import CategoryDAO
 from src.api.di.db_helper import db_helper
+from src.api.services.catalogue_service import catalogue_service
 from src.common.deps.s3_service import get_s3_service
 from src.common.services.s3_service import S3Service
 from src.schemas.category_schema import (
@@ -32,12 +39,11 @@ router = APIRouter(tags=["Categories"], prefix="/categories")
     summary="Return all categories with pagination",
     status_code=status.HTTP_200_OK,
 )
-# @cache(expire=60 * 10, coder=ORJsonCoder)
 async def get_categories(
     db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    order_by: OrderByOption = {"field": "name", "direction": "asc"}
-    return await CategoryDAO.find_all_paginate(db_session, order_by=order_by)
+    tree = await catalogue_service.get_tree(db_session)
+    return paginate(tree.categories)
 
 
 @router.get(
@@ -50,7 +56,8 @@ async def get_category_by_slug(
     slug: str,
     db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    res = await CategoryDAO.find_by_slug(db_session, slug)
+    tree = await catalogue_service.get_tree(db_session)
+    res = tree.categories_by_slug.get(slug)
     if not res:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
@@ -68,7 +75,8 @@ async def get_category_by_id(
     category_id: UUID,
     db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    res = await CategoryDAO.find_by_id(db_session, category_id)
+    tree = await catalogue_service.get_tree(db_session)
+    res = tree.categories_by_id.get(category_id)
     if not res:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
@@ -81,7 +89,13 @@ async def get_category_by_id(
     response_model=CategorySchema,
     summary="Create a new category",
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_catalogue_tree),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def post_category(
     payload: Annotated[CategoryPostSchema, Depends(CategoryPostSchema.as_form)],
@@ -104,7 +118,13 @@ async def post_category(
     response_model=CategorySchema,
     status_code=status.HTTP_200_OK,
     summary="Selective update category by id",
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_catalogue_tree),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def patch_category(
     category_id: UUID,
@@ -128,7 +148,12 @@ async def patch_category(
     "/{category_id}",
     summary="Delete a category by id",
     status_code=status.HTTP_204_NO_CONTENT,
-    dependencies=[Depends(require_role(Role.ADMIN))],
+    dependencies=[
+        Depends(require_role(Role.ADMIN)),
+        Depends(invalidate_facets),
+        Depends(invalidate_catalogue_tree),
+        Depends(invalidate_response_cache),
+    ],
 )
 async def delete_category(
     category_id: UUID,
@@ -1,40 +1,47 @@
-from datetime import datetime
-from typing import BinaryIO
+from datetime import date
 
 from fastapi import APIRouter, Depends, status
 from pydantic import HttpUrl
 
 from src.api.auth import validate_api_key
-from src.api.core.price_service import fetch_price_list
+from src.api.services.price_list_service import PriceListService
+from src.common.deps.job_queue import get_job_queue
 from src.common.deps.s3_service import get_s3_service
+from src.common.services.job_queue import JobQueue
 from src.common.services.s3_service import S3Service
+from src.schemas.common.enums import JobName, PriceListExt, PriceListType
 
 router = APIRouter(tags=["Documents"], prefix="/documents")
 
 
 @router.post(
     "/price",
-    summary="Upload PriceList to S3 and return a presigned URL",
-    status_code=status.HTTP_200_OK,
+    summary="Queue the price lists (xlsx/csv, retail/wholesale) and return their links",
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[Depends(validate_api_key)],
 )
 async def upload_price_and_get_link(
+    ext: PriceListExt = PriceListExt.EXCEL,
+    price_type: PriceListType = PriceListType.RETIAL,
     s3: S3Service = Depends(get_s3_service),
+    jobs: JobQueue = Depends(get_job_queue),
 ) -> dict[str, HttpUrl | str]:
-    now = datetime.now()
-    key = s3.generate_key(
-        f"price_list_{now.strftime('%d_%m_%Y')}.xlsx", use_file_name=True
+    """
+    All four variants are built in one pass by the worker;
+    `url` is the one selected by `ext` and `price_type`.
+    The links are valid once the job `job_id` is complete (GET /jobs/{job_id}).
+    """
+    day = date.today()
+    job_id, _ = await jobs.enqueue(
+        JobName.PRICE_LIST, {"day": day.isoformat()}, key=day.isoformat()
     )
-    url = s3.get_file_url(key)
-
-    price_file: BinaryIO = await fetch_price_list()
-
-    await s3.upload_file(
-        file=price_file,
-        key=key,
-        extra_args={
-            "ACL": "public-read",
-            "ContentType": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        },
-    )
-    return {"url": url}
+    urls = {
+        (_ext, _type): s3.get_file_url(PriceListService.get_key(_ext, _type, day))
+        for _ext in PriceListExt
+        for _type in PriceListType
+    }
+    return {
+        "job_id": job_id,
+        "url": urls[(ext, price_type)],
+        **{f"{_type}_{_ext}": url for (_ext, _type), url in urls.items()},
+    }
@@ -1,40 +1,57 @@
 from datetime import datetime
-from tempfile import NamedTemporaryFile
 
-from fastapi import APIRouter, Depends, Response
-from fastapi.responses import FileResponse
-from fastapi_cache.decorator import cache
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from redis.asyncio import Redis
 
-from api.core.integrations import build_yml
-from src.api.di.db_helper import db_helper
-from src.utils.cache_coder import ORJsonCoder
+from api.core.integrations import YML_FEED_KEY
+from src.common.deps.job_queue import get_job_queue
+from src.common.deps.redis_service import get_redis_service
+from src.common.services.job_queue import JobQueue
+from src.schemas.common.enums import JobName
 
 router = APIRouter(tags=["Integrations"], prefix="/integrations")
 
 
+async def get_feed(redis: Redis, jobs: JobQueue) -> str:
+    """
+    The feed is built hourly by the worker (`yml_feed` job).
+    If there is none yet, the build is queued and the client asked to retry.
+    """
+    xml = await redis.get(YML_FEED_KEY)
+    if xml is None:
+        await jobs.enqueue(JobName.YML_FEED, key="on-demand")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The feed is being built, retry later",
+            headers={"Retry-After": "60"},
+        )
+    return xml
+
+
 # --------------------------------------------------------
 # Endpoint 1 — normal Yandex feed (for production)
 # --------------------------------------------------------
-@cache(expire=3600 * 12, coder=ORJsonCoder)
 @router.get("/yml", response_class=Response)
-async def export_yml(db: AsyncSession = Depends(db_helper.session_getter)):
-    xml = await build_yml(db)
+async def export_yml(
+    redis: Redis = Depends(get_redis_service),
+    jobs: JobQueue = Depends(get_job_queue),
+):
+    xml = await get_feed(redis, jobs)
     return Response(content=xml, media_type="application/xml")
 
 
 # --------------------------------------------------------
 # Endpoint 2 — downloadable file for debugging
 # --------------------------------------------------------
-@router.get("/yml/file")
-async def export_yml_file(db: AsyncSession = Depends(db_helper.session_getter)):
-    xml = await build_yml(db)
-
-    with NamedTemporaryFile(delete=False, suffix=".xml") as tmp:
-        tmp.write(xml.encode("utf-8"))
-
-    return FileResponse(
-        tmp.name,
+@router.get("/yml/file", response_class=Response)
+async def export_yml_file(
+    redis: Redis = Depends(get_redis_service),
+    jobs: JobQueue = Depends(get_job_queue),
+):
+    xml = await get_feed(redis, jobs)
+    filename = f"yml_feed_{datetime.now().date()}.xml"
+    return Response(
+        content=xml,
         media_type="application/xml",
-        filename=f"yml_feed_{datetime.now().date()}.xml",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
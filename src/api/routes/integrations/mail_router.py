@@ -1,36 +1,72 @@
-from datetime import datetime
+from uuid import UUID
 
-import resend
-from fastapi import APIRouter, Depends, status
-from jinja2 import Environment, FileSystemLoader
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.auth import validate_api_key
-from src.config import settings
+from src.api.core.invalidation import enqueue_jobs
+from src.api.dao.email_campaign_dao import EmailCampaignDAO
+from src.api.di.db_helper import db_helper
+from src.api.services.email_campaign_service import EmailCampaignService
+from src.common.deps.job_queue import get_job_queue
+from src.common.deps.s3_service import get_s3_service
+from src.common.services.job_queue import JobQueue
+from src.common.services.s3_service import S3Service
+from src.schemas.common.enums import JobName
+from src.schemas.email_campaign_schema import (
+    EmailCampaignReportSchema,
+    EmailCampaignSchema,
+    EmailCampaignStartedSchema,
+)
 
 router = APIRouter(tags=["Mailing"], prefix="/mail")
-resend.api_key = settings.SMTP.RESEND_API_KEY
 
 
-env = Environment(loader=FileSystemLoader("templates"))
-template = env.get_template("pricing_email.html")
+@router.post(
+    "/campaigns/pricing",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(validate_api_key), Depends(enqueue_jobs)],
+)
+async def start_pricing_campaign(
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+    s3: S3Service = Depends(get_s3_service),
+) -> EmailCampaignStartedSchema:
+    """
+    Mail today's price list to every user with `mailing` on.
+    Sent by the worker; progress is at GET /mail/campaigns/{campaign_id}
+    """
+    campaign, job_id = await EmailCampaignService.create_pricing(db_session, s3)
+    return EmailCampaignStartedSchema(
+        campaign=EmailCampaignSchema.model_validate(campaign), job_id=job_id
+    )
 
-now = datetime.now()
-html = template.render(
-    pricelist_url=f"{settings.AWS.S3_ENDPOINT_URL}/tcf-images/tmp/price_list_{now.strftime('%d_%m_%Y')}.xlsx"
+
+@router.get(
+    "/campaigns/{campaign_id}",
+    dependencies=[Depends(validate_api_key)],
 )
+async def get_campaign(
+    campaign_id: UUID,
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+) -> EmailCampaignReportSchema:
+    campaign = await EmailCampaignDAO.find_by_id(db_session, campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    outcomes = await EmailCampaignDAO.count_outcomes(db_session, campaign_id)
+    return EmailCampaignReportSchema(
+        **EmailCampaignSchema.model_validate(campaign).model_dump(),
+        outcomes=outcomes,
+    )
 
 
 @router.post(
     "/{recipient}",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     dependencies=[Depends(validate_api_key)],
 )
-def send_mail(recipient) -> dict:
-    params: resend.Emails.SendParams = {
-        "from": "info@info.eucalytics.uk",
-        "to": [f"{recipient}@gmail.com"],
-        "subject": "ТЦ Форд - рассылка",
-        "html": html,
-    }
-    email: resend.Email = resend.Emails.send(params)
-    return email
+async def send_mail(recipient: str, jobs: JobQueue = Depends(get_job_queue)) -> dict:
+    """
+    Queue the price list mailing to the recipient, sent by the worker
+    """
+    job_id, _ = await jobs.enqueue(JobName.PRICE_MAIL, {"recipient": recipient})
+    return {"job_id": job_id}
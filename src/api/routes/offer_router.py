@@ -1,24 +1,52 @@
+from functools import partial
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.auth.better_auth import require_role
+from src.api.core.conditional_get import (
+    cache_validators,
+    entity_validators,
+    if_match_version,
+    not_modified,
+    version_etag,
+)
 from src.api.core.create_entity import (
     create_entity_with_optional_image,
 )
+from src.api.core.invalidation import (
+    enqueue_image_uploads,
+    invalidate_facets,
+    invalidate_response_cache,
+)
 from src.api.core.update_entity import (
     update_entity_with_optional_image,
 )
 from src.api.dao.offer_dao import OfferDAO
 from src.api.dao.product_dao import ProductDAO
 from src.api.di.db_helper import db_helper
+from src.api.services.outbox_service import OutboxService
+from src.common.deps.redis_service import get_redis_service
 from src.common.deps.s3_service import get_s3_service
+from src.common.services.response_cache import ResponseCache, cache_tag
 from src.common.services.s3_service import S3Service
-from src.schemas.common.enums import Role
+from src.models import Category, Offer, Product, SubCategory
+from src.schemas.common.enums import ListView, Role
 from src.schemas.offer_schema import OfferPatchSchema, OfferPostSchema, OfferSchema
-from src.utils.pagination import Page
+from src.utils.pagination import Page, current_limit_offset, json_page
+from src.utils.serializer import compile_serializer
 
 router = APIRouter(tags=["Offers"], prefix="/offers")
 
@@ -29,13 +57,19 @@ router = APIRouter(tags=["Offers"], prefix="/offers")
     summary="Return all offers with pagination or filter them",
     status_code=status.HTTP_200_OK,
 )
-# @cache(expire=60, coder=ORJsonCoder)
 async def get_offers(
+    request: Request,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
     product_id: UUID | None = None,
     product_slug: str | None = None,
     is_deleted: bool = False,
+    view: ListView = ListView.FULL,
 ):
+    """
+    `view=compact` returns flat rows (id, product_id, name, brand, manufacturer_number,
+    price_rub, quantity, image_url) selected as plain columns, without the nested product.
+    """
     filters: dict[str, str | bool | UUID] = {"is_deleted": is_deleted}
 
     if product_slug:
@@ -47,7 +81,40 @@ async def get_offers(
     if product_id:
         filters["product_id"] = product_id
 
-    return await OfferDAO.find_all_paginate(db_session, filter_by=filters)
+    # OfferSchema embeds the product -> sub-category -> category chain
+    tags = [cache_tag(Product), cache_tag(SubCategory), cache_tag(Category)]
+    if "product_id" in filters:
+        tags.append(cache_tag(Product, filters["product_id"]))
+    else:
+        tags.append(cache_tag(Offer))
+
+    async def validators():
+        last_modified, count = await OfferDAO.get_watermark(
+            db_session, filters, embedded=(Product, SubCategory, Category)
+        )
+        return cache_validators(request, last_modified, count)
+
+    async def compute():
+        if view == ListView.COMPACT:
+            items, total = await OfferDAO.find_compact(
+                db_session, filters, *current_limit_offset()
+            )
+            return json_page(items, total)
+
+        rows, total = await OfferDAO.find_page(
+            db_session, filters, *current_limit_offset()
+        )
+        dump = compile_serializer(OfferSchema)
+        return json_page([dump(row) for row in rows], total)
+
+    return await ResponseCache.get_or_compute(
+        redis,
+        key=ResponseCache.key("offers", request),
+        tags=tags,
+        compute=compute,
+        validators=validators,
+        not_modified=partial(not_modified, request),
+    )
 
 
 @router.get(
@@ -58,9 +125,38 @@ async def get_offers(
 )
 async def get_offer(
     offer_id: UUID,
+    request: Request,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
 ):
-    return await OfferDAO.find_by_id(db_session, offer_id)
+    offer = None
+
+    async def validators():
+        nonlocal offer
+        offer = await OfferDAO.find_by_id(db_session, offer_id)
+        if not offer:
+            raise HTTPException(status_code=404, detail="Offer not found")
+        product = offer.product
+        return entity_validators(
+            offer, product, product.sub_category, product.sub_category.category
+        )
+
+    async def compute():
+        return OfferSchema.model_validate(offer)
+
+    return await ResponseCache.get_or_compute(
+        redis,
+        key=ResponseCache.key(f"offers:{offer_id}", request),
+        tags=[
+            cache_tag(Offer, offer_id),
+            cache_tag(Product),
+            cache_tag(SubCategory),
+            cache_tag(Category),
+        ],
+        compute=compute,
+        validators=validators,
+        not_modified=partial(not_modified, request),
+    )
 
 
 @router.post(
@@ -138,7 +234,12 @@ async def full_text_search_offers(
     response_model=OfferSchema,
     summary="Create new offer",
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def post_offer(
     payload: Annotated[OfferPostSchema, Depends(OfferPostSchema.as_form)],
@@ -153,7 +254,6 @@ async def post_offer(
         db_session=db_session,
         s3=s3,
         dao=OfferDAO,
-        refresh_fields=["product"],
     )
 
 
@@ -162,16 +262,29 @@ async def post_offer(
     response_model=OfferSchema,
     summary="Update offer by id",
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def patch_offer(
     offer_id: UUID,
+    response: Response,
     payload: Annotated[OfferPatchSchema, Depends(OfferPatchSchema.as_form)],
     image_blob: UploadFile | None = File(None),
+    expected_version: int | None = Depends(if_match_version),
     db_session: AsyncSession = Depends(db_helper.session_getter),
     s3: S3Service = Depends(get_s3_service),
 ):
-    return await update_entity_with_optional_image(
+    """
+    `If-Match: "<version>"` makes the update conditional: 409 if the offer
+    was changed since that version.
+    A price change is published to the outbox (caches, YML feed).
+    """
+    prices = await OfferDAO.get_prices(db_session, offer_id)
+    offer = await update_entity_with_optional_image(
         entity_id=offer_id,
         payload=payload,
         dao=OfferDAO,
@@ -179,14 +292,23 @@ async def patch_offer(
         db_session=db_session,
         s3=s3,
         image_blob=image_blob,
+        expected_version=expected_version,
     )
+    if prices != (offer.price_rub, offer.super_wholesale_price_rub):
+        OutboxService.offer_price_changed(db_session, offer)
+    response.headers.update(version_etag(offer))
+    return offer
 
 
 @router.delete(
     "/{offer_id}",
     summary="Delete offer by id",
     status_code=status.HTTP_204_NO_CONTENT,
-    dependencies=[Depends(require_role(Role.ADMIN))],
+    dependencies=[
+        Depends(require_role(Role.ADMIN)),
+        Depends(invalidate_facets),
+        Depends(invalidate_response_cache),
+    ],
 )
 async def delete_offer(
     offer_id: UUID,
@@ -1,14 +1,17 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.auth.better_auth import require_role
 from src.api.core.update_entity import update_entity
 from src.api.dao.offer_dao import OfferDAO
 from src.api.dao.order_dao import OrderDAO
-from src.api.di.db_helper import db_helper
+from src.api.di.db_helper import after_commit, db_helper
 from src.api.services.order_service import OrderService
+from src.api.services.stock_service import StockReservationService
+from src.common.deps.redis_service import get_redis_service
 from src.models import Order, Product
 from src.schemas.common.enums import OrderStatus, Role
 from src.schemas.offer_schema import OfferSchema
@@ -23,7 +26,7 @@ from src.schemas.order_schema import (
     OrderWithOffersPostSchema,
 )
 from src.schemas.waybill_schema import WaybillSchema
-from src.utils.pagination import Page
+from src.utils.pagination import Page, RowJSONResponse
 
 # Flow:
 # 1. Create a cart
@@ -97,7 +100,7 @@ async def get_order_offers(
             status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
         )
 
-    return await OrderService.fetch_order_offers(order)
+    return RowJSONResponse(await OrderService.fetch_order_offers(order))
 
 
 @router.get(
@@ -134,12 +137,16 @@ async def post_order(
     payload: OrderWithOffersPostSchema,
     user_id: UUID = Depends(require_role(Role.USER)),
     db_session: AsyncSession = Depends(db_helper.session_getter_manual),
+    redis: Redis = Depends(get_redis_service),
 ):
+    """
+    The order's stock is reserved: 409 if any offer doesn't have enough.
+    """
     internal = OrderWithOffersInternalPostSchema(
         user_id=user_id,
         **payload.model_dump(),
     )
-    return await OrderService.post_order_with_offers(db_session, internal)
+    return await OrderService.post_order_with_offers(db_session, redis, internal)
 
 
 @router.post(
@@ -223,10 +230,14 @@ async def patch_order(
     order_id: UUID,
     payload: OrderPatchSchema,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
 ):
-    return await update_entity(
+    order = await update_entity(
         entity_id=order_id, payload=payload, dao=OrderDAO, db_session=db_session
     )
+    if payload.status == OrderStatus.CANCELED:
+        after_commit(db_session, StockReservationService.release, redis, order_id)
+    return order
 
 
 @router.delete(
@@ -238,7 +249,9 @@ async def patch_order(
 async def delete_order(
     order_id: UUID,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
 ):
     success = await OrderDAO.delete_by_id(db_session, order_id)
     if not success:
         raise HTTPException(status_code=404, detail="Order not found")
+    after_commit(db_session, StockReservationService.release, redis, order_id)
@@ -1,27 +1,55 @@
+from functools import partial
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.auth.better_auth import require_role
+from src.api.core.conditional_get import (
+    cache_validators,
+    entity_validators,
+    if_match_version,
+    not_modified,
+    version_etag,
+)
 from src.api.core.create_entity import create_entity_with_image
+from src.api.core.invalidation import (
+    enqueue_image_uploads,
+    invalidate_facets,
+    invalidate_response_cache,
+)
 from src.api.core.update_entity import (
     update_entity_with_optional_image,
 )
 from src.api.dao.helper import OrderByOption
 from src.api.dao.product_dao import ProductDAO
-from src.api.dao.sub_category_dao import SubCategoryDAO
 from src.api.di.db_helper import db_helper
+from src.api.services.catalogue_service import catalogue_service
+from src.api.services.facet_service import FacetService
+from src.common.deps.redis_service import get_redis_service
 from src.common.deps.s3_service import get_s3_service
+from src.common.services.response_cache import ResponseCache, cache_tag
 from src.common.services.s3_service import S3Service
-from src.schemas.common.enums import Role
+from src.models import Category, Product, SubCategory
+from src.schemas.common.enums import ListView, Role
 from src.schemas.product_schema import (
     ProductPatchSchema,
     ProductPostSchema,
     ProductSchema,
 )
-from src.utils.pagination import Page
+from src.utils.pagination import Page, current_limit_offset, json_page
+from src.utils.serializer import compile_serializer
 
 router = APIRouter(tags=["Products"], prefix="/products")
 
@@ -32,18 +60,25 @@ router = APIRouter(tags=["Products"], prefix="/products")
     summary="Return all products with pagination or filter them",
     status_code=status.HTTP_200_OK,
 )
-# @cache(expire=60, coder=ORJsonCoder)
 async def get_products(
+    request: Request,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
     sub_category_id: UUID | None = None,
     sub_category_slug: str | None = None,
     is_deleted: bool = False,
+    view: ListView = ListView.FULL,
 ):
+    """
+    `view=compact` returns flat rows (id, name, slug, sub_category_id, image_url)
+    selected as plain columns, without the nested sub-category/category.
+    """
     order_by: OrderByOption = {"field": "name", "direction": "asc"}
 
     filters: dict[str, bool | UUID | str] = {"is_deleted": is_deleted}
     if sub_category_slug:
-        sub_category = await SubCategoryDAO.find_by_slug(db_session, sub_category_slug)
+        tree = await catalogue_service.get_tree(db_session)
+        sub_category = tree.sub_categories_by_slug.get(sub_category_slug)
         if not sub_category:
             raise HTTPException(status_code=404, detail="SubCategory not found")
         filters["sub_category_id"] = sub_category.id
@@ -51,8 +86,39 @@ async def get_products(
     if sub_category_id:
         filters["sub_category_id"] = sub_category_id
 
-    return await ProductDAO.find_all_paginate(
-        db_session, filter_by=filters, order_by=order_by
+    # ProductSchema embeds the sub-category and its category
+    tags = [cache_tag(SubCategory), cache_tag(Category)]
+    if "sub_category_id" in filters:
+        tags.append(cache_tag(SubCategory, filters["sub_category_id"]))
+    else:
+        tags.append(cache_tag(Product))
+
+    async def validators():
+        last_modified, count = await ProductDAO.get_watermark(
+            db_session, filters, embedded=(SubCategory, Category)
+        )
+        return cache_validators(request, last_modified, count)
+
+    async def compute():
+        if view == ListView.COMPACT:
+            items, total = await ProductDAO.find_compact(
+                db_session, filters, *current_limit_offset()
+            )
+            return json_page(items, total)
+
+        rows, total = await ProductDAO.find_page(
+            db_session, filters, *current_limit_offset(), order_by=order_by
+        )
+        dump = compile_serializer(ProductSchema)
+        return json_page([dump(row) for row in rows], total)
+
+    return await ResponseCache.get_or_compute(
+        redis,
+        key=ResponseCache.key("products", request),
+        tags=tags,
+        compute=compute,
+        validators=validators,
+        not_modified=partial(not_modified, request),
     )
 
 
@@ -64,12 +130,36 @@ async def get_products(
 )
 async def get_product_by_id(
     product_id: UUID,
+    request: Request,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
 ):
-    res = await ProductDAO.find_by_id(db_session, product_id)
-    if not res:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return res
+    product = None
+
+    async def validators():
+        nonlocal product
+        product = await ProductDAO.find_by_id(db_session, product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return entity_validators(
+            product, product.sub_category, product.sub_category.category
+        )
+
+    async def compute():
+        return ProductSchema.model_validate(product)
+
+    return await ResponseCache.get_or_compute(
+        redis,
+        key=ResponseCache.key(f"products:{product_id}", request),
+        tags=[
+            cache_tag(Product, product_id),
+            cache_tag(SubCategory),
+            cache_tag(Category),
+        ],
+        compute=compute,
+        validators=validators,
+        not_modified=partial(not_modified, request),
+    )
 
 
 @router.get(
@@ -80,12 +170,33 @@ async def get_product_by_id(
 )
 async def get_product_by_slug(
     slug: str,
+    request: Request,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
 ):
-    res = await ProductDAO.find_by_slug(db_session, slug)
-    if not res:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return res
+    product = None
+
+    async def validators():
+        nonlocal product
+        product = await ProductDAO.find_by_slug(db_session, slug)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return entity_validators(
+            product, product.sub_category, product.sub_category.category
+        )
+
+    async def compute():
+        return ProductSchema.model_validate(product)
+
+    # the slug may move to another row: any product write invalidates it
+    return await ResponseCache.get_or_compute(
+        redis,
+        key=ResponseCache.key(f"products:slug:{slug}", request),
+        tags=[cache_tag(Product), cache_tag(SubCategory), cache_tag(Category)],
+        compute=compute,
+        validators=validators,
+        not_modified=partial(not_modified, request),
+    )
 
 
 @router.get(
@@ -140,8 +251,10 @@ async def count_products(
 )
 async def get_product_counts_per_category(
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
 ):
-    return await ProductDAO.get_product_counts_per_category(db_session)
+    facets = await FacetService.get_facets(db_session, redis)
+    return {f.category_name: f.product_count for f in facets.categories}
 
 
 @router.get(
@@ -153,8 +266,14 @@ async def get_product_counts_per_category(
 async def get_product_counts_per_sub_category(
     category_id: UUID,
     db_session: AsyncSession = Depends(db_helper.session_getter),
+    redis: Redis = Depends(get_redis_service),
 ):
-    return await ProductDAO.get_product_counts_per_sub_category(db_session, category_id)
+    facets = await FacetService.get_facets(db_session, redis)
+    return {
+        f.sub_category_name: f.product_count
+        for f in facets.sub_categories
+        if f.category_id == category_id
+    }
 
 
 @router.post(
@@ -162,7 +281,12 @@ async def get_product_counts_per_sub_category(
     response_model=ProductSchema,
     summary="Create new product",
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def post_product(
     payload: Annotated[ProductPostSchema, Depends(ProductPostSchema.as_form)],
@@ -177,7 +301,6 @@ async def post_product(
         db_session=db_session,
         s3=s3,
         dao=ProductDAO,
-        refresh_fields=["sub_category"],
     )
 
 
@@ -186,16 +309,27 @@ async def post_product(
     response_model=ProductSchema,
     summary="Update product by id",
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def patch_product(
     product_id: UUID,
+    response: Response,
     payload: Annotated[ProductPatchSchema, Depends(ProductPatchSchema.as_form)],
     image_blob: UploadFile | None = File(None),
+    expected_version: int | None = Depends(if_match_version),
     db_session: AsyncSession = Depends(db_helper.session_getter),
     s3: S3Service = Depends(get_s3_service),
 ):
-    return await update_entity_with_optional_image(
+    """
+    `If-Match: "<version>"` makes the update conditional: 409 if the product
+    was changed since that version.
+    """
+    product = await update_entity_with_optional_image(
         entity_id=product_id,
         payload=payload,
         dao=ProductDAO,
@@ -203,14 +337,21 @@ async def patch_product(
         db_session=db_session,
         s3=s3,
         image_blob=image_blob,
+        expected_version=expected_version,
     )
+    response.headers.update(version_etag(product))
+    return product
 
 
 @router.delete(
     "/{product_id}",
     summary="Delete product by id",
     status_code=status.HTTP_204_NO_CONTENT,
-    dependencies=[Depends(require_role(Role.ADMIN))],
+    dependencies=[
+        Depends(require_role(Role.ADMIN)),
+        Depends(invalidate_facets),
+        Depends(invalidate_response_cache),
+    ],
 )
 async def delete_product(
     product_id: UUID,
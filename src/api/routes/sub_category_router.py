@@ -2,29 +2,32 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from fastapi_cache.decorator import cache
+from fastapi_pagination import paginate
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from src.api.auth.better_auth import require_role
 from src.api.core.create_entity import create_entity_with_image
+from src.api.core.invalidation import (
+    enqueue_image_uploads,
+    invalidate_catalogue_tree,
+    invalidate_facets,
+    invalidate_response_cache,
+)
 from src.api.core.update_entity import (
     update_entity_with_optional_image,
 )
-from src.api.dao.category_dao import CategoryDAO
-from src.api.dao.helper import OrderByOption
 from src.api.dao.sub_category_dao import SubCategoryDAO
 from src.api.di.db_helper import db_helper
+from src.api.services.catalogue_service import catalogue_service
 from src.common.deps.s3_service import get_s3_service
 from src.common.services.s3_service import S3Service
-from src.schemas.category_schema import CategorySchema
 from src.schemas.common.enums import Role
 from src.schemas.sub_category_schema import (
     SubCategoryPostSchema,
     SubCategoryPutSchema,
     SubCategorySchema,
 )
-from src.utils.cache_coder import ORJsonCoder
 from src.utils.pagination import Page
 
 router = APIRouter(tags=["Sub-Categories"], prefix="/sub-categories")
@@ -36,32 +39,25 @@ router = APIRouter(tags=["Sub-Categories"], prefix="/sub-categories")
     summary="Return all sub-categories with pagination or filter them",
     status_code=status.HTTP_200_OK,
 )
-@cache(expire=60 * 10, coder=ORJsonCoder)
 async def get_sub_categories(
     db_session: AsyncSession = Depends(db_helper.session_getter),
     category_id: UUID | None = None,
     category_slug: str | None = None,
 ):
-    order_by: OrderByOption = {"field": "name", "direction": "asc"}
+    tree = await catalogue_service.get_tree(db_session)
 
-    filters = {}
     if category_slug:
-        category: CategorySchema | None = await CategoryDAO.find_by_slug(
-            db_session, category_slug
-        )
-        if category:
-            filters["category_id"] = category.id
-        else:
+        category = tree.categories_by_slug.get(category_slug)
+        if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found",
             )
-    if category_id:
-        filters["category_id"] = category_id
+        category_id = category_id or category.id
 
-    return await SubCategoryDAO.find_all_paginate(
-        db_session, filter_by=filters, order_by=order_by
-    )
+    if category_id:
+        return paginate(tree.sub_categories_by_category.get(category_id, ()))
+    return paginate(tree.sub_categories)
 
 
 @router.get(
@@ -73,7 +69,8 @@ async def get_sub_category_by_id(
     sub_category_id: UUID,
     db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    res = await SubCategoryDAO.find_by_id(db_session, sub_category_id)
+    tree = await catalogue_service.get_tree(db_session)
+    res = tree.sub_categories_by_id.get(sub_category_id)
     if not res:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Sub Category not found"
@@ -90,7 +87,8 @@ async def get_sub_category_by_slug(
     slug: str,
     db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    res = await SubCategoryDAO.find_by_slug(db_session, slug)
+    tree = await catalogue_service.get_tree(db_session)
+    res = tree.sub_categories_by_slug.get(slug)
     if not res:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Sub Category not found"
@@ -102,7 +100,13 @@ async def get_sub_category_by_slug(
     "",
     response_model=SubCategorySchema,
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_catalogue_tree),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def post_sub_category(
     payload: Annotated[SubCategoryPostSchema, Depends(SubCategoryPostSchema.as_form)],
@@ -117,7 +121,6 @@ async def post_sub_category(
         db_session=db_session,
         s3=s3,
         dao=SubCategoryDAO,
-        refresh_fields=["category"],
     )
 
 
@@ -126,7 +129,13 @@ async def post_sub_category(
     response_model=SubCategorySchema,
     summary="Update a sub_category by id",
     status_code=status.HTTP_200_OK,
-    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+    dependencies=[
+        Depends(require_role(Role.EMPLOYEE)),
+        Depends(invalidate_facets),
+        Depends(invalidate_catalogue_tree),
+        Depends(invalidate_response_cache),
+        Depends(enqueue_image_uploads),
+    ],
 )
 async def patch_sub_category(
     sub_category_id: UUID,
@@ -150,7 +159,12 @@ async def patch_sub_category(
     "/{sub_category_id}",
     summary="Delete sub_category by id",
     status_code=status.HTTP_204_NO_CONTENT,
-    dependencies=[Depends(require_role(Role.ADMIN))],
+    dependencies=[
+        Depends(require_role(Role.ADMIN)),
+        Depends(invalidate_facets),
+        Depends(invalidate_catalogue_tree),
+        Depends(invalidate_response_cache),
+    ],
 )
 async def delete_sub_category(
     sub_category_id: UUID,
@@ -1,6 +1,7 @@
+from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from fastapi.params import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -9,8 +10,16 @@ from src.api.dao.helper import OrderByOption
 from src.api.dao.user_balance_history_dao import UserBalanceHistoryDAO
 from src.api.di.db_helper import db_helper
 from src.api.services.user_balance_service import UserBalanceService
-from src.schemas.common.enums import Currency, Role, UserBalanceChangeReason
-from src.schemas.user_balance_history import UserBalanceHistorySchema
+from src.schemas.common.enums import (
+    Currency,
+    Role,
+    StatementGranularity,
+    UserBalanceChangeReason,
+)
+from src.schemas.user_balance_history import (
+    UserBalanceHistorySchema,
+    UserBalanceStatementSchema,
+)
 from src.utils.pagination import Page
 
 router = APIRouter(
@@ -39,6 +48,37 @@ async def get_user_balance_history(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get(
+    "/statement/{user_id}",
+    response_model=UserBalanceStatementSchema,
+    summary="Return user balance statement for a period",
+    status_code=status.HTTP_200_OK,
+)
+async def get_user_balance_statement(
+    user_id: UUID,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    currency: Currency = Currency.RUB,
+    granularity: StatementGranularity = StatementGranularity.DAY,
+    db_session: AsyncSession = Depends(db_helper.session_getter),
+):
+    """
+    Opening balance, movements grouped by day/month and closing balance,
+    computed from the daily balance snapshots.
+    """
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be before or equal to 'to'",
+        )
+    try:
+        return await UserBalanceService.get_statement(
+            db_session, user_id, date_from, date_to, currency, granularity
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.post(
     "/adjust/{user_id}",
     response_model=UserBalanceHistorySchema,
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.api.auth import validate_api_key
+from src.common.deps.job_queue import get_job_queue
+from src.common.services.job_queue import JobQueue
+from src.schemas.common.enums import JobName
+from src.schemas.job_schema import JobEnqueueSchema, JobSchema
+
+router = APIRouter(
+    prefix="/jobs", tags=["Jobs"], dependencies=[Depends(validate_api_key)]
+)
+
+
+@router.post(
+    "/{name}",
+    summary="Queue a background job",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=JobSchema,
+)
+async def enqueue_job(
+    name: JobName,
+    payload: JobEnqueueSchema = JobEnqueueSchema(),
+    jobs: JobQueue = Depends(get_job_queue),
+):
+    """
+    Returns the queued job, or the one already queued/running with this key.
+    """
+    job_id, _ = await jobs.enqueue(
+        name, payload.kwargs, key=payload.key, defer_by=payload.defer_by
+    )
+    return await jobs.get_job(job_id)
+
+
+@router.get(
+    "/{job_id}",
+    summary="Get the status of a background job",
+    status_code=status.HTTP_200_OK,
+    response_model=JobSchema,
+)
+async def get_job(job_id: str, jobs: JobQueue = Depends(get_job_queue)):
+    job = await jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
@@ -1,9 +1,15 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.auth.better_auth import require_role
+from src.api.core.conditional_get import if_match_version, version_etag
+from src.api.core.invalidation import (
+    invalidate_facets,
+    invalidate_response_cache,
+    reconcile_stock,
+)
 from src.api.core.update_entity import update_entity
 from src.api.dao.offer_dao import OfferDAO
 from src.api.dao.waybill_dao import WaybillDAO
@@ -14,12 +20,13 @@ from src.schemas.common.enums import Role, WaybillType
 from src.schemas.offer_schema import OfferSchema
 from src.schemas.waybill_offer_schema import WaybillOfferPostSchema, WaybillOfferSchema
 from src.schemas.waybill_schema import (
+    WaybillDetailSchema,
     WaybillPatchSchema,
     WaybillSchema,
     WaybillWithOffersInternalPostSchema,
     WaybillWithOffersPostSchema,
 )
-from src.utils.pagination import Page
+from src.utils.pagination import Page, RowJSONResponse
 
 router = APIRouter(
     tags=["Waybills"],
@@ -72,6 +79,27 @@ async def get_waybill(
     return res
 
 
+@router.get(
+    "/{waybill_id}/full",
+    status_code=status.HTTP_200_OK,
+    response_model=WaybillDetailSchema,
+    dependencies=[Depends(require_role(Role.EMPLOYEE))],
+)
+async def get_waybill_detail(
+    waybill_id: UUID, db_session: AsyncSession = Depends(db_helper.session_getter)
+):
+    """
+    Waybill header, author, customer and all lines (with offers/products)
+    in one response, lines in document order
+    """
+    detail = await WaybillService.fetch_waybill_detail(db_session, waybill_id)
+    if not detail:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Waybill not found"
+        )
+    return RowJSONResponse(detail)
+
+
 @router.get(
     "/meta/count",
     response_model=dict[str, int],
@@ -106,13 +134,15 @@ async def get_waybill_offers(
     """
     Get all offers in waybill
     """
-    waybill: Waybill = await WaybillDAO.find_by_id(db_session, waybill_id)
+    waybill: Waybill = await WaybillDAO.find_by_id(db_session, waybill_id, options=())
     if not waybill:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Waybill not found"
         )
 
-    return await WaybillService.fetch_waybill_offers(waybill)
+    return RowJSONResponse(
+        await WaybillService.fetch_waybill_offers(db_session, waybill_id)
+    )
 
 
 @router.post(
@@ -145,21 +175,35 @@ async def create_waybill(
 )
 async def patch_waybill(
     waybill_id: UUID,
+    response: Response,
     payload: WaybillPatchSchema,
+    expected_version: int | None = Depends(if_match_version),
     db_session: AsyncSession = Depends(db_helper.session_getter),
 ):
-    return await update_entity(
+    """
+    `If-Match: "<version>"` makes the update conditional: 409 if the waybill
+    was changed since that version.
+    """
+    waybill = await update_entity(
         entity_id=waybill_id,
         payload=payload,
         dao=WaybillDAO,
         db_session=db_session,
+        expected_version=expected_version,
     )
+    response.headers.update(version_etag(waybill))
+    return waybill
 
 
 @router.post(
     "/{waybill_id}/commit",
     status_code=status.HTTP_201_CREATED,
     response_model=WaybillSchema,
+    dependencies=[
+        Depends(invalidate_facets),
+        Depends(invalidate_response_cache),
+        Depends(reconcile_stock),
+    ],
 )
 async def commit_waybill(
     waybill_id: UUID,
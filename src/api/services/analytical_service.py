@@ -1,79 +1,95 @@
-from sqlalchemy import func, select
+from datetime import date
+
+import polars as pl
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Category, Offer, Product, SubCategory, Waybill, WaybillOffer
-from src.schemas.analytical_schema import (
-    CategoryFacet,
-    ProductFacetsSchema,
-    SubCategoryFacet,
+from src.api.dao.product_sales_stat_dao import ProductSalesStatDAO
+from src.schemas.analytical_schema import SalesPointSchema, SalesReportSchema
+from src.schemas.common.enums import (
+    SalesGranularity,
+    SalesGroupBy,
+    SalesWindow,
 )
-from src.schemas.common.enums import WaybillType
+
+# polars `dt.truncate` intervals
+GRANULARITY_INTERVAL = {
+    SalesGranularity.DAY: "1d",
+    SalesGranularity.WEEK: "1w",
+    SalesGranularity.MONTH: "1mo",
+}
 
 
 class AnalyticalService:
     @staticmethod
-    async def get_sold_products(session: AsyncSession):
+    async def get_sold_products(
+        session: AsyncSession, window: SalesWindow = SalesWindow.ALL
+    ):
         """
-        SELECT
-           p.name,
-           p.image_url,
-           SUM(waybill_offers.quantity) AS sold,
-           SUM(waybill_offers.quantity * waybill_offers.price_rub) AS revenue
-        FROM waybills
-            JOIN waybill_offers ON waybills.id = waybill_offers.waybill_id
-            JOIN offers o ON waybill_offers.offer_id = o.id
-            JOIN products p ON o.product_id = p.id
-        WHERE waybills.is_pending = false and waybills.waybill_type = 'WAYBILL_OUT'
-        GROUP BY p.name
-        ORDER BY sold DESC;
+        Best-selling products for the given window, read from the daily
+        `product_sales_stats` buckets instead of scanning committed waybills.
         """
-        query = (
-            select(
-                Product.name,
-                Product.image_url,
-                func.sum(WaybillOffer.quantity).label("sold"),
-                func.sum(WaybillOffer.quantity * WaybillOffer.price_rub).label(
-                    "revenue"
-                ),
-            )
-            .join(Offer, Offer.id == WaybillOffer.offer_id)
-            .join(Product, Product.id == Offer.product_id)
-            .join(Waybill, Waybill.id == WaybillOffer.waybill_id)
-            .where(~Waybill.is_pending, Waybill.waybill_type == WaybillType.WAYBILL_OUT)
-            .group_by(Product.name, Product.image_url)
-            .order_by(func.sum(WaybillOffer.quantity).desc())
-        )
-
-        result = await session.execute(query)
-        rows = result.all()
-
-        return rows
+        return await ProductSalesStatDAO.get_best_selling(session, window)
 
     @staticmethod
-    async def calculate_product_facets(session: AsyncSession) -> ProductFacetsSchema:
-        # Category facets
-        q1 = (
-            select(Category.slug, func.count(Product.id).label("product_count"))
-            .join(SubCategory, SubCategory.category_id == Category.id)
-            .join(Product, Product.sub_category_id == SubCategory.id)
-            .group_by(Category.slug)
+    async def get_sales_report(
+        session: AsyncSession,
+        group_by: SalesGroupBy,
+        date_from: date,
+        date_to: date,
+        granularity: SalesGranularity = SalesGranularity.DAY,
+    ) -> SalesReportSchema:
+        """
+        Time series of sold quantity and revenue per dimension.
+        Daily buckets are fetched once and re-bucketed/aggregated in memory with polars,
+        raw `waybill_offers` are never scanned.
+        """
+        rows = await ProductSalesStatDAO.find_period(
+            session, group_by, date_from, date_to
         )
-        res1 = await session.execute(q1)
-        categories = [
-            CategoryFacet(category_slug=slug, product_count=cnt)
-            for slug, cnt in res1.all()
-        ]
 
-        # SubCategory facets
-        q2 = (
-            select(SubCategory.slug, func.count(Product.id).label("product_count"))
-            .join(Product, Product.sub_category_id == SubCategory.id)
-            .group_by(SubCategory.slug)
+        points: list[SalesPointSchema] = []
+        if rows:
+            df = pl.DataFrame(
+                {
+                    "day": [row.day for row in rows],
+                    "key": [str(row.key) for row in rows],
+                    "label": [str(row.label) for row in rows],
+                    "sold": [row.sold for row in rows],
+                    "revenue": [float(row.revenue) for row in rows],
+                }
+            )
+            report = (
+                df.with_columns(
+                    pl.col("day")
+                    .dt.truncate(GRANULARITY_INTERVAL[granularity])
+                    .alias("period")
+                )
+                .group_by("period", "key")
+                .agg(
+                    pl.col("label").first(),
+                    pl.col("sold").sum(),
+                    pl.col("revenue").sum(),
+                )
+                .sort(["period", "revenue"], descending=[False, True])
+            )
+            points = [
+                SalesPointSchema(**point) for point in report.iter_rows(named=True)
+            ]
+
+        return SalesReportSchema(
+            group_by=group_by,
+            granularity=granularity,
+            date_from=date_from,
+            date_to=date_to,
+            total_sold=sum(p.sold for p in points),
+            total_revenue=sum(p.revenue for p in points),
+            points=points,
         )
-        res2 = await session.execute(q2)
-        sub_categories = [
-            SubCategoryFacet(sub_category_slug=slug, product_count=cnt)
-            for slug, cnt in res2.all()
-        ]
 
-        return ProductFacetsSchema(categories=categories, sub_categories=sub_categories)
+    @staticmethod
+    async def rebuild_sales_stats(session: AsyncSession) -> int:
+        """
+        Backfill `product_sales_stats` from all committed WAYBILL_OUT waybills.
+        Returns the number of buckets written.
+        """
+        return await ProductSalesStatDAO.rebuild(session)
@@ -0,0 +1,140 @@
+import hashlib
+from uuid import UUID
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.core.pricing import price_for_customer
+from src.api.dao.offer_dao import OfferDAO
+from src.api.services.stock_service import StockReservationService
+from src.config import settings
+from src.schemas.cart_schema import (
+    CartItemSchema,
+    CartQuoteLineSchema,
+    CartQuoteSchema,
+)
+from src.schemas.common.enums import CustomerType
+from src.utils.logging import logger
+
+CART_QUOTE_CACHE_PREFIX = "be-tcf:cart:quote"
+
+
+class CartService:
+    """
+    Cart quote engine:
+    1. Cart lines are merged by offer, all offers are resolved with one query
+    2. Tier prices are applied to the whole batch, stock is checked per line
+       against the reservation counters (StockReservationService)
+    3. Priced offers are cached briefly per (customer_type, offer set):
+       cart refreshes only recompute the quantities
+    """
+
+    @staticmethod
+    def _cache_key(customer_type: CustomerType, offer_ids: list[UUID]) -> str:
+        digest = hashlib.sha1(
+            ",".join(sorted(str(_id) for _id in offer_ids)).encode()
+        ).hexdigest()
+        return f"{CART_QUOTE_CACHE_PREFIX}:{customer_type}:{digest}"
+
+    @staticmethod
+    async def get_priced_offers(
+        db_session: AsyncSession,
+        redis: Redis,
+        customer_type: CustomerType,
+        offer_ids: list[UUID],
+    ) -> dict[str, dict]:
+        """
+        offer id -> {name, brand, manufacturer_number, price_rub, quantity}
+        with `price_rub` already at the customer's tier.
+        """
+        key = CartService._cache_key(customer_type, offer_ids)
+        try:
+            cached = await redis.get(key)
+            if cached:
+                return orjson.loads(cached)
+        except RedisError as e:
+            logger.warning("[CartQuote] Redis read failed: %s", e)
+
+        rows = await OfferDAO.find_for_quote(db_session, offer_ids)
+        offers = {
+            str(row["id"]): {
+                "name": row["name"],
+                "brand": row["brand"],
+                "manufacturer_number": row["manufacturer_number"],
+                "price_rub": price_for_customer(
+                    row["price_rub"], row["super_wholesale_price_rub"], customer_type
+                ),
+                "quantity": row["quantity"],
+            }
+            for row in rows
+        }
+
+        try:
+            await redis.set(
+                key,
+                orjson.dumps(offers),
+                ex=settings.REDIS.CART_QUOTE_CACHE_TIMEOUT,
+            )
+        except RedisError as e:
+            logger.warning("[CartQuote] Redis write failed: %s", e)
+
+        return offers
+
+    @staticmethod
+    async def quote(
+        db_session: AsyncSession,
+        redis: Redis,
+        customer_type: CustomerType | None,
+        items: list[CartItemSchema],
+    ) -> CartQuoteSchema:
+        customer_type = customer_type or CustomerType.USER_RETAIL
+
+        # the same offer added twice is one line
+        quantities: dict[UUID, int] = {}
+        for item in items:
+            quantities[item.offer_id] = quantities.get(item.offer_id, 0) + item.qty
+
+        offers = await CartService.get_priced_offers(
+            db_session, redis, customer_type, list(quantities)
+        )
+        # live available-to-promise where counters exist, cached stock otherwise
+        try:
+            available = await StockReservationService.get_available(
+                redis, list(quantities)
+            )
+        except RedisError as e:
+            logger.warning("[CartQuote] Stock counters read failed: %s", e)
+            available = {}
+
+        lines: list[CartQuoteLineSchema] = []
+        missing: list[UUID] = []
+        for offer_id, qty in quantities.items():
+            offer = offers.get(str(offer_id))
+            if offer is None:
+                missing.append(offer_id)
+                continue
+
+            in_hand = available.get(offer_id, offer["quantity"])
+            lines.append(
+                CartQuoteLineSchema(
+                    offer_id=offer_id,
+                    name=offer["name"],
+                    brand=offer["brand"],
+                    manufacturer_number=offer["manufacturer_number"],
+                    price_rub=offer["price_rub"],
+                    qty=qty,
+                    available=in_hand,
+                    in_stock=in_hand >= qty,
+                    line_total_rub=offer["price_rub"] * qty,
+                )
+            )
+
+        return CartQuoteSchema(
+            customer_type=customer_type,
+            lines=lines,
+            missing=missing,
+            total_rub=sum(line.line_total_rub for line in lines),
+            is_available=not missing and all(line.in_stock for line in lines),
+        )
@@ -0,0 +1,131 @@
+import asyncio
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.category_dao import CategoryDAO
+from src.api.dao.sub_category_dao import SubCategoryDAO
+from src.models import Category, SubCategory
+from src.schemas.category_schema import CategorySchema
+from src.schemas.sub_category_schema import SubCategorySchema
+from src.utils.logging import logger
+
+CATALOGUE_CHANNEL = "be-tcf:catalogue:invalidate"
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogueTree:
+    """
+    Immutable snapshot of categories -> sub-categories with id/slug indexes.
+    A new snapshot is built on every reload, readers never see a partial tree.
+    """
+
+    categories: tuple[CategorySchema, ...]
+    sub_categories: tuple[SubCategorySchema, ...]
+    categories_by_id: Mapping[UUID, CategorySchema]
+    categories_by_slug: Mapping[str, CategorySchema]
+    sub_categories_by_id: Mapping[UUID, SubCategorySchema]
+    sub_categories_by_slug: Mapping[str, SubCategorySchema]
+    sub_categories_by_category: Mapping[UUID, tuple[SubCategorySchema, ...]]
+
+    @classmethod
+    def build(
+        cls,
+        categories: Sequence[CategorySchema],
+        sub_categories: Sequence[SubCategorySchema],
+    ) -> "CatalogueTree":
+        by_category: dict[UUID, list[SubCategorySchema]] = {}
+        for sub in sub_categories:
+            by_category.setdefault(sub.category_id, []).append(sub)
+
+        return cls(
+            categories=tuple(categories),
+            sub_categories=tuple(sub_categories),
+            categories_by_id=MappingProxyType({c.id: c for c in categories}),
+            categories_by_slug=MappingProxyType({c.slug: c for c in categories}),
+            sub_categories_by_id=MappingProxyType({s.id: s for s in sub_categories}),
+            sub_categories_by_slug=MappingProxyType(
+                {s.slug: s for s in sub_categories}
+            ),
+            sub_categories_by_category=MappingProxyType(
+                {k: tuple(v) for k, v in by_category.items()}
+            ),
+        )
+
+
+class CatalogueService:
+    """
+    In-process cache of the category tree:
+    1. Loaded at startup (or lazily on the first request) with two queries
+    2. Category/sub-category writes publish to CATALOGUE_CHANNEL
+    3. Every worker listens to the channel and drops its snapshot,
+       the next request rebuilds it from the database
+    """
+
+    def __init__(self):
+        self._tree: CatalogueTree | None = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    async def load(self, session: AsyncSession) -> CatalogueTree:
+        version = self._version
+        categories = await CategoryDAO.find_all(session, {}, order_by=Category.name)
+        sub_categories = await SubCategoryDAO.find_all(
+            session, {}, order_by=SubCategory.name
+        )
+        tree = CatalogueTree.build(
+            [CategorySchema.model_validate(c) for c in categories],
+            [SubCategorySchema.model_validate(s) for s in sub_categories],
+        )
+        # an invalidation arrived while loading: serve this snapshot once, don't keep it
+        if version == self._version:
+            self._tree = tree
+        return tree
+
+    async def get_tree(self, session: AsyncSession) -> CatalogueTree:
+        if (tree := self._tree) is not None:
+            return tree
+
+        async with self._lock:
+            if (tree := self._tree) is not None:
+                return tree
+            logger.info("[Catalogue] Loading category tree")
+            return await self.load(session)
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._tree = None
+
+    async def publish_invalidation(self, redis: Redis) -> None:
+        # drop the local snapshot right away, other workers are notified via pub/sub
+        self.invalidate()
+        try:
+            await redis.publish(CATALOGUE_CHANNEL, "invalidate")
+        except RedisError as e:
+            logger.warning("[Catalogue] Redis publish failed: %s", e)
+
+    async def listen(self, redis: Redis) -> None:
+        """
+        Background task: drop the snapshot on every message from CATALOGUE_CHANNEL.
+        Reconnects on Redis errors; the snapshot is dropped as well,
+        since messages could have been missed while disconnected.
+        """
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CATALOGUE_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.invalidate()
+            except RedisError as e:
+                logger.warning("[Catalogue] Pub/sub connection lost: %s", e)
+                self.invalidate()
+                await asyncio.sleep(1)
+
+
+catalogue_service = CatalogueService()
@@ -0,0 +1,166 @@
+import asyncio
+from datetime import date, datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.email_campaign_dao import EmailCampaignDAO
+from src.api.di.db_helper import db_helper
+from src.api.services.price_list_service import PriceListService
+from src.common.services.job_queue import JobQueue
+from src.common.services.s3_service import S3Service
+from src.config import settings
+from src.models import EmailCampaign
+from src.schemas.common.enums import (
+    CampaignStatus,
+    DeliveryStatus,
+    JobName,
+    PriceListExt,
+    PriceListType,
+)
+from src.tasks.mailing.send_email import build_message
+from src.tasks.mailing.send_pricing_email import (
+    PRICING_EMAIL_BODY,
+    PRICING_EMAIL_SUBJECT,
+    PRICING_EMAIL_TEMPLATE,
+)
+from src.tasks.mailing.smtp_pool import SMTPPool
+from src.tasks.mailing.templates import mail_templates
+from src.utils.logging import logger
+
+
+class EmailCampaignService:
+    """
+    Bulk mailing to every user with `mailing` on, run by the `email_campaign` job:
+    1. Recipients are read in keyset batches (EMAIL_CAMPAIGN_BATCH_SIZE) by users.id
+    2. The template is rendered once per batch from the cached environment
+    3. The batch is sent over a pool of persistent, throttled SMTP sessions
+    4. Each recipient's outcome is committed with the batch
+
+    Running a campaign again resumes it: recipients already SENT are skipped,
+    FAILED ones are tried again.
+    """
+
+    @staticmethod
+    async def create(
+        db_session: AsyncSession,
+        subject: str,
+        template: str,
+        context: dict[str, Any],
+        body: str | None = None,
+    ) -> EmailCampaign:
+        # fail at once on a missing template, not in the worker
+        mail_templates.get_template(template)
+        return await EmailCampaignDAO.add(
+            db_session,
+            subject=subject,
+            template=template,
+            context=context,
+            body=body,
+        )
+
+    @staticmethod
+    async def create_pricing(
+        db_session: AsyncSession, s3: S3Service
+    ) -> tuple[EmailCampaign, str]:
+        """
+        Campaign with today's retail price list, its job is queued
+        after the commit (`enqueue_jobs`). Returns (campaign, job id).
+        """
+        key = PriceListService.get_key(
+            PriceListExt.EXCEL, PriceListType.RETIAL, date.today()
+        )
+        campaign = await EmailCampaignService.create(
+            db_session,
+            subject=PRICING_EMAIL_SUBJECT,
+            template=PRICING_EMAIL_TEMPLATE,
+            context={"pricelist_url": s3.get_file_url(key)},
+            body=PRICING_EMAIL_BODY,
+        )
+        job_id = JobQueue.stage(
+            db_session,
+            JobName.EMAIL_CAMPAIGN,
+            {"campaign_id": str(campaign.id)},
+            key=str(campaign.id),
+        )
+        return campaign, job_id
+
+    @staticmethod
+    async def _send(
+        pool: SMTPPool, campaign: EmailCampaign, html: str, recipient: Row
+    ) -> dict[str, Any]:
+        outcome = {
+            "campaign_id": campaign.id,
+            "user_id": recipient.id,
+            "email": recipient.email,
+            "status": DeliveryStatus.SENT,
+            "error": None,
+        }
+        message = build_message(
+            recipient.email, campaign.subject, campaign.body or "", html
+        )
+        try:
+            await pool.send(message)
+        except Exception as e:
+            logger.warning(
+                "[Campaign] %s to %s failed: %s", campaign.id, recipient.email, e
+            )
+            outcome.update(status=DeliveryStatus.FAILED, error=str(e)[:500])
+        return outcome
+
+    @staticmethod
+    async def _set_status(campaign_id: UUID, status: CampaignStatus) -> EmailCampaign:
+        values: dict[str, Any] = {"status": status}
+        if status == CampaignStatus.DONE:
+            values["finished_at"] = datetime.now(timezone.utc)
+        async with db_helper.AsyncSessionFactory() as session, session.begin():
+            return await EmailCampaignDAO.update(
+                session, filter_by={"id": campaign_id}, **values
+            )
+
+    @staticmethod
+    async def run(campaign_id: UUID, pool: SMTPPool) -> dict[DeliveryStatus, int]:
+        """
+        Send the campaign to the recipients it hasn't reached yet.
+        Returns the outcome counts of this run.
+        """
+        campaign = await EmailCampaignService._set_status(
+            campaign_id, CampaignStatus.SENDING
+        )
+        if campaign is None:
+            raise ValueError(f"Campaign {campaign_id} not found")
+        template = mail_templates.get_template(campaign.template)
+
+        counts = dict.fromkeys(DeliveryStatus, 0)
+        after_id: UUID | None = None
+        while True:
+            async with db_helper.AsyncSessionFactory() as session:
+                recipients = await EmailCampaignDAO.get_recipients_batch(
+                    session,
+                    campaign.id,
+                    after_id,
+                    settings.SMTP.EMAIL_CAMPAIGN_BATCH_SIZE,
+                )
+            if not recipients:
+                break
+
+            html = template.render(**campaign.context)
+            # bounded by the pool: one message per session at a time
+            outcomes = await asyncio.gather(
+                *(
+                    EmailCampaignService._send(pool, campaign, html, recipient)
+                    for recipient in recipients
+                )
+            )
+            async with db_helper.AsyncSessionFactory() as session, session.begin():
+                await EmailCampaignDAO.record_outcomes(session, outcomes)
+
+            for outcome in outcomes:
+                counts[outcome["status"]] += 1
+            after_id = recipients[-1].id
+            logger.info("[Campaign] %s: %s", campaign.id, counts)
+
+        await EmailCampaignService._set_status(campaign.id, CampaignStatus.DONE)
+        return counts
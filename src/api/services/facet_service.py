@@ -0,0 +1,98 @@
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.product_dao import ProductDAO
+from src.config import settings
+from src.schemas.analytical_schema import (
+    CategoryFacet,
+    ProductFacetsSchema,
+    SubCategoryFacet,
+)
+from src.utils.logging import logger
+
+FACETS_CACHE_KEY = "be-tcf:facets:catalogue"
+
+
+class FacetService:
+    """
+    Catalogue facet engine:
+    1. All facet levels are computed with one GROUPING SETS query (ProductDAO.get_facet_counts)
+    2. The result is stored in Redis until a product/offer/category write invalidates it
+    3. On a warm cache the catalogue sidebar never touches Postgres
+    """
+
+    @staticmethod
+    async def get_facets(session: AsyncSession, redis: Redis) -> ProductFacetsSchema:
+        try:
+            cached = await redis.get(FACETS_CACHE_KEY)
+            if cached:
+                return ProductFacetsSchema.model_validate_json(cached)
+        except RedisError as e:
+            logger.warning("[Facets] Redis read failed: %s", e)
+
+        facets = await FacetService.calculate_facets(session)
+
+        try:
+            await redis.set(
+                FACETS_CACHE_KEY,
+                facets.model_dump_json(),
+                ex=settings.REDIS.INVALIDATE_CACHES_TIMEOUT,
+            )
+        except RedisError as e:
+            logger.warning("[Facets] Redis write failed: %s", e)
+
+        return facets
+
+    @staticmethod
+    async def calculate_facets(session: AsyncSession) -> ProductFacetsSchema:
+        rows = await ProductDAO.get_facet_counts(session)
+
+        facets = ProductFacetsSchema(categories=[], sub_categories=[])
+        for row in rows:
+            if not row.g_sub_category:
+                facets.sub_categories.append(
+                    SubCategoryFacet(
+                        sub_category_id=row.sub_category_id,
+                        sub_category_name=row.sub_category_name,
+                        sub_category_slug=row.sub_category_slug,
+                        category_id=row.category_id,
+                        product_count=row.product_count,
+                        offer_count=row.offer_count,
+                    )
+                )
+            elif not row.g_category:
+                facets.categories.append(
+                    CategoryFacet(
+                        category_id=row.category_id,
+                        category_name=row.category_name,
+                        category_slug=row.category_slug,
+                        product_count=row.product_count,
+                        offer_count=row.offer_count,
+                    )
+                )
+            elif not row.g_in_stock:
+                # products without offers fall into the NULL -> false group
+                if row.in_stock:
+                    facets.stock.in_stock = row.offer_count
+                else:
+                    facets.stock.out_of_stock = row.offer_count
+            elif not row.g_has_image:
+                if row.has_image:
+                    facets.image.with_image = row.offer_count
+                else:
+                    facets.image.without_image = row.offer_count
+            else:
+                facets.total_products = row.product_count
+                facets.total_offers = row.offer_count
+
+        facets.categories.sort(key=lambda f: f.category_name)
+        facets.sub_categories.sort(key=lambda f: f.sub_category_name)
+        return facets
+
+    @staticmethod
+    async def invalidate(redis: Redis) -> None:
+        try:
+            await redis.delete(FACETS_CACHE_KEY)
+        except RedisError as e:
+            logger.warning("[Facets] Redis invalidation failed: %s", e)
@@ -0,0 +1,155 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.category_dao import CategoryDAO
+from src.api.dao.offer_dao import OfferDAO
+from src.api.dao.product_dao import ProductDAO
+from src.api.dao.sub_category_dao import SubCategoryDAO
+from src.api.services.image_upload_service import (
+    IMAGE_GC_KEY,
+    IMAGE_GC_TOMBSTONE_TTL,
+    IMAGE_INDEX_KEY,
+)
+from src.common.services.s3_service import DELETE_BATCH_SIZE, S3Service
+from src.schemas.common.enums import ImageVariant
+from src.utils.image_variants import variant_key
+from src.utils.logging import logger
+
+IMAGE_DAOS = (CategoryDAO, SubCategoryDAO, ProductDAO, OfferDAO)
+
+
+@dataclass
+class ImageGCReport:
+    listed: int = 0
+    referenced: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    deleted: int = 0
+    failed: int = 0
+
+
+class ImageGCService:
+    """
+    Removes objects under a bucket prefix that no row points at
+    (replaced images, images of deleted products/offers):
+    1. The prefix is listed one level down, then its sub-prefixes are paged
+       through in parallel
+    2. Keys are diffed against image_url of categories, sub-categories,
+       products and offers, and the variants of those images
+    3. Objects younger than `min_age` are kept: their rows may not be committed yet
+    4. Orphans are tombstoned (IMAGE_GC_KEY) and dropped from the dedup index:
+       new rows no longer reuse them, their uploads wait until the GC is done
+    5. After `fence` - time for a request that read the index just before
+       to commit its row - they are re-checked against the DB, then removed
+       with DeleteObjects, 1000 keys per request, at most `rate_limit` requests/s
+    """
+
+    @staticmethod
+    async def list_objects(
+        s3: S3Service, prefix: str, concurrency: int
+    ) -> list[dict[str, Any]]:
+        prefixes, objects = await s3.list_prefixes(prefix)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def _list(sub_prefix: str) -> list[dict[str, Any]]:
+            async with slots:
+                return await s3.list_objects(sub_prefix)
+
+        for page in await asyncio.gather(*(_list(p) for p in prefixes)):
+            objects.extend(page)
+        return objects
+
+    @staticmethod
+    async def referenced_keys(db_session: AsyncSession, s3: S3Service) -> set[str]:
+        keys: set[str] = set()
+        for dao in IMAGE_DAOS:
+            for url in await dao.get_image_urls(db_session):
+                if (key := s3.get_key_from_url(url)) is None:
+                    # placeholder or an external image
+                    continue
+                keys.add(key)
+                keys.update(variant_key(key, variant) for variant in ImageVariant)
+        return keys
+
+    @staticmethod
+    async def _lift_tombstones(redis: Redis, keys: list[str]) -> None:
+        try:
+            for start in range(0, len(keys), DELETE_BATCH_SIZE):
+                await redis.srem(IMAGE_GC_KEY, *keys[start : start + DELETE_BATCH_SIZE])
+        except RedisError as e:
+            # they expire after IMAGE_GC_TOMBSTONE_TTL
+            logger.warning("[ImageGC] Tombstone cleanup failed: %s", e)
+
+    @staticmethod
+    async def run(
+        db_session: AsyncSession,
+        s3: S3Service,
+        redis: Redis,
+        prefix: str = "images/",
+        dry_run: bool = True,
+        min_age: timedelta = timedelta(days=1),
+        rate_limit: float | None = None,
+        concurrency: int = 8,
+        fence: timedelta = timedelta(seconds=30),
+    ) -> ImageGCReport:
+        report = ImageGCReport()
+        objects = await ImageGCService.list_objects(s3, prefix, concurrency)
+        referenced = await ImageGCService.referenced_keys(db_session, s3)
+
+        cutoff = datetime.now(UTC) - min_age
+        orphans = {
+            obj["Key"]: obj["Size"]
+            for obj in objects
+            if obj["Key"] not in referenced and obj["LastModified"] < cutoff
+        }
+        report.listed = len(objects)
+        report.referenced = sum(1 for obj in objects if obj["Key"] in referenced)
+        report.orphans = len(orphans)
+        report.orphan_bytes = sum(orphans.values())
+        logger.info("[ImageGC] %s: %s", prefix, report)
+
+        if dry_run or not orphans:
+            return report
+
+        keys = list(orphans)
+        try:
+            for start in range(0, len(keys), DELETE_BATCH_SIZE):
+                batch = keys[start : start + DELETE_BATCH_SIZE]
+                async with redis.pipeline(transaction=False) as pipe:
+                    # tombstone first: a lookup between the two sees one of them
+                    pipe.sadd(IMAGE_GC_KEY, *batch)
+                    pipe.expire(IMAGE_GC_KEY, IMAGE_GC_TOMBSTONE_TTL)
+                    pipe.hdel(IMAGE_INDEX_KEY, *batch)
+                    await pipe.execute()
+        except RedisError as e:
+            # an indexed orphan could be picked up by a new row after the re-check
+            logger.error("[ImageGC] Index cleanup failed, nothing deleted: %s", e)
+            await ImageGCService._lift_tombstones(redis, keys)
+            return report
+
+        try:
+            await asyncio.sleep(fence.total_seconds())
+            referenced = await ImageGCService.referenced_keys(db_session, s3)
+            keys = sorted(key for key in keys if key not in referenced)
+
+            for start in range(0, len(keys), DELETE_BATCH_SIZE):
+                batch = keys[start : start + DELETE_BATCH_SIZE]
+                failed = await s3.remove_files(batch)
+                report.deleted += len(batch) - len(failed)
+                report.failed += len(failed)
+                # the waiting uploads of these keys may go on
+                await ImageGCService._lift_tombstones(redis, batch)
+                if rate_limit:
+                    await asyncio.sleep(1 / rate_limit)
+        finally:
+            # picked up by a row meanwhile, or left over by an error
+            await ImageGCService._lift_tombstones(redis, list(orphans))
+
+        logger.info("[ImageGC] Deleted %s, failed %s", report.deleted, report.failed)
+        return report
@@ -0,0 +1,377 @@
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+from uuid import UUID
+
+from fastapi import UploadFile
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.di.db_helper import db_helper
+from src.api.services.catalogue_service import catalogue_service
+from src.common.functions.check_file_mime_type import is_file_mime_type_correct
+from src.common.services.response_cache import (
+    CACHE_TAGS_KEY,
+    ResponseCache,
+    mark_entity_stale,
+)
+from src.common.services.s3_service import S3Service
+from src.config import settings
+from src.models import Category, SubCategory
+from src.schemas.common.enums import ImageStatus, ImageVariant
+from src.utils.image_variants import render_variants, variant_key
+from src.utils.logging import logger
+
+# AsyncSession.info key, collects the images to upload once the rows are committed
+IMAGE_UPLOADS_KEY = "image_uploads"
+# object key -> "1"/"0" (variants rendered) of every uploaded content-addressed image
+IMAGE_INDEX_KEY = "be-tcf:images:index"
+# object keys the image GC is deleting (tombstones): not reused from the index,
+# not uploaded again until the GC is done with them (see ImageGCService)
+IMAGE_GC_KEY = "be-tcf:images:gc"
+# tombstones outlive a crashed GC run by this much, uploads wait at most as long
+IMAGE_GC_TOMBSTONE_TTL = 10 * 60
+IMAGE_GC_POLL_INTERVAL = 0.5
+# spooled files older than this belong to uploads lost by a previous process
+SPOOL_MAX_AGE = 24 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class ImageUpload:
+    model: Any
+    entity_id: UUID
+    key: str
+    url: str
+    path: Path
+    content_type: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class ReceivedImage:
+    """
+    A validated upload: its content-addressed key, the image columns of the row,
+    and the spooled copy to upload (None if the image is stored already).
+    """
+
+    key: str
+    url: str
+    state: dict[str, Any]
+    path: Path | None
+    content_type: str | None
+
+    def discard(self) -> None:
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class ImageUploadQueue:
+    """
+    Entity images are uploaded to S3 after the DB transaction, not inside it:
+    1. The upload is validated, hashed and spooled to IMAGE_SPOOL_DIR in one pass
+       (`receive`); the request writes the row with its final image_url and
+       image_status=PENDING and stages the spooled file (`stage`)
+    2. Once committed, the `enqueue_image_uploads` route dependency queues the uploads
+       (a row not found when marked is retried, see `_mark`)
+    3. Workers upload them with retries and mark the row READY (FAILED when out
+       of retries), unless its image_url has been replaced meanwhile
+    4. Resized WebP variants are rendered in a process pool while the original
+       is uploaded, and stored next to it (`variant_key`)
+
+    Keys are content-addressed (sha256 of the file): an image already in
+    IMAGE_INDEX_KEY is not uploaded again, the row points at it READY at once.
+
+    A pooled DB connection is no longer held for the S3 round trip.
+    Uploads still queued when the process stops leave their rows PENDING.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[ImageUpload] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._s3: S3Service | None = None
+        self._redis: Redis | None = None
+        self._pool: ProcessPoolExecutor | None = None
+
+    @staticmethod
+    def _open_spool() -> BinaryIO:
+        spool_dir = Path(settings.IMAGE_SPOOL_DIR)
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        # closed by `receive`: the file itself outlives the request
+        return tempfile.NamedTemporaryFile(dir=spool_dir, delete=False)  # noqa: SIM115
+
+    async def receive(
+        self, image_blob: UploadFile, s3: S3Service, upload_path: str
+    ) -> ReceivedImage:
+        """
+        Validate the upload and copy it to IMAGE_SPOOL_DIR while hashing it:
+        the request's own temp file is closed together with the request.
+        Raises ValueError (wrong type) or FileTooLargeError.
+        """
+        digest = hashlib.sha256()
+        spooled = await asyncio.to_thread(self._open_spool)
+        path = Path(spooled.name)
+        try:
+            with spooled:
+                await is_file_mime_type_correct(image_blob, digest, copy_to=spooled)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+        key = s3.generate_key(
+            image_blob.filename, upload_path, content_hash=digest.hexdigest()
+        )
+        state = await self.image_state(key)
+        if state["image_status"] != ImageStatus.PENDING:
+            # stored already, nothing to upload
+            path.unlink(missing_ok=True)
+            path = None
+        return ReceivedImage(
+            key=key,
+            url=s3.get_file_url(key=key),
+            state=state,
+            path=path,
+            content_type=image_blob.content_type,
+        )
+
+    async def image_state(self, key: str) -> dict[str, Any]:
+        """
+        Image columns for a row pointing at `key`:
+        READY if the object has already been uploaded, PENDING otherwise
+        (or if the GC is deleting it: it is uploaded again).
+        """
+        uploaded = None
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.hget(IMAGE_INDEX_KEY, key)
+                    pipe.sismember(IMAGE_GC_KEY, key)
+                    uploaded, collecting = await pipe.execute()
+                if collecting:
+                    uploaded = None
+            except RedisError as e:
+                logger.warning("[ImageUpload] Index lookup failed: %s", e)
+
+        if uploaded is None:
+            return {"image_status": ImageStatus.PENDING, "has_image_variants": False}
+        return {
+            "image_status": ImageStatus.READY,
+            "has_image_variants": uploaded == "1",
+        }
+
+    @staticmethod
+    def stage(db_session: AsyncSession, instance: Any, image: ReceivedImage) -> None:
+        """
+        Stage the spooled image of a row written with image_status=PENDING;
+        it is queued for upload by `enqueue_image_uploads` after the commit.
+        Rows pointing at an already uploaded image are left as they are.
+        """
+        if image.path is None or instance.image_status != ImageStatus.PENDING:
+            image.discard()
+            return
+        db_session.info.setdefault(IMAGE_UPLOADS_KEY, []).append(
+            ImageUpload(
+                model=type(instance),
+                entity_id=instance.id,
+                key=image.key,
+                url=instance.image_url,
+                path=image.path,
+                content_type=image.content_type,
+            )
+        )
+
+    async def put(self, uploads: list[ImageUpload]) -> None:
+        for upload in uploads:
+            self._queue.put_nowait(upload)
+
+    def start(self, s3: S3Service, redis: Redis) -> None:
+        self._s3 = s3
+        self._redis = redis
+        self._purge_spool()
+        # spawned: forking a process with a running event loop is unsafe
+        self._pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._workers = [
+            asyncio.create_task(self._work())
+            for _ in range(settings.IMAGE_UPLOAD_WORKERS)
+        ]
+
+    async def close(self) -> None:
+        """
+        Give the queued uploads IMAGE_UPLOAD_DRAIN_TIMEOUT to finish, then stop.
+        """
+        try:
+            await asyncio.wait_for(
+                self._queue.join(), settings.IMAGE_UPLOAD_DRAIN_TIMEOUT
+            )
+        except TimeoutError:
+            logger.warning("[ImageUpload] %s uploads left pending", self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    @staticmethod
+    def _purge_spool() -> None:
+        spool_dir = Path(settings.IMAGE_SPOOL_DIR)
+        if not spool_dir.is_dir():
+            return
+        expired = time.time() - SPOOL_MAX_AGE
+        for path in spool_dir.iterdir():
+            if path.is_file() and path.stat().st_mtime < expired:
+                path.unlink(missing_ok=True)
+
+    async def _work(self) -> None:
+        while True:
+            upload = await self._queue.get()
+            try:
+                await self._process(upload)
+            except Exception as e:
+                logger.exception("[ImageUpload] %s failed: %s", upload.key, e)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, upload: ImageUpload) -> None:
+        rendering = asyncio.ensure_future(self._render(upload))
+        uploaded = await self._upload(
+            upload.key, lambda: upload.path.open("rb"), upload.content_type
+        )
+        variants = await rendering
+
+        has_variants = uploaded and bool(variants)
+        if has_variants:
+            for variant, data in variants.items():
+                key = variant_key(upload.key, variant)
+                if not await self._upload(
+                    key, lambda data=data: io.BytesIO(data), "image/webp"
+                ):
+                    has_variants = False
+                    break
+
+        if uploaded:
+            await self._remember(upload.key, has_variants)
+
+        try:
+            status = ImageStatus.READY if uploaded else ImageStatus.FAILED
+            await self._mark(upload, status, has_variants)
+        finally:
+            upload.path.unlink(missing_ok=True)
+
+    async def _render(self, upload: ImageUpload) -> dict[ImageVariant, bytes]:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, render_variants, str(upload.path)
+            )
+        except Exception as e:
+            # the original is still served
+            logger.warning("[ImageUpload] No variants of %s: %s", upload.key, e)
+            return {}
+
+    async def _wait_collected(self, key: str) -> None:
+        """
+        An object the GC is deleting is uploaded once it is gone, not before:
+        the GC's DeleteObjects would otherwise remove the new upload.
+        """
+        deadline = time.monotonic() + IMAGE_GC_TOMBSTONE_TTL
+        while time.monotonic() < deadline:
+            try:
+                if not await self._redis.sismember(IMAGE_GC_KEY, key):
+                    return
+            except RedisError as e:
+                logger.warning("[ImageUpload] GC tombstone lookup failed: %s", e)
+                return
+            await asyncio.sleep(IMAGE_GC_POLL_INTERVAL)
+
+    async def _upload(
+        self, key: str, open_file: Callable[[], BinaryIO], content_type: str | None
+    ) -> bool:
+        await self._wait_collected(key)
+        for attempt in range(1, settings.IMAGE_UPLOAD_RETRIES + 1):
+            try:
+                with open_file() as file:
+                    await self._s3.upload_file(
+                        file=file,
+                        key=key,
+                        extra_args={"ACL": "public-read", "ContentType": content_type},
+                    )
+                return True
+            except FileNotFoundError:
+                return False
+            except Exception as e:
+                logger.warning("[ImageUpload] %s, attempt %s: %s", key, attempt, e)
+                if attempt < settings.IMAGE_UPLOAD_RETRIES:
+                    await asyncio.sleep(min(2**attempt, 60))
+        return False
+
+    async def _remember(self, key: str, has_variants: bool) -> None:
+        try:
+            await self._redis.hset(IMAGE_INDEX_KEY, key, int(has_variants))
+        except RedisError as e:
+            # the next upload of this image is just not deduplicated
+            logger.warning("[ImageUpload] Index update failed: %s", e)
+
+    async def _mark(
+        self, upload: ImageUpload, status: ImageStatus, has_variants: bool
+    ) -> None:
+        """
+        Set the image status of the row, unless its image has been replaced.
+        A row not found at all is retried: it may not have been committed yet.
+        """
+        model = upload.model
+        values = {"image_status": status, "has_image_variants": has_variants}
+        if "version" in model.__table__.c:
+            # the status is served with the row: an If-Match taken before is stale
+            values["version"] = model.version + 1
+        for attempt in range(1, settings.IMAGE_UPLOAD_RETRIES + 1):
+            try:
+                async with db_helper.AsyncSessionFactory() as session, session.begin():
+                    instance = await session.scalar(
+                        update(model)
+                        .where(
+                            model.id == upload.entity_id, model.image_url == upload.url
+                        )
+                        .values(**values)
+                        .returning(model)
+                    )
+                    if instance is not None:
+                        mark_entity_stale(session, instance)
+                        break
+                    if await session.scalar(
+                        select(exists().where(model.id == upload.entity_id))
+                    ):
+                        # another image was uploaded meanwhile
+                        return
+            except SQLAlchemyError as e:
+                logger.error(
+                    "[ImageUpload] %s not marked %s: %s", upload.key, status, e
+                )
+                return
+            if attempt < settings.IMAGE_UPLOAD_RETRIES:
+                await asyncio.sleep(min(2**attempt, 60))
+        else:
+            logger.warning(
+                "[ImageUpload] %s not marked %s: row %s not found",
+                upload.key,
+                status,
+                upload.entity_id,
+            )
+            return
+
+        await ResponseCache.invalidate(self._redis, session.info[CACHE_TAGS_KEY])
+        if model in (Category, SubCategory):
+            await catalogue_service.publish_invalidation(self._redis)
+
+
+image_upload_queue = ImageUploadQueue()
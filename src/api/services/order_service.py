@@ -1,18 +1,24 @@
 from uuid import UUID
 
+from redis.asyncio import Redis
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from schemas.order_schema import OrderWithOffersInternalPostSchema
+from src.api.core.pricing import price_for_customer
 from src.api.dao.offer_dao import OfferDAO
 from src.api.dao.order_dao import OrderDAO
 from src.api.dao.order_offer_dao import OrderOfferDAO
-from src.api.dao.user_dao import UserDAO
 from src.api.dao.waybill_dao import WaybillDAO
-from src.models import Offer, Order, OrderOffer, Waybill, WaybillOffer
+from src.api.dao.waybill_offer_dao import WaybillOfferDAO
+from src.api.services.outbox_service import OutboxService
+from src.api.services.stock_service import StockReservationService
+from src.models import Offer, Order, OrderOffer, Waybill
 from src.schemas.common.enums import CustomerType, WaybillType
-from src.schemas.offer_schema import OfferSchema
 from src.schemas.order_offer_schema import OrderOfferPostSchema, OrderOfferSchema
 from src.schemas.waybill_schema import WaybillPostSchema
+from src.utils.serializer import compile_serializer
 
 
 class OrderService:
@@ -37,69 +43,89 @@ class OrderService:
         order_id: UUID,
         order_offer: OrderOfferPostSchema,
     ) -> OrderOffer:
-        offer: Offer = await OfferDAO.find_by_id(db_session, order_offer.offer_id)
-        order: Order = await OrderDAO.find_by_id(db_session, order_id)
+        offer: Offer = await OfferDAO.find_by_id(
+            db_session, order_offer.offer_id, options=()
+        )
+        order: Order = await OrderDAO.find_by_id(
+            db_session, order_id, options=(joinedload(Order.user),)
+        )
 
         customer_type = CustomerType.USER_RETAIL
         if order.user.customer_type:
-            customer = await UserDAO.find_by_id(db_session, order.user.id)
-            customer_type = customer.customer_type
+            customer_type = order.user.customer_type
 
-        match customer_type:
-            case CustomerType.USER_SUPER_WHOLESALE:
-                price = offer.super_wholesale_price_rub
-            case CustomerType.USER_WHOLESALE:
-                price = round((offer.price_rub + offer.super_wholesale_price_rub) / 2)
-            case _:
-                price = offer.price_rub
+        price = price_for_customer(
+            offer.price_rub, offer.super_wholesale_price_rub, customer_type
+        )
 
-        return await OrderOfferDAO.add(
+        # the caller already has the offer: no re-select of the line
+        (line,) = await OrderOfferDAO.add_many(
             db_session,
-            order_id=order_id,
-            offer_id=order_offer.offer_id,
-            quantity=order_offer.quantity,
-            brand=order_offer.brand,
-            manufacturer_number=order_offer.manufacturer_number,
-            price_rub=price,
+            [
+                {
+                    "order_id": order_id,
+                    "offer_id": order_offer.offer_id,
+                    "quantity": order_offer.quantity,
+                    "brand": order_offer.brand,
+                    "manufacturer_number": order_offer.manufacturer_number,
+                    "price_rub": price,
+                }
+            ],
+            options=(),
         )
+        return line
 
     @staticmethod
-    async def fetch_order_offers(order) -> list[OrderOfferSchema]:
-        result: list[OrderOfferSchema] = []
-        for item in order.order_offers:
-            offer: Offer = item.offer
-            result.append(
-                OrderOfferSchema.model_validate(
-                    {
-                        "id": item.id,
-                        "order_id": order.id,
-                        "offer_id": offer.id,
-                        "quantity": item.quantity,
-                        "brand": offer.brand,
-                        "manufacturer_number": offer.manufacturer_number,
-                        "price_rub": item.price_rub,
-                        "offer": OfferSchema.model_validate(offer),
-                    }
-                )
+    async def fetch_order_offers(order) -> list[dict]:
+        """
+        Order lines as OrderOfferSchema-shaped dicts, brand and manufacturer
+        number are taken from the offer.
+        Serialized by the compiled serializer: the rows are not re-validated.
+        """
+        dump = compile_serializer(OrderOfferSchema)
+        return [
+            dump(
+                item,
+                overrides={
+                    "order_id": order.id,
+                    "brand": item.offer.brand,
+                    "manufacturer_number": item.offer.manufacturer_number,
+                },
             )
-        return result
+            for item in order.order_offers
+        ]
 
     @staticmethod
     async def post_order_with_offers(
         db_session: AsyncSession,
+        redis: Redis,
         payload: OrderWithOffersInternalPostSchema,
     ) -> Order:
         """
-        Add an offer to an order and return the created OrderOffer schema.
+        Create an order with its offers and reserve their stock.
+        Nothing is committed if any line can't be reserved (InsufficientStockError).
         """
         order: Order = await OrderDAO.add(
             db_session, **payload.model_dump(exclude={"order_offers"})
         )
+        lines: dict[UUID, int] = {}
         for order_offer in payload.order_offers:
             await OrderService.add_offer_to_order(db_session, order.id, order_offer)
-        await db_session.commit()
-        await db_session.refresh(order, ["user", "order_offers"])
-        return order
+            lines[order_offer.offer_id] = (
+                lines.get(order_offer.offer_id, 0) + order_offer.quantity
+            )
+
+        if lines:
+            await StockReservationService.reserve(db_session, redis, order.id, lines)
+        # confirmation email, sent by the worker once the order is committed
+        OutboxService.order_created(db_session, order)
+        try:
+            await db_session.commit()
+        except SQLAlchemyError:
+            await StockReservationService.release(redis, order.id)
+            raise
+        # the lines were added after OrderDAO.add loaded the (empty) collection
+        return await OrderDAO.reload(db_session, order.id)
 
     @staticmethod
     async def convert_order_to_waybill(
@@ -113,7 +139,7 @@ class OrderService:
         waybill_object = WaybillPostSchema(
             author_id=author_id,
             order_id=order.id,
-            customer_id=order.user.id,
+            customer_id=order.user_id,
             waybill_type=WaybillType.WAYBILL_OUT,
             is_pending=True,
             note=order.note,
@@ -122,18 +148,22 @@ class OrderService:
             db_session, **waybill_object.model_dump()
         )
 
-        for order_offer in order.order_offers:
-            waybill_offer = WaybillOffer(
-                waybill_id=waybill.id,
-                offer_id=order_offer.offer_id,
-                quantity=order_offer.quantity,
-                brand=order_offer.brand,
-                manufacturer_number=order_offer.manufacturer_number,
-                price_rub=order_offer.price_rub,
-            )
-            waybill.waybill_offers.append(waybill_offer)
+        await WaybillOfferDAO.add_many(
+            db_session,
+            [
+                {
+                    "waybill_id": waybill.id,
+                    "offer_id": order_offer.offer_id,
+                    "quantity": order_offer.quantity,
+                    "brand": order_offer.brand,
+                    "manufacturer_number": order_offer.manufacturer_number,
+                    "price_rub": order_offer.price_rub,
+                }
+                for order_offer in order.order_offers
+            ],
+            options=(),
+        )
 
         await db_session.commit()
-        await db_session.refresh(waybill, ["author", "waybill_offers"])
-        await db_session.refresh(order, ["waybill"])
+        # author and customer are loaded by WaybillDAO.add
         return waybill
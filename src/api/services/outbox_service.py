@@ -0,0 +1,211 @@
+import asyncio
+import contextlib
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Mapping
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.offer_dao import OfferDAO
+from src.api.dao.outbox_dao import OutboxDAO
+from src.api.di.db_helper import db_helper
+from src.api.services.facet_service import FacetService
+from src.api.services.stock_service import StockReservationService
+from src.common.services.job_queue import JobQueue
+from src.common.services.response_cache import ResponseCache, entity_tags
+from src.config import settings
+from src.models import Offer, Order, OutboxEvent, Waybill
+from src.schemas.common.enums import JobName, OutboxTopic
+from src.utils.logging import logger
+
+
+class OutboxService:
+    """
+    Producers: add the event of a business change to the session,
+    it is committed (or rolled back) together with the change.
+    Payloads are plain JSON, the dispatcher re-reads what may have changed since.
+    """
+
+    @staticmethod
+    def add(
+        db_session: AsyncSession, topic: OutboxTopic, payload: dict[str, Any]
+    ) -> None:
+        db_session.add(OutboxEvent(topic=topic, payload=payload))
+
+    @staticmethod
+    def waybill_committed(db_session: AsyncSession, waybill: Waybill) -> None:
+        tags: set[str] = set()
+        for item in waybill.waybill_offers:
+            tags |= entity_tags(item.offer)
+        OutboxService.add(
+            db_session,
+            OutboxTopic.WAYBILL_COMMITTED,
+            {
+                "waybill_id": str(waybill.id),
+                "offer_ids": [str(item.offer_id) for item in waybill.waybill_offers],
+                "order_id": str(waybill.order_id) if waybill.order_id else None,
+                "tags": sorted(tags),
+            },
+        )
+
+    @staticmethod
+    def order_created(db_session: AsyncSession, order: Order) -> None:
+        OutboxService.add(
+            db_session, OutboxTopic.ORDER_CREATED, {"order_id": str(order.id)}
+        )
+
+    @staticmethod
+    def offer_price_changed(db_session: AsyncSession, offer: Offer) -> None:
+        OutboxService.add(
+            db_session,
+            OutboxTopic.OFFER_PRICE_CHANGED,
+            {
+                "offer_id": str(offer.id),
+                "price_rub": float(offer.price_rub),
+                "super_wholesale_price_rub": float(offer.super_wholesale_price_rub),
+                "tags": sorted(entity_tags(offer)),
+            },
+        )
+
+
+Handler = Callable[
+    ["OutboxDispatcher", AsyncSession, list[dict[str, Any]]], Awaitable[None]
+]
+
+
+class OutboxDispatcher:
+    """
+    Runs the side effects of the committed outbox events (in the worker process):
+    1. A batch of due events is locked with FOR UPDATE SKIP LOCKED,
+       so several dispatchers never take the same event
+    2. The batch is handled per topic, the payloads of a topic together:
+       one cache invalidation, one stock reconciliation, one feed rebuild
+    3. Slow work (mailing, feed) is queued as jobs with a key, so an event
+       delivered twice doesn't send or build twice
+    4. A failed topic is retried with backoff, given up after OUTBOX_MAX_ATTEMPTS
+    The handlers are idempotent: delivery is at least once.
+    """
+
+    def __init__(self, redis: Redis, jobs: JobQueue) -> None:
+        self.redis = redis
+        self.jobs = jobs
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info("[Outbox] Dispatcher started")
+        while not self._stopping.is_set():
+            try:
+                dispatched = await self.dispatch_batch()
+            except (RedisError, SQLAlchemyError) as e:
+                logger.warning("[Outbox] Dispatch failed: %s", e)
+                dispatched = 0
+            if dispatched < settings.WORKER.OUTBOX_BATCH_SIZE:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._stopping.wait(), settings.WORKER.OUTBOX_POLL_DELAY
+                    )
+        logger.info("[Outbox] Dispatcher stopped")
+
+    async def dispatch_batch(self) -> int:
+        # the cache/stock helpers only log Redis errors:
+        # without Redis the events stay pending instead of being lost
+        await self.redis.ping()
+
+        async with db_helper.AsyncSessionFactory() as session, session.begin():
+            events = await OutboxDAO.claim_batch(
+                session, settings.WORKER.OUTBOX_BATCH_SIZE
+            )
+            by_topic: dict[OutboxTopic, list[OutboxEvent]] = defaultdict(list)
+            for event in events:
+                by_topic[event.topic].append(event)
+
+            for topic, group in by_topic.items():
+                ids = [event.id for event in group]
+                payloads = [event.payload for event in group]
+                attempts = max(event.attempts for event in group)
+                try:
+                    # a DB error of the handler only rolls back to the savepoint:
+                    # the failure is recorded, the other topics are dispatched
+                    async with session.begin_nested():
+                        await HANDLERS[topic](self, session, payloads)
+                except Exception as e:
+                    logger.warning(
+                        "[Outbox] %s x%s failed (attempt %s): %s",
+                        topic,
+                        len(group),
+                        attempts + 1,
+                        e,
+                    )
+                    await OutboxDAO.mark_failed(
+                        session,
+                        ids,
+                        error=str(e)[:500],
+                        retry_in=timedelta(
+                            seconds=settings.WORKER.JOB_RETRY_BACKOFF * 2**attempts
+                        ),
+                        max_attempts=settings.WORKER.OUTBOX_MAX_ATTEMPTS,
+                    )
+                else:
+                    await OutboxDAO.mark_processed(session, ids)
+                    logger.info("[Outbox] %s x%s dispatched", topic, len(group))
+        return len(events)
+
+    async def _rebuild_feed(self) -> None:
+        """
+        Changes within YML_FEED_DEBOUNCE seconds share one deferred build
+        """
+        window = settings.WORKER.YML_FEED_DEBOUNCE
+        now = time.time()
+        await self.jobs.enqueue(
+            JobName.YML_FEED,
+            key=f"outbox-{int(now // window)}",
+            defer_by=window - now % window,
+            rerun_finished=False,
+        )
+
+    async def _on_waybill_committed(
+        self, session: AsyncSession, payloads: list[dict[str, Any]]
+    ) -> None:
+        tags = {tag for payload in payloads for tag in payload["tags"]}
+        offer_ids = {UUID(_id) for payload in payloads for _id in payload["offer_ids"]}
+        orders = {payload["order_id"] for payload in payloads if payload["order_id"]}
+
+        # the current stock, not the one of the event: it may be a late retry
+        quantities = await OfferDAO.get_quantities(session, list(offer_ids))
+        await StockReservationService.reconcile(self.redis, quantities, orders)
+        await ResponseCache.invalidate(self.redis, tags)
+        await FacetService.invalidate(self.redis)
+        await self._rebuild_feed()
+
+    async def _on_order_created(
+        self, session: AsyncSession, payloads: list[dict[str, Any]]
+    ) -> None:
+        for payload in payloads:
+            await self.jobs.enqueue(
+                JobName.ORDER_EMAIL,
+                {"order_id": payload["order_id"]},
+                key=payload["order_id"],
+                rerun_finished=False,
+            )
+
+    async def _on_offer_price_changed(
+        self, session: AsyncSession, payloads: list[dict[str, Any]]
+    ) -> None:
+        tags = {tag for payload in payloads for tag in payload["tags"]}
+        await ResponseCache.invalidate(self.redis, tags)
+        await self._rebuild_feed()
+
+
+HANDLERS: Mapping[OutboxTopic, Handler] = {
+    OutboxTopic.WAYBILL_COMMITTED: OutboxDispatcher._on_waybill_committed,
+    OutboxTopic.ORDER_CREATED: OutboxDispatcher._on_order_created,
+    OutboxTopic.OFFER_PRICE_CHANGED: OutboxDispatcher._on_offer_price_changed,
+}
@@ -0,0 +1,205 @@
+import asyncio
+import csv
+import io
+import tempfile
+from datetime import date
+from typing import BinaryIO, Sequence
+
+from openpyxl import Workbook
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.core.pricing import price_for_customer
+from src.api.dao.offer_dao import OfferDAO
+from src.common.services.s3_service import S3Service
+from src.config import settings
+from src.schemas.common.enums import CustomerType, PriceListExt, PriceListType
+from src.utils.logging import logger
+
+PRICE_LIST_PATH = "tmp/"
+
+PRICE_LIST_HEADERS = {
+    PriceListType.RETIAL: (
+        "Категория",
+        "Подкатегория",
+        "Наименование",
+        "Кросс-номер",
+        "Бренд",
+        "Артикул",
+        "Код",
+        "Цена, ₽",
+        "Остаток",
+    ),
+    PriceListType.WHOLESALE: (
+        "Категория",
+        "Подкатегория",
+        "Наименование",
+        "Кросс-номер",
+        "Бренд",
+        "Артикул",
+        "Код",
+        "Опт, ₽",
+        "Крупный опт, ₽",
+        "Остаток",
+    ),
+}
+
+CONTENT_TYPES = {
+    PriceListExt.EXCEL: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    PriceListExt.CSV: "text/csv; charset=utf-8",
+}
+
+
+class PriceListWriter:
+    """
+    One price list file (ext x type), written row by row:
+    - xlsx: openpyxl write-only mode, rows go to a temp file, not to a cell tree
+    - csv: `;`-separated with BOM, so Excel opens it in UTF-8
+    The result is spooled: kept in memory up to PRICE_LIST_SPOOL_SIZE, then on disk.
+    Not thread-safe: one writer is used by one thread at a time.
+    """
+
+    def __init__(self, ext: PriceListExt, price_type: PriceListType) -> None:
+        self.ext = ext
+        self.price_type = price_type
+        # outlives the writer: closed by PriceListService after the upload
+        self.buffer = tempfile.SpooledTemporaryFile(  # noqa: SIM115
+            max_size=settings.PRICE_LIST_SPOOL_SIZE
+        )
+
+        if ext == PriceListExt.EXCEL:
+            self._workbook = Workbook(write_only=True)
+            self._append = self._workbook.create_sheet("Прайс-лист").append
+        else:
+            self._text = io.TextIOWrapper(self.buffer, encoding="utf-8-sig", newline="")
+            self._append = csv.writer(self._text, delimiter=";").writerow
+
+        self._append(PRICE_LIST_HEADERS[price_type])
+
+    def write(self, rows: Sequence[Row]) -> None:
+        wholesale = self.price_type == PriceListType.WHOLESALE
+        for *names, price_rub, super_wholesale_price_rub, quantity in rows:
+            if wholesale:
+                prices = (
+                    price_for_customer(
+                        price_rub,
+                        super_wholesale_price_rub,
+                        CustomerType.USER_WHOLESALE,
+                    ),
+                    super_wholesale_price_rub,
+                )
+            else:
+                prices = (price_rub,)
+            self._append((*names, *prices, quantity))
+
+    def close(self) -> BinaryIO:
+        """
+        Finish the file and rewind it for the upload
+        """
+        if self.ext == PriceListExt.EXCEL:
+            self._workbook.save(self.buffer)
+        else:
+            self._text.flush()
+            self._text.detach()
+        self.buffer.seek(0)
+        return self.buffer
+
+
+class PriceListService:
+    """
+    Native price list engine:
+    1. Offers are streamed from Postgres in batches (server-side cursor)
+    2. Each batch is written to all four variants (xlsx/csv x retail/wholesale)
+       in a worker thread, while the next batch is being fetched
+    3. Files are uploaded to S3 as multipart transfers read from the spooled buffers
+    Memory is bounded by two batches and the spool size, not by the catalogue.
+    """
+
+    @staticmethod
+    def get_key(ext: PriceListExt, price_type: PriceListType, day: date) -> str:
+        # retail xlsx keeps the historical name: it is linked in the pricing email
+        suffix = "" if price_type == PriceListType.RETIAL else f"_{price_type}"
+        return S3Service.generate_key(
+            f"price_list{suffix}_{day.strftime('%d_%m_%Y')}.{ext}",
+            PRICE_LIST_PATH,
+            use_file_name=True,
+        )
+
+    @staticmethod
+    def _write_batch(writers: list[PriceListWriter], rows: Sequence[Row]) -> None:
+        for writer in writers:
+            writer.write(rows)
+
+    @staticmethod
+    def _close(writers: list[PriceListWriter]) -> None:
+        for writer in writers:
+            writer.close()
+
+    @staticmethod
+    async def build(db_session: AsyncSession) -> list[PriceListWriter]:
+        """
+        All price list variants in one pass over the offers.
+        The caller closes the writers' buffers.
+        """
+        writers = [
+            PriceListWriter(ext, price_type)
+            for ext in PriceListExt
+            for price_type in PriceListType
+        ]
+
+        pending: asyncio.Future | None = None
+        try:
+            async for rows in OfferDAO.stream_price_list(
+                db_session, settings.PRICE_LIST_BATCH_SIZE
+            ):
+                if pending:
+                    await pending
+                pending = asyncio.ensure_future(
+                    asyncio.to_thread(PriceListService._write_batch, writers, rows)
+                )
+            if pending:
+                await pending
+            await asyncio.to_thread(PriceListService._close, writers)
+        except BaseException:
+            if pending and not pending.done():
+                # the thread can't be interrupted: let it finish with the buffers
+                await asyncio.wait({pending})
+            for writer in writers:
+                writer.buffer.close()
+            raise
+
+        return writers
+
+    @staticmethod
+    async def publish(
+        db_session: AsyncSession, s3: S3Service, day: date
+    ) -> dict[tuple[PriceListExt, PriceListType], str]:
+        """
+        Build and upload all price list variants.
+        Returns (ext, type) -> public URL.
+        """
+        writers = await PriceListService.build(db_session)
+        keys = {
+            (w.ext, w.price_type): PriceListService.get_key(w.ext, w.price_type, day)
+            for w in writers
+        }
+        try:
+            await asyncio.gather(
+                *(
+                    s3.upload_file(
+                        file=w.buffer,
+                        key=keys[(w.ext, w.price_type)],
+                        extra_args={
+                            "ACL": "public-read",
+                            "ContentType": CONTENT_TYPES[w.ext],
+                        },
+                    )
+                    for w in writers
+                )
+            )
+        finally:
+            for writer in writers:
+                writer.buffer.close()
+
+        logger.info("[PriceList] Published %s", ", ".join(keys.values()))
+        return {variant: s3.get_file_url(key) for variant, key in keys.items()}
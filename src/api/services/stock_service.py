@@ -0,0 +1,251 @@
+import asyncio
+import time
+from typing import Iterable, Mapping
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dao.offer_dao import OfferDAO
+from src.common.exceptions.exceptions import InsufficientStockError
+from src.config import settings
+from src.models import Waybill
+from src.utils.logging import logger
+
+STOCK_PREFIX = "be-tcf:stock"
+STOCK_EXPIRY_KEY = f"{STOCK_PREFIX}:expiring"
+# AsyncSession.info key, collects stock written in the request (see `reconcile_stock`)
+STOCK_CHANGES_KEY = "stock_changes"
+
+# KEYS[1]: reservation hash, KEYS[2]: expiry zset, KEYS[3..]: offer counters
+# ARGV[1]: order id, ARGV[2]: expires at, ARGV[3..]: quantities (aligned with KEYS)
+# -> {1} reserved | {-1, i...} counters not seeded | {-2, i, available, ...} short
+RESERVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  return {1}
+end
+local missing = {-1}
+for i = 3, #KEYS do
+  if redis.call('HEXISTS', KEYS[i], 'on_hand') == 0 then
+    missing[#missing + 1] = i - 2
+  end
+end
+if #missing > 1 then
+  return missing
+end
+local short = {-2}
+for i = 3, #KEYS do
+  local on_hand = tonumber(redis.call('HGET', KEYS[i], 'on_hand'))
+  local held = tonumber(redis.call('HGET', KEYS[i], 'held') or '0')
+  if on_hand - held < tonumber(ARGV[i]) then
+    short[#short + 1] = i - 2
+    short[#short + 1] = on_hand - held
+  end
+end
+if #short > 1 then
+  return short
+end
+for i = 3, #KEYS do
+  redis.call('HINCRBY', KEYS[i], 'held', ARGV[i])
+  redis.call('HSET', KEYS[1], KEYS[i], ARGV[i])
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+return {1}
+"""
+
+# KEYS[1]: reservation hash, KEYS[2]: expiry zset; ARGV[1]: order id
+# The reservation hash maps counter keys to quantities: single-node Redis only
+RELEASE_SCRIPT = """
+local lines = redis.call('HGETALL', KEYS[1])
+for i = 1, #lines, 2 do
+  if redis.call('EXISTS', lines[i]) == 1 then
+    local held = redis.call('HINCRBY', lines[i], 'held', -tonumber(lines[i + 1]))
+    if held < 0 then
+      redis.call('HSET', lines[i], 'held', 0)
+    end
+  end
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return #lines / 2
+"""
+
+
+class StockReservationService:
+    """
+    Available-to-promise counters for order placement:
+    1. Each offer has a Redis hash {on_hand, held}, seeded from offers.quantity
+    2. An order reserves all its lines in one Lua script:
+       either every line fits into on_hand - held, or nothing is held
+    3. A reservation is consumed by the commit of the order's waybill,
+       released when the order is cancelled/deleted,
+       or expires after STOCK_RESERVATION_TTL (released by `run_reaper`)
+    4. Waybill commits reset on_hand to offers.quantity after the transaction
+
+    Postgres stays the source of truth: if Redis is down, orders are placed unreserved.
+    """
+
+    @staticmethod
+    def _counter_key(offer_id: UUID | str) -> str:
+        return f"{STOCK_PREFIX}:offer:{offer_id}"
+
+    @staticmethod
+    def _reservation_key(order_id: UUID | str) -> str:
+        return f"{STOCK_PREFIX}:order:{order_id}"
+
+    @staticmethod
+    async def get_available(redis: Redis, offer_ids: list[UUID]) -> dict[UUID, int]:
+        """
+        on_hand - held of the seeded counters, offers without a counter are omitted
+        """
+        async with redis.pipeline(transaction=False) as pipe:
+            for offer_id in offer_ids:
+                pipe.hmget(
+                    StockReservationService._counter_key(offer_id), "on_hand", "held"
+                )
+            rows = await pipe.execute()
+
+        return {
+            offer_id: int(on_hand) - int(held or 0)
+            for offer_id, (on_hand, held) in zip(offer_ids, rows)
+            if on_hand is not None
+        }
+
+    @staticmethod
+    async def _seed(
+        db_session: AsyncSession, redis: Redis, offer_ids: list[UUID]
+    ) -> None:
+        quantities = await OfferDAO.get_quantities(db_session, offer_ids)
+        async with redis.pipeline(transaction=False) as pipe:
+            for offer_id, quantity in quantities.items():
+                key = StockReservationService._counter_key(offer_id)
+                pipe.hsetnx(key, "on_hand", quantity)
+                pipe.hsetnx(key, "held", 0)
+            await pipe.execute()
+
+    @staticmethod
+    async def reserve(
+        db_session: AsyncSession,
+        redis: Redis,
+        order_id: UUID,
+        lines: Mapping[UUID, int],
+    ) -> bool:
+        """
+        Hold `lines` (offer id -> quantity) for the order, all or nothing.
+        Raises InsufficientStockError if any line doesn't fit.
+        Returns False if Redis is unavailable and nothing was reserved.
+        """
+        offer_ids = list(lines)
+        keys = [
+            StockReservationService._reservation_key(order_id),
+            STOCK_EXPIRY_KEY,
+            *(StockReservationService._counter_key(_id) for _id in offer_ids),
+        ]
+        args = [
+            str(order_id),
+            int(time.time()) + settings.REDIS.STOCK_RESERVATION_TTL,
+            *(lines[_id] for _id in offer_ids),
+        ]
+
+        try:
+            script = redis.register_script(RESERVE_SCRIPT)
+            result = await script(keys=keys, args=args)
+            if result[0] == -1:
+                # first order of these offers since the counters were reset
+                await StockReservationService._seed(
+                    db_session, redis, [offer_ids[i - 1] for i in result[1:]]
+                )
+                result = await script(keys=keys, args=args)
+        except RedisError as e:
+            logger.warning("[Stock] Reservation of order %s skipped: %s", order_id, e)
+            return False
+
+        match result[0]:
+            case -1:
+                # still not seeded: the offers don't exist
+                short = {
+                    str(offer_ids[i - 1]): (lines[offer_ids[i - 1]], 0)
+                    for i in result[1:]
+                }
+                raise InsufficientStockError(short)
+            case -2:
+                short = {
+                    str(offer_ids[i - 1]): (lines[offer_ids[i - 1]], available)
+                    for i, available in zip(result[1::2], result[2::2])
+                }
+                raise InsufficientStockError(short)
+        return True
+
+    @staticmethod
+    async def release(redis: Redis, order_id: UUID | str) -> None:
+        """
+        Return the order's held quantities to its offers. Idempotent.
+        """
+        try:
+            script = redis.register_script(RELEASE_SCRIPT)
+            await script(
+                keys=[
+                    StockReservationService._reservation_key(order_id),
+                    STOCK_EXPIRY_KEY,
+                ],
+                args=[str(order_id)],
+            )
+        except RedisError as e:
+            logger.warning("[Stock] Release of order %s failed: %s", order_id, e)
+
+    @staticmethod
+    def track_waybill(db_session: AsyncSession, waybill: Waybill) -> None:
+        """
+        Collect the stock written by a waybill commit in the session.
+        Applied to the counters by the `reconcile_stock` route dependency
+        once the transaction has been committed.
+        """
+        changes: dict = db_session.info.setdefault(
+            STOCK_CHANGES_KEY, {"offers": {}, "orders": set()}
+        )
+        for item in waybill.waybill_offers:
+            changes["offers"][item.offer_id] = item.offer.quantity
+        if waybill.order_id:
+            changes["orders"].add(waybill.order_id)
+
+    @staticmethod
+    async def reconcile(
+        redis: Redis,
+        quantities: Mapping[UUID, int],
+        consumed_orders: Iterable[UUID] = (),
+    ) -> None:
+        """
+        Set on_hand to the committed offers.quantity, then drop the reservations
+        of the fulfilled orders (their stock has already left on_hand).
+        """
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for offer_id, quantity in quantities.items():
+                    key = StockReservationService._counter_key(offer_id)
+                    pipe.hset(key, "on_hand", quantity)
+                    pipe.hsetnx(key, "held", 0)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("[Stock] Counter reconciliation failed: %s", e)
+
+        for order_id in consumed_orders:
+            await StockReservationService.release(redis, order_id)
+
+    @staticmethod
+    async def run_reaper(redis: Redis) -> None:
+        """
+        Background task: release reservations past their TTL.
+        Safe to run in every worker, the release script is idempotent.
+        """
+        while True:
+            await asyncio.sleep(settings.REDIS.STOCK_REAPER_INTERVAL)
+            try:
+                expired = await redis.zrangebyscore(
+                    STOCK_EXPIRY_KEY, "-inf", int(time.time()), start=0, num=100
+                )
+            except RedisError as e:
+                logger.warning("[Stock] Reaper failed: %s", e)
+                continue
+            for order_id in expired:
+                await StockReservationService.release(redis, order_id)
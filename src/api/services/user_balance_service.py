@@ -1,12 +1,22 @@
+from datetime import date
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dao.user_balance_history_dao import UserBalanceHistoryDAO
+from src.api.dao.user_balance_snapshot_dao import UserBalanceSnapshotDAO
 from src.api.dao.user_dao import UserDAO
 from src.models import User, UserBalanceHistory
-from src.schemas.common.enums import Currency, UserBalanceChangeReason
-from src.schemas.user_balance_history import UserBalanceHistoryPostSchema
+from src.schemas.common.enums import (
+    Currency,
+    StatementGranularity,
+    UserBalanceChangeReason,
+)
+from src.schemas.user_balance_history import (
+    UserBalanceHistoryPostSchema,
+    UserBalanceMovementSchema,
+    UserBalanceStatementSchema,
+)
 
 BALANCE_FIELD_MAP = {
     Currency.RUB: "balance_rub",
@@ -27,7 +37,7 @@ class UserBalanceService:
         waybill_id: UUID | None = None,
     ) -> UserBalanceHistory | None:
         """
-        Change user balance and create history record.
+        Change user balance, create history record and fold it into the daily snapshot.
         """
         user: User | None = await UserDAO.find_by_id(db_session, user_id)
         if not user:
@@ -51,4 +61,78 @@ class UserBalanceService:
             reason=reason,
         )
 
+        await UserBalanceSnapshotDAO.apply_movement(
+            db_session,
+            user_id=user_id,
+            currency=currency,
+            balance_before=before,
+            balance_after=after,
+        )
+
         return await UserBalanceHistoryDAO.add(db_session, **history.model_dump())
+
+    @staticmethod
+    async def get_statement(
+        db_session: AsyncSession,
+        user_id: UUID,
+        date_from: date,
+        date_to: date,
+        currency: Currency = Currency.RUB,
+        granularity: StatementGranularity = StatementGranularity.DAY,
+    ) -> UserBalanceStatementSchema:
+        """
+        Build a statement for [date_from, date_to] from daily snapshots only,
+        so the cost depends on the length of the period, not on the history size.
+        """
+        user: User | None = await UserDAO.find_by_id(db_session, user_id)
+        if not user:
+            raise ValueError(f"User {user_id} not found")
+
+        opening = await UserBalanceSnapshotDAO.get_opening_balance(
+            db_session, user_id, currency, date_from
+        )
+        if opening is None:
+            # No movements were ever recorded - balance is constant
+            opening = getattr(user, BALANCE_FIELD_MAP[currency])
+
+        snapshots = await UserBalanceSnapshotDAO.find_period(
+            db_session, user_id, currency, date_from, date_to
+        )
+
+        movements: list[UserBalanceMovementSchema] = []
+        for snapshot in snapshots:
+            period = (
+                snapshot.day.replace(day=1)
+                if granularity == StatementGranularity.MONTH
+                else snapshot.day
+            )
+            if movements and movements[-1].period == period:
+                bucket = movements[-1]
+                bucket.closing_balance = snapshot.closing_balance
+                bucket.credit += snapshot.credit
+                bucket.debit += snapshot.debit
+                bucket.movements += snapshot.movements
+            else:
+                movements.append(
+                    UserBalanceMovementSchema(
+                        period=period,
+                        opening_balance=snapshot.opening_balance,
+                        closing_balance=snapshot.closing_balance,
+                        credit=snapshot.credit,
+                        debit=snapshot.debit,
+                        movements=snapshot.movements,
+                    )
+                )
+
+        return UserBalanceStatementSchema(
+            user_id=user_id,
+            currency=currency,
+            date_from=date_from,
+            date_to=date_to,
+            granularity=granularity,
+            opening_balance=opening,
+            closing_balance=movements[-1].closing_balance if movements else opening,
+            total_credit=sum(m.credit for m in movements),
+            total_debit=sum(m.debit for m in movements),
+            movements=movements,
+        )
@@ -1,19 +1,24 @@
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+from src.api.core.pricing import price_for_customer
 from src.api.dao.offer_dao import OfferDAO
-from src.api.dao.user_dao import UserDAO
+from src.api.dao.product_sales_stat_dao import ProductSalesStatDAO
 from src.api.dao.waybill_dao import WaybillDAO
 from src.api.dao.waybill_offer_dao import WaybillOfferDAO
+from src.api.services.outbox_service import OutboxService
+from src.api.services.stock_service import StockReservationService
 from src.api.services.user_balance_service import UserBalanceService
 from src.models import Offer, Waybill, WaybillOffer
 from src.schemas.common.enums import CustomerType, UserBalanceChangeReason, WaybillType
-from src.schemas.offer_schema import OfferSchema
 from src.schemas.waybill_offer_schema import WaybillOfferPostSchema, WaybillOfferSchema
 from src.schemas.waybill_schema import (
+    WaybillSchema,
     WaybillWithOffersInternalPostSchema,
 )
+from src.utils.serializer import compile_serializer
 
 
 class WaybillService:
@@ -25,16 +30,30 @@ class WaybillService:
     4. Commit waybill. POST /waybill/{id}/commit
     5. Waybill.is_pending → False
     6. Refresh Offer.quantity
-    7. If customer_id is set, then change User.balance_rub
-    8. Create UserBalanceHistory record
-    9. Waybill is immutable after commit
+    7. Add WAYBILL_OUT lines to the daily product sales buckets
+       and reconcile the stock reservation counters (after the transaction)
+    7.1 WAYBILL_COMMITTED outbox event: caches, stock counters and the feed
+        are refreshed by the dispatcher, even if the request dies after the commit
+    8. If customer_id is set, then change User.balance_rub
+    9. Create UserBalanceHistory record
+    10. Waybill is immutable after commit
     """
 
     @staticmethod
     async def commit(
         db_session: AsyncSession, waybill_id: UUID, user_id: UUID
     ) -> Waybill:
-        waybill = await WaybillDAO.commit_waybill(db_session, waybill_id, user_id)
+        # with author/customer: a committed waybill is returned as it is
+        waybill, committed = await WaybillDAO.commit_waybill(
+            db_session, waybill_id, user_id
+        )
+        if not committed:
+            return waybill  # already committed or not found
+
+        await ProductSalesStatDAO.apply_waybill(db_session, waybill)
+        StockReservationService.track_waybill(db_session, waybill)
+        OutboxService.waybill_committed(db_session, waybill)
+
         if waybill.customer_id:
             total = sum(
                 item.price_rub * item.quantity for item in waybill.waybill_offers
@@ -66,53 +85,68 @@ class WaybillService:
         3. Assign new price to waybill_offer instance
 
         """
-        offer: Offer = await OfferDAO.find_by_id(db_session, waybill_offer.offer_id)
-        waybill: Waybill = await WaybillDAO.find_by_id(db_session, waybill_id)
+        offer: Offer = await OfferDAO.find_by_id(
+            db_session, waybill_offer.offer_id, options=()
+        )
+        waybill: Waybill = await WaybillDAO.find_by_id(
+            db_session, waybill_id, options=(joinedload(Waybill.customer),)
+        )
 
         customer_type = CustomerType.USER_RETAIL
         if waybill.customer_id:
-            customer = await UserDAO.find_by_id(db_session, waybill.customer.id)
-            customer_type = customer.customer_type
-
-        match customer_type:
-            case CustomerType.USER_SUPER_WHOLESALE:
-                price = offer.super_wholesale_price_rub
-            case CustomerType.USER_WHOLESALE:
-                price = round((offer.price_rub + offer.super_wholesale_price_rub) / 2)
-            case _:
-                price = offer.price_rub
-
-        return await WaybillOfferDAO.add(
+            customer_type = waybill.customer.customer_type
+
+        price = price_for_customer(
+            offer.price_rub, offer.super_wholesale_price_rub, customer_type
+        )
+
+        # the caller already has the offer: no re-select of the line
+        (line,) = await WaybillOfferDAO.add_many(
             db_session,
-            waybill_id=waybill_id,
-            offer_id=waybill_offer.offer_id,
-            quantity=waybill_offer.quantity,
-            brand=waybill_offer.brand,
-            manufacturer_number=waybill_offer.manufacturer_number,
-            price_rub=price,
+            [
+                {
+                    "waybill_id": waybill_id,
+                    "offer_id": waybill_offer.offer_id,
+                    "quantity": waybill_offer.quantity,
+                    "brand": waybill_offer.brand,
+                    "manufacturer_number": waybill_offer.manufacturer_number,
+                    "price_rub": price,
+                }
+            ],
+            options=(),
         )
+        return line
 
     @staticmethod
-    async def fetch_waybill_offers(waybill) -> list[WaybillOfferSchema]:
-        result: list[WaybillOfferSchema] = []
-        for item in waybill.waybill_offers:
-            offer: Offer = item.offer
-            result.append(
-                WaybillOfferSchema.model_validate(
-                    {
-                        "id": item.id,
-                        "waybill_id": waybill.id,
-                        "offer_id": offer.id,
-                        "quantity": item.quantity,
-                        "brand": item.brand,
-                        "manufacturer_number": item.manufacturer_number,
-                        "price_rub": item.price_rub,
-                        "offer": OfferSchema.model_validate(offer),
-                    }
-                )
-            )
-        res = sorted(result, key=lambda x: x.id)
-        return res
+    async def fetch_waybill_offers(
+        db_session: AsyncSession, waybill_id: UUID
+    ) -> list[dict]:
+        """
+        Waybill lines as WaybillOfferSchema-shaped dicts, in document order.
+        Serialized by the compiled serializer: the rows are not re-validated.
+        """
+        dump = compile_serializer(WaybillOfferSchema)
+        lines = await WaybillOfferDAO.find_by_waybill(db_session, waybill_id)
+        return [dump(line) for line in lines]
+
+    @staticmethod
+    async def fetch_waybill_detail(
+        db_session: AsyncSession, waybill_id: UUID
+    ) -> dict | None:
+        """
+        WaybillDetailSchema payload in two statements:
+        1. the header joined with its author and customer
+        2. the lines joined with offer -> product -> sub-category -> category
+        """
+        waybill = await WaybillDAO.find_by_id(db_session, waybill_id)
+        if not waybill:
+            return None
+
+        detail = WaybillSchema.model_validate(waybill).model_dump(mode="json")
+        detail["waybill_offers"] = await WaybillService.fetch_waybill_offers(
+            db_session, waybill_id
+        )
+        return detail
 
     @staticmethod
     async def post_waybill_with_offers(
@@ -129,6 +163,5 @@ class WaybillService:
             await WaybillService.add_offer_to_waybill(db_session, waybill.id, wo)
 
         await db_session.commit()
-
-        await db_session.refresh(waybill, ["author", "customer", "waybill_offers"])
+        # author and customer are loaded by WaybillDAO.add
         return waybill
@@ -0,0 +1,12 @@
+from fastapi import Request
+
+from src.common.services.job_queue import JobQueue
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """
+    Dependency to get the job queue from the request state.
+    Jobs are run by the worker processes (python -m src.worker).
+    Inited in the main app.
+    """
+    return request.app.state.jobs
@@ -7,3 +7,38 @@ class DuplicateNameError(HTTPException):
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Category with slug/name: '{name}' already exists. OR NullViolationError.",
         )
+
+
+class InsufficientStockError(HTTPException):
+    def __init__(self, short: dict[str, tuple[int, int]]):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Not enough stock to reserve the order",
+                "offers": [
+                    {
+                        "offer_id": offer_id,
+                        "requested": requested,
+                        "available": available,
+                    }
+                    for offer_id, (requested, available) in short.items()
+                ],
+            },
+        )
+
+
+class FileTooLargeError(HTTPException):
+    def __init__(self, max_size: int):
+        super().__init__(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"File is too large: at most {max_size // (1024 * 1024)} MiB is accepted.",
+        )
+
+
+class VersionConflictError(HTTPException):
+    def __init__(self, expected: int, current: int):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Entity was modified by someone else: If-Match version {expected}, current version {current}.",
+            headers={"ETag": f'"{current}"'},
+        )
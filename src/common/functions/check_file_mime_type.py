@@ -1,36 +1,74 @@
+import asyncio
 from pathlib import Path
+from typing import Any, BinaryIO
 
 import magic
 from fastapi import UploadFile
 
+from src.common.exceptions.exceptions import FileTooLargeError
+from src.config import settings
 
-async def is_file_mime_type_correct(file: UploadFile) -> str:
+MIME_SNIFF_SIZE = 2048
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+async def is_file_mime_type_correct(
+    file: UploadFile,
+    digest: Any = None,
+    copy_to: BinaryIO | None = None,
+    max_size: int | None = None,
+) -> str:
     """
     Check the MIME type of file using python-magic.
+    The file is read once, in a worker thread: libmagic, hashing and disk I/O
+    don't block the event loop.
     :param file: The file content as UploadFile.
+    :param digest: hashlib object, fed with the whole file once its type is valid.
+    :param copy_to: binary file the valid upload is copied to in the same pass.
+    :param max_size: size limit in bytes, IMAGE_MAX_SIZE by default.
     :return: MIME type of the file.
     :raises ValueError: If the MIME type or extension is invalid.
+    :raises FileTooLargeError: If the file is over `max_size`.
     """
-    file_name: str = file.filename
-    buffer: bytes = await file.read(2048)
-    await file.seek(0)
+    max_size = max_size or settings.IMAGE_MAX_SIZE
+    # known once the form is parsed: reject before reading anything
+    if file.size is not None and file.size > max_size:
+        raise FileTooLargeError(max_size)
 
-    allowed_extensions: tuple = ("jpg", "jpeg", "png", "webp")
+    return await asyncio.to_thread(
+        _scan_file, file.file, file.filename, digest, copy_to, max_size
+    )
 
-    file_ext: str = Path(file_name).suffix.lower()[
-        1:
-    ]  # Remove the dot from the extension
-    file_ext = "jpeg" if file_ext == "jpg" else file_ext
-    mime_type: str = magic.from_buffer(buffer, mime=True)
 
-    # image/jpeg -> jpeg
-    real_ext: str = mime_type.split("/")[1]
-    if real_ext == file_ext and real_ext in allowed_extensions:
+def _scan_file(
+    file: BinaryIO,
+    file_name: str,
+    digest: Any,
+    copy_to: BinaryIO | None,
+    max_size: int,
+) -> str:
+    """
+    Sniff the header, then stream the rest into the digest and the copy,
+    stopping as soon as the file turns out to be over `max_size`.
+    """
+    file.seek(0)
+    try:
+        buffer = file.read(MIME_SNIFF_SIZE)
+        mime_type = _is_file_mime_type_correct(buffer, file_name)
+
+        size = 0
+        while buffer:
+            size += len(buffer)
+            if size > max_size:
+                raise FileTooLargeError(max_size)
+            if digest is not None:
+                digest.update(buffer)
+            if copy_to is not None:
+                copy_to.write(buffer)
+            buffer = file.read(HASH_CHUNK_SIZE)
         return mime_type
-    else:
-        raise ValueError(
-            f"Invalid file type: {mime_type}. Expected image file with extensions {allowed_extensions}."
-        )
+    finally:
+        file.seek(0)
 
 
 def _is_file_mime_type_correct(buffer: bytes, file_name: str) -> str:
@@ -0,0 +1,403 @@
+import asyncio
+import contextlib
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Mapping
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.schemas.common.enums import JobStatus
+from src.utils.logging import logger
+
+JOBS_PREFIX = "be-tcf:jobs"
+# zset per job type (`<JOBS_QUEUE_KEY>:<name>`): job id -> run at (ms);
+# due jobs are claimed by the workers
+JOBS_QUEUE_KEY = f"{JOBS_PREFIX}:queue"
+# zset: job id -> deadline (ms); jobs past it were lost with their worker
+JOBS_RUNNING_KEY = f"{JOBS_PREFIX}:running"
+# seconds a job may outlive its timeout before it is considered lost
+LOST_JOB_GRACE = 60
+# session.info key: jobs staged by a request, queued after its commit
+STAGED_JOBS_KEY = "staged_jobs"
+
+# KEYS[1]: job hash, KEYS[2]: queue zset
+# ARGV[1]: job id, ARGV[2]: run at, ARGV[3]: rerun finished (1/0), ARGV[4..]: fields
+# -> 1 queued | 0 the job is queued/running already (or finished, without rerun)
+ENQUEUE_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status then
+  if status == 'queued' or status == 'in_progress' or ARGV[3] == '0' then
+    return 0
+  end
+  redis.call('DEL', KEYS[1])
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+return 1
+"""
+
+# KEYS[1]: queue zset, KEYS[2]: running zset, KEYS[3]: job hash
+# ARGV[1]: job id, ARGV[2]: deadline, ARGV[3]: started at
+# -> attempt number | 0 claimed by another worker
+CLAIM_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+  return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[3], 'status', 'in_progress', 'started_at', ARGV[3])
+return redis.call('HINCRBY', KEYS[3], 'tries', 1)
+"""
+
+# KEYS[1]: running zset, KEYS[2]: queue zset, KEYS[3]: job hash
+# ARGV[1]: job id, ARGV[2]: run at
+REQUEUE_SCRIPT = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+  return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[3], 'status', 'queued')
+return 1
+"""
+
+
+def _job_key(job_id: str) -> str:
+    return f"{JOBS_PREFIX}:{job_id}"
+
+
+def _queue_key(job_id: str) -> str:
+    """
+    The queue of the job's type, `job_id` is `<name>:<key>` or just the name
+    """
+    return f"{JOBS_QUEUE_KEY}:{job_id.split(':', 1)[0]}"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+@dataclass(frozen=True, slots=True)
+class JobDefinition:
+    """
+    A job type: `func(ctx, **kwargs)` with its limits.
+    `concurrency` caps the jobs of this type run at once by one worker.
+    """
+
+    func: Callable[..., Awaitable[Any]]
+    max_tries: int = 3
+    concurrency: int = 1
+    timeout: int = 600
+
+
+@dataclass(frozen=True, slots=True)
+class CronJob:
+    """
+    Enqueued daily at hour:minute, or hourly at :minute when `hour` is None.
+    """
+
+    name: str
+    minute: int = 0
+    hour: int | None = None
+
+    def next_run(self, after: datetime) -> datetime:
+        run = after.replace(minute=self.minute, second=0, microsecond=0)
+        if self.hour is None:
+            return run if run > after else run + timedelta(hours=1)
+        run = run.replace(hour=self.hour)
+        return run if run > after else run + timedelta(days=1)
+
+
+class JobQueue:
+    """
+    Redis-backed job queue, shared by the API (enqueue, status)
+    and the worker processes (`Worker`):
+    - a job is a hash under be-tcf:jobs:<id>, its id is `<name>:<key>`
+    - queued jobs sit in a zset per job type, scored by the time they are due,
+      retries and deferred jobs are just scored in the future
+    - a job with a given key is queued once: enqueueing it again while it is
+      queued or running returns the existing job
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+    async def enqueue(
+        self,
+        name: str,
+        kwargs: Mapping[str, Any] | None = None,
+        *,
+        key: str | None = None,
+        defer_by: float = 0,
+        rerun_finished: bool = True,
+    ) -> tuple[str, bool]:
+        """
+        Queue the job `name` with JSON-serializable `kwargs`.
+        Returns (job id, False if a job with this key is queued/running already).
+        `rerun_finished=False` also keeps finished jobs from running again,
+        e.g. a cron run enqueued by several workers.
+        """
+        job_id = f"{name}:{key or uuid.uuid4().hex}"
+        fields = {
+            "name": name,
+            "kwargs": orjson.dumps(kwargs or {}).decode(),
+            "status": JobStatus.QUEUED,
+            "tries": 0,
+            "enqueued_at": datetime.now().isoformat(),
+        }
+        script = self.redis.register_script(ENQUEUE_SCRIPT)
+        queued = await script(
+            keys=[_job_key(job_id), _queue_key(job_id)],
+            args=[
+                job_id,
+                _now_ms() + int(defer_by * 1000),
+                int(rerun_finished),
+                *(item for pair in fields.items() for item in pair),
+            ],
+        )
+        if queued:
+            logger.info("[Jobs] Queued %s", job_id)
+        return job_id, bool(queued)
+
+    @staticmethod
+    def stage(
+        db_session: AsyncSession,
+        name: str,
+        kwargs: Mapping[str, Any] | None = None,
+        *,
+        key: str | None = None,
+    ) -> str:
+        """
+        Queue the job once the request's transaction has been committed
+        (`enqueue_jobs` route dependency), so the worker sees the rows it needs.
+        Returns the job id.
+        """
+        key = key or uuid.uuid4().hex
+        db_session.info.setdefault(STAGED_JOBS_KEY, []).append((name, kwargs, key))
+        return f"{name}:{key}"
+
+    async def put(
+        self, staged: list[tuple[str, Mapping[str, Any] | None, str]]
+    ) -> None:
+        for name, kwargs, key in staged:
+            try:
+                await self.enqueue(name, kwargs, key=key)
+            except RedisError as e:
+                logger.error("[Jobs] Failed to queue %s:%s: %s", name, key, e)
+
+    async def get_job(self, job_id: str) -> dict[str, Any] | None:
+        job = await self.redis.hgetall(_job_key(job_id))
+        if not job:
+            return None
+        job["id"] = job_id
+        job["tries"] = int(job.get("tries", 0))
+        for field in ("kwargs", "result"):
+            if field in job:
+                job[field] = orjson.loads(job[field])
+        return job
+
+
+class Worker:
+    """
+    Runs the queued jobs (python -m src.worker):
+    1. Due jobs are claimed from the queue atomically, as long as the worker
+       has a free slot (WORKER_MAX_JOBS) and the job type is under its concurrency
+    2. A failed job is retried with exponential backoff up to `max_tries`,
+       then left FAILED with its error
+    3. Jobs of a worker that died are queued again once past their deadline
+    4. Cron jobs are enqueued with a key per run: workers running side by side
+       schedule each run once
+    Finished jobs are kept for JOB_RESULT_TTL.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        jobs: Mapping[str, JobDefinition],
+        cron_jobs: tuple[CronJob, ...] = (),
+        ctx: dict[str, Any] | None = None,
+    ) -> None:
+        self.queue = JobQueue(redis)
+        self.redis = redis
+        self.jobs = jobs
+        self.cron_jobs = cron_jobs
+        self.ctx = {"redis": redis, **(ctx or {})}
+        self._tasks: set[asyncio.Task] = set()
+        self._running: dict[str, int] = dict.fromkeys(jobs, 0)
+        self._stopping = asyncio.Event()
+        self._next_cron: dict[str, datetime] = {}
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info("[Worker] Started: %s", ", ".join(self.jobs))
+        now = datetime.now()
+        self._next_cron = {cron.name: cron.next_run(now) for cron in self.cron_jobs}
+        while not self._stopping.is_set():
+            try:
+                await self._schedule()
+                await self._requeue_lost()
+                await self._poll()
+            except RedisError as e:
+                logger.warning("[Worker] Redis unavailable: %s", e)
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._stopping.wait(), settings.WORKER.WORKER_POLL_DELAY
+                )
+
+        if self._tasks:
+            logger.info("[Worker] Waiting for %s running jobs", len(self._tasks))
+            _, pending = await asyncio.wait(
+                self._tasks, timeout=settings.WORKER.WORKER_DRAIN_TIMEOUT
+            )
+            for task in pending:
+                task.cancel()
+            # cancelled jobs are queued again for the next worker
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("[Worker] Stopped")
+
+    async def _schedule(self) -> None:
+        now = datetime.now()
+        for cron in self.cron_jobs:
+            run = self._next_cron[cron.name]
+            if run > now:
+                continue
+            await self.queue.enqueue(
+                cron.name,
+                key=f"cron:{run:%Y%m%d%H%M}",
+                rerun_finished=False,
+            )
+            self._next_cron[cron.name] = cron.next_run(now)
+
+    async def _requeue_lost(self) -> None:
+        now = _now_ms()
+        lost = await self.redis.zrangebyscore(
+            JOBS_RUNNING_KEY, "-inf", now, start=0, num=100
+        )
+        for job_id in lost:
+            if await self._requeue(job_id):
+                logger.warning("[Worker] %s lost by its worker, queued again", job_id)
+
+    async def _requeue(self, job_id: str) -> bool:
+        script = self.redis.register_script(REQUEUE_SCRIPT)
+        return bool(
+            await script(
+                keys=[JOBS_RUNNING_KEY, _queue_key(job_id), _job_key(job_id)],
+                args=[job_id, _now_ms()],
+            )
+        )
+
+    async def _poll(self) -> None:
+        free = settings.WORKER.WORKER_MAX_JOBS - len(self._tasks)
+        if free <= 0:
+            return
+        now = _now_ms()
+        # a queue per type: a backlog of a saturated type doesn't hide the others
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for name, definition in self.jobs.items():
+                slots = min(free, definition.concurrency - self._running[name])
+                if slots > 0:
+                    pipe.zrangebyscore(
+                        _queue_key(name),
+                        "-inf",
+                        now,
+                        start=0,
+                        num=slots,
+                        withscores=True,
+                    )
+            pages = await pipe.execute()
+
+        script = self.redis.register_script(CLAIM_SCRIPT)
+        # the oldest due jobs first, across the types
+        due = sorted((item for page in pages for item in page), key=lambda i: i[1])
+        for job_id, _ in due:
+            name = job_id.split(":", 1)[0]
+            definition = self.jobs[name]
+            deadline = now + (definition.timeout + LOST_JOB_GRACE) * 1000
+            tries = await script(
+                keys=[_queue_key(name), JOBS_RUNNING_KEY, _job_key(job_id)],
+                args=[job_id, deadline, datetime.now().isoformat()],
+            )
+            if not tries:
+                continue
+
+            self._running[name] += 1
+            task = asyncio.create_task(self._run(job_id, name, definition, tries))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if len(self._tasks) >= settings.WORKER.WORKER_MAX_JOBS:
+                return
+
+    async def _run(
+        self, job_id: str, name: str, definition: JobDefinition, tries: int
+    ) -> None:
+        try:
+            await self._execute(job_id, definition, tries)
+        except asyncio.CancelledError:
+            # the worker is stopping: hand the job over to the next one
+            await self._requeue(job_id)
+            raise
+        except RedisError as e:
+            # left in the running zset: queued again past its deadline
+            logger.error("[Worker] %s state not saved: %s", job_id, e)
+        finally:
+            self._running[name] -= 1
+
+    async def _execute(
+        self, job_id: str, definition: JobDefinition, tries: int
+    ) -> None:
+        key = _job_key(job_id)
+        kwargs = orjson.loads(await self.redis.hget(key, "kwargs") or "{}")
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                definition.func(self.ctx, **kwargs), definition.timeout
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if tries < definition.max_tries:
+                delay = settings.WORKER.JOB_RETRY_BACKOFF * 2 ** (tries - 1)
+                logger.warning(
+                    "[Worker] %s attempt %s failed, retry in %ss: %s",
+                    job_id,
+                    tries,
+                    delay,
+                    error,
+                )
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, mapping={"status": JobStatus.QUEUED, "error": error})
+                    pipe.zrem(JOBS_RUNNING_KEY, job_id)
+                    pipe.zadd(_queue_key(job_id), {job_id: _now_ms() + delay * 1000})
+                    await pipe.execute()
+            else:
+                logger.exception("[Worker] %s failed: %s", job_id, error)
+                await self._finish(key, job_id, JobStatus.FAILED, error=error)
+        else:
+            logger.info("[Worker] %s done in %.1fs", job_id, time.monotonic() - started)
+            await self._finish(key, job_id, JobStatus.COMPLETE, result=result)
+
+    async def _finish(
+        self,
+        key: str,
+        job_id: str,
+        status: JobStatus,
+        result: Any = None,
+        error: str | None = None,
+    ) -> None:
+        fields = {
+            "status": status,
+            "finished_at": datetime.now().isoformat(),
+            "result": orjson.dumps(result).decode(),
+        }
+        if error:
+            fields["error"] = error
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, settings.WORKER.JOB_RESULT_TTL)
+            pipe.zrem(JOBS_RUNNING_KEY, job_id)
+            await pipe.execute()
@@ -0,0 +1,263 @@
+import asyncio
+import contextlib
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Iterable, Mapping
+from uuid import UUID
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.utils.logging import logger
+
+CACHE_PREFIX = "be-tcf:rc"
+# AsyncSession.info key, collects tags of the rows written in the request
+CACHE_TAGS_KEY = "response_cache_tags"
+
+
+def cache_tag(model: Any, _id: UUID | None = None) -> str:
+    """
+    "products" - any row of the table, "products:<id>" - a single row
+    """
+    table = model.__tablename__
+    return f"{table}:{_id}" if _id else table
+
+
+def row_tags(
+    table: Table, values: Mapping[str, Any], changed: Iterable[str] = ()
+) -> set[str]:
+    """
+    Cache tags of a written row: its table, its id and the ids of its parents (FK),
+    so lists filtered by a parent are invalidated as well.
+    If the row was moved to another parent (FK in `changed`),
+    the whole parent table is tagged: the old parent id is unknown here.
+    """
+    tags = {table.name}
+    if (_id := values.get("id")) is not None:
+        tags.add(f"{table.name}:{_id}")
+
+    changed = set(changed)
+    for fk in table.foreign_keys:
+        parent = fk.column.table.name
+        if (parent_id := values.get(fk.parent.name)) is not None:
+            tags.add(f"{parent}:{parent_id}")
+        if fk.parent.name in changed:
+            tags.add(parent)
+    return tags
+
+
+def entity_tags(instance: Any, changed: Iterable[str] = ()) -> set[str]:
+    table: Table = instance.__table__
+    columns = {c.name for c in table.primary_key} | {
+        fk.parent.name for fk in table.foreign_keys
+    }
+    values = {name: getattr(instance, name, None) for name in columns}
+    return row_tags(table, values, changed)
+
+
+def mark_stale(
+    db_session: AsyncSession,
+    table: Table,
+    values: Mapping[str, Any],
+    changed: Iterable[str] = (),
+) -> None:
+    """
+    Collect cache tags of a written row in the session (see `row_tags`).
+    They are invalidated after commit by the `invalidate_response_cache`
+    route dependency.
+    """
+    tags: set[str] = db_session.info.setdefault(CACHE_TAGS_KEY, set())
+    tags.update(row_tags(table, values, changed))
+
+
+def mark_entity_stale(
+    db_session: AsyncSession, instance: Any, changed: Iterable[str] = ()
+) -> None:
+    tags: set[str] = db_session.info.setdefault(CACHE_TAGS_KEY, set())
+    tags.update(entity_tags(instance, changed))
+
+
+class ResponseCache:
+    """
+    Response cache for public catalogue GETs:
+    1. An entry is the serialized response + versions of its tags at compute time
+    2. Writes INCR the versions of their tags -> entries with old versions are misses
+    3. Miss: one request recomputes under a Redis lock (single-flight),
+       the others wait for its result
+    4. After `ttl` the entry is stale: it is still served for `stale_ttl`,
+       while the request that takes the lock recomputes it
+    5. Conditional GETs: the validators (ETag / Last-Modified) are stored with
+       the entry, a HIT answers `not_modified` without touching the DB;
+       `validators` is only awaited on a miss, before `compute`
+    """
+
+    LOCK_TIMEOUT_MS = 10_000
+    POLL_INTERVAL = 0.05
+
+    @staticmethod
+    def key(namespace: str, request: Request) -> str:
+        query = "&".join(
+            f"{k}={v}" for k, v in sorted(request.query_params.multi_items())
+        )
+        digest = hashlib.sha1(query.encode()).hexdigest()
+        return f"{CACHE_PREFIX}:{namespace}:{digest}"
+
+    @staticmethod
+    def _tag_keys(tags: Iterable[str]) -> list[str]:
+        return [f"{CACHE_PREFIX}:tag:{tag}" for tag in tags]
+
+    @staticmethod
+    async def _lookup(
+        redis: Redis, key: str, tag_keys: list[str]
+    ) -> tuple[dict | None, list[str]]:
+        """
+        Returns (entry, current tag versions). Entry is None on a miss
+        or if any of its tags was invalidated since it was computed.
+        """
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.mget(tag_keys)
+            raw, versions = await pipe.execute()
+
+        versions = [v or "0" for v in versions]
+        if not raw:
+            return None, versions
+
+        entry = orjson.loads(raw)
+        if entry["versions"] != versions:
+            return None, versions
+        return entry, versions
+
+    @staticmethod
+    async def _store(
+        redis: Redis,
+        key: str,
+        versions: list[str],
+        body: bytes,
+        headers: Mapping[str, str],
+        ttl: int,
+        stale_ttl: int,
+    ) -> None:
+        entry = {
+            "versions": versions,
+            "fresh_until": time.time() + ttl,
+            "headers": dict(headers),
+            "body": body.decode(),
+        }
+        await redis.set(key, orjson.dumps(entry), ex=ttl + stale_ttl)
+
+    @staticmethod
+    def _response(
+        body: str | bytes, state: str, headers: Mapping[str, str] | None
+    ) -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**(headers or {}), "X-Cache": state},
+        )
+
+    @staticmethod
+    def _body(result: BaseModel | Response) -> bytes:
+        if isinstance(result, Response):
+            return result.body
+        return result.model_dump_json(by_alias=True).encode()
+
+    @staticmethod
+    def _cached(
+        entry: dict,
+        state: str,
+        not_modified: Callable[[Mapping[str, str]], Response | None] | None,
+    ) -> Response:
+        headers = entry.get("headers", {})
+        if not_modified and (res := not_modified(headers)):
+            return res
+        return ResponseCache._response(entry["body"], state, headers)
+
+    @staticmethod
+    async def get_or_compute(
+        redis: Redis,
+        key: str,
+        tags: Iterable[str],
+        compute: Callable[[], Awaitable[BaseModel | Response]],
+        ttl: int = 60,
+        stale_ttl: int = 300,
+        validators: Callable[[], Awaitable[dict[str, str]]] | None = None,
+        not_modified: Callable[[Mapping[str, str]], Response | None] | None = None,
+    ) -> Response | BaseModel:
+        """
+        `validators` - ETag / Last-Modified of the current data, awaited on a miss only.
+        `not_modified` - 304 response for the validators or None (the request's
+        If-None-Match / If-Modified-Since), checked on the cached ones on a HIT.
+        """
+        tag_keys = ResponseCache._tag_keys(tags)
+        lock_key = f"{key}:lock"
+
+        try:
+            entry, versions = await ResponseCache._lookup(redis, key, tag_keys)
+            if entry and entry["fresh_until"] > time.time():
+                return ResponseCache._cached(entry, "HIT", not_modified)
+
+            locked = await redis.set(
+                lock_key, 1, nx=True, px=ResponseCache.LOCK_TIMEOUT_MS
+            )
+            if not locked:
+                if entry:
+                    # someone is already revalidating this entry
+                    return ResponseCache._cached(entry, "STALE", not_modified)
+
+                deadline = time.monotonic() + ResponseCache.LOCK_TIMEOUT_MS / 1000
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(ResponseCache.POLL_INTERVAL)
+                    entry, versions = await ResponseCache._lookup(redis, key, tag_keys)
+                    if entry:
+                        return ResponseCache._cached(entry, "HIT", not_modified)
+                    if not await redis.exists(lock_key):
+                        break
+        except RedisError as e:
+            logger.warning("[ResponseCache] Redis read failed: %s", e)
+            headers = await validators() if validators else {}
+            if not_modified and (res := not_modified(headers)):
+                return res
+            body = ResponseCache._body(await compute())
+            return ResponseCache._response(body, "MISS", headers)
+
+        try:
+            headers = await validators() if validators else {}
+            if not_modified and (res := not_modified(headers)):
+                # the client's copy is current, nothing to store for the others
+                return res
+            body = ResponseCache._body(await compute())
+            # only the store is optional: errors of validators/compute propagate
+            try:
+                await ResponseCache._store(
+                    redis, key, versions, body, headers, ttl, stale_ttl
+                )
+            except RedisError as e:
+                logger.warning("[ResponseCache] Redis write failed: %s", e)
+        finally:
+            with contextlib.suppress(RedisError):
+                await redis.delete(lock_key)
+
+        return ResponseCache._response(body, "MISS", headers)
+
+    @staticmethod
+    async def invalidate(redis: Redis, tags: Iterable[str]) -> None:
+        tag_keys = ResponseCache._tag_keys(tags)
+        if not tag_keys:
+            return
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.incr(tag_key)
+                    # must outlive the entries (ttl + stale_ttl)
+                    pipe.expire(tag_key, settings.REDIS.INVALIDATE_CACHES_TIMEOUT)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("[ResponseCache] Redis invalidation failed: %s", e)
@@ -1,20 +1,30 @@
+import asyncio
 import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
-from typing import Any, BinaryIO
+from typing import Any, AsyncIterator, BinaryIO
 
 from aioboto3 import Session
+from aiobotocore.config import AioConfig
 from aiohttp import ClientError
+from boto3.s3.transfer import TransferConfig
 from pydantic import HttpUrl
 
 from utils.logging import logger
 
+# DeleteObjects limit
+DELETE_BATCH_SIZE = 1000
+
 
-# ? Think about Singleton pattern for S3 client
 class S3Service:
     """
     Wrapper around the aioboto3 S3 client.
     Methods are async.
     Compatible with FastAPI, AWS S3 and Yandex Cloud Storage.
+
+    `open()` (called in the app lifespan) creates one long-lived client:
+    its connection pool and keep-alive connections are shared by all calls.
+    Without it every call opens, and tears down, a client of its own.
     """
 
     def __init__(
@@ -24,6 +34,9 @@ class S3Service:
         region: str,
         endpoint: str,
         bucket: str,
+        max_pool_connections: int = 10,
+        keepalive_timeout: int = 12,
+        upload_concurrency: int = 10,
     ) -> None:
         self._session: Session = Session(
             aws_access_key_id=access_key,
@@ -32,12 +45,48 @@ class S3Service:
         )
         self._endpoint: str = endpoint
         self._bucket: str = bucket
+        self._config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            connector_args={"keepalive_timeout": keepalive_timeout},
+        )
+        # uploads in flight through this service, the rest wait for a slot
+        self._upload_slots = asyncio.Semaphore(upload_concurrency)
+
+        self._exit_stack: AsyncExitStack | None = None
+        self._s3 = None
 
     # ------------------------------------------------------------
-    # Private factory – returns a *fresh* client every call
+    # Lifecycle
     # ------------------------------------------------------------
-    def _client(self):
-        return self._session.client("s3", endpoint_url=self._endpoint)
+    async def open(self) -> None:
+        """
+        Create the shared client. Idempotent.
+        """
+        if self._s3 is not None:
+            return
+        self._exit_stack = AsyncExitStack()
+        self._s3 = await self._exit_stack.enter_async_context(
+            self._session.client("s3", endpoint_url=self._endpoint, config=self._config)
+        )
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._exit_stack = None
+        self._s3 = None
+
+    # ------------------------------------------------------------
+    # Private factory – the shared client, or a fresh one if not opened
+    # ------------------------------------------------------------
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[Any]:
+        if self._s3 is not None:
+            yield self._s3
+            return
+        async with self._session.client(
+            "s3", endpoint_url=self._endpoint, config=self._config
+        ) as s3:
+            yield s3
 
     # ------------------------------------------------------------
     # Public helpers
@@ -53,10 +102,32 @@ class S3Service:
     async def list_objects(self, prefix: str = "") -> list[dict[str, Any]]:
         """
         List objects in a given S3 bucket with a specific prefix.
+        All pages: list_objects_v2 returns at most 1000 keys per request.
+        """
+        objects: list[dict[str, Any]] = []
+        async with self._client() as s3:
+            paginator = s3.get_paginator("list_objects_v2")
+            async for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix):
+                objects.extend(page.get("Contents", []))
+        return objects
+
+    async def list_prefixes(
+        self, prefix: str = "", delimiter: str = "/"
+    ) -> tuple[list[str], list[dict[str, Any]]]:
+        """
+        One level of the "directory" tree under `prefix`:
+        (sub-prefixes, objects directly under `prefix`).
         """
+        prefixes: list[str] = []
+        objects: list[dict[str, Any]] = []
         async with self._client() as s3:
-            resp = await s3.list_objects_v2(Bucket=self._bucket, Prefix=prefix)
-            return resp.get("Contents", [])
+            paginator = s3.get_paginator("list_objects_v2")
+            async for page in paginator.paginate(
+                Bucket=self._bucket, Prefix=prefix, Delimiter=delimiter
+            ):
+                prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+                objects.extend(page.get("Contents", []))
+        return prefixes, objects
 
     async def upload_file(
         self,
@@ -65,23 +136,57 @@ class S3Service:
         *,
         bucket_name: str | None = None,
         extra_args: dict[str, Any] | None = None,
+        max_concurrency: int | None = None,
     ) -> None:
         """
         Upload a file to S3.
+        Waits for a free upload slot (`upload_concurrency`);
+        `max_concurrency` caps the parallel parts of a multipart upload.
         """
         logger.info("Uploading file to S3: %s", key)
-        async with self._client() as s3:
+        config = (
+            TransferConfig(max_concurrency=max_concurrency) if max_concurrency else None
+        )
+        async with self._upload_slots, self._client() as s3:
             try:
                 await s3.upload_fileobj(
                     Fileobj=file,
                     Bucket=bucket_name or self._bucket,
                     Key=key,
                     ExtraArgs=extra_args or {},
+                    Config=config,
                 )
             except ClientError as exc:
                 logger.exception("S3 upload failed: %s", exc)
                 raise
 
+    async def remove_files(
+        self,
+        keys: list[str],
+        bucket_name: str | None = None,
+    ) -> list[str]:
+        """
+        Remove files from S3, up to 1000 keys per request (DeleteObjects).
+        Returns the keys that could not be deleted.
+        """
+        failed: list[str] = []
+        async with self._client() as s3:
+            for start in range(0, len(keys), DELETE_BATCH_SIZE):
+                batch = keys[start : start + DELETE_BATCH_SIZE]
+                try:
+                    resp = await s3.delete_objects(
+                        Bucket=bucket_name or self._bucket,
+                        Delete={
+                            "Objects": [{"Key": key} for key in batch],
+                            "Quiet": True,
+                        },
+                    )
+                except ClientError as exc:
+                    logger.exception("S3 batch delete failed: %s", exc)
+                    raise
+                failed.extend(error["Key"] for error in resp.get("Errors", []))
+        return failed
+
     async def remove_file(
         self,
         key: str,
@@ -106,18 +211,30 @@ class S3Service:
         """
         return f"{self._endpoint}/{self._bucket}/{key}"
 
+    def get_key_from_url(self, url: str) -> str | None:
+        """
+        Reverse of `get_file_url`, None for URLs outside the bucket.
+        """
+        base = self.get_file_url("")
+        return url[len(base) :] if url.startswith(base) else None
+
     @staticmethod
     def generate_key(
-        file_name: str, remote_path: str = "tmp/", use_file_name: bool = False
+        file_name: str,
+        remote_path: str = "tmp/",
+        use_file_name: bool = False,
+        content_hash: str | None = None,
     ) -> str:
         """
         Generate a unique key for the file to be uploaded to S3.
         # 1. safe suffix extraction
         # 2. build key: <remote_path>/<uuid>.<ext> or <remote_path>/<file_name>
+        #    or <remote_path>/<content_hash>.<ext>: the same bytes get the same key
         """
         if use_file_name:
             return f"{remote_path.rstrip('/')}/{file_name}".lstrip("/")
 
         suffix = Path(file_name).suffix.lower()
-        key = f"{remote_path.rstrip('/')}/{uuid.uuid4().hex}{suffix}".lstrip("/")
+        name = content_hash or uuid.uuid4().hex
+        key = f"{remote_path.rstrip('/')}/{name}{suffix}".lstrip("/")
         return key
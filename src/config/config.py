@@ -1,3 +1,5 @@
+import os
+import tempfile
 from enum import StrEnum
 
 from environs import Env
@@ -56,6 +58,9 @@ class RedisConfig(BaseModel):
     REDIS_PORT: int = env.int("REDIS_PORT", 6379)
     REDIS_DB: int = env.int("REDIS_DB", 0)
     INVALIDATE_CACHES_TIMEOUT: int = env.int("INVALIDATE_CACHES_TIMEOUT", 86400)
+    CART_QUOTE_CACHE_TIMEOUT: int = env.int("CART_QUOTE_CACHE_TIMEOUT", 10)
+    STOCK_RESERVATION_TTL: int = env.int("STOCK_RESERVATION_TTL", 86400)
+    STOCK_REAPER_INTERVAL: int = env.int("STOCK_REAPER_INTERVAL", 60)
 
 
 class TelemetryConfig(BaseModel):
@@ -83,6 +88,11 @@ class AWSConfig(BaseModel):
     S3_BUCKET_NAME: str = env.str("S3_BUCKET_NAME", "tcf-images")
     S3_ENDPOINT_URL: str = env.str("S3_ENDPOINT_URL", "https://storage.yandexcloud.net")
 
+    # Shared client: connection pool, idle keep-alive (seconds), simultaneous uploads
+    S3_MAX_POOL_CONNECTIONS: int = env.int("S3_MAX_POOL_CONNECTIONS", 50)
+    S3_KEEPALIVE_TIMEOUT: int = env.int("S3_KEEPALIVE_TIMEOUT", 30)
+    S3_UPLOAD_CONCURRENCY: int = env.int("S3_UPLOAD_CONCURRENCY", 10)
+
 
 class SMTPConfig(BaseModel):
     """
@@ -95,6 +105,41 @@ class SMTPConfig(BaseModel):
     SMTP_PASS: str = env.str("SMTP_PASS")
     RESEND_API_KEY: str = env.str("RESEND_API_KEY")
 
+    # Campaigns: persistent SMTP sessions, messages per second over all of them,
+    # messages per session before it is reopened, recipients per batch
+    SMTP_POOL_SIZE: int = env.int("SMTP_POOL_SIZE", 5)
+    SMTP_RATE_LIMIT: float = env.float("SMTP_RATE_LIMIT", 10)
+    SMTP_MESSAGES_PER_CONNECTION: int = env.int("SMTP_MESSAGES_PER_CONNECTION", 100)
+    EMAIL_CAMPAIGN_BATCH_SIZE: int = env.int("EMAIL_CAMPAIGN_BATCH_SIZE", 200)
+
+
+class WorkerConfig(BaseModel):
+    """
+    Background job worker (python -m src.worker).
+    """
+
+    # jobs run at once by one worker process, seconds between queue polls
+    WORKER_MAX_JOBS: int = env.int("WORKER_MAX_JOBS", 10)
+    WORKER_POLL_DELAY: float = env.float("WORKER_POLL_DELAY", 0.5)
+    # seconds given to running jobs on shutdown
+    WORKER_DRAIN_TIMEOUT: int = env.int("WORKER_DRAIN_TIMEOUT", 30)
+    # first retry delay in seconds, doubled on each attempt
+    JOB_RETRY_BACKOFF: int = env.int("JOB_RETRY_BACKOFF", 5)
+    # finished jobs are kept for the status endpoint
+    JOB_RESULT_TTL: int = env.int("JOB_RESULT_TTL", 86400)
+    # nightly price list hour, hourly feed minute (server local time)
+    PRICE_LIST_HOUR: int = env.int("PRICE_LIST_HOUR", 3)
+    YML_FEED_MINUTE: int = env.int("YML_FEED_MINUTE", 15)
+
+    # Outbox dispatcher: events per batch, seconds between polls of an empty outbox,
+    # attempts before an event is given up, days processed events are kept
+    OUTBOX_BATCH_SIZE: int = env.int("OUTBOX_BATCH_SIZE", 100)
+    OUTBOX_POLL_DELAY: float = env.float("OUTBOX_POLL_DELAY", 1)
+    OUTBOX_MAX_ATTEMPTS: int = env.int("OUTBOX_MAX_ATTEMPTS", 10)
+    OUTBOX_RETENTION_DAYS: int = env.int("OUTBOX_RETENTION_DAYS", 7)
+    # stock/price changes within this many seconds share one feed rebuild
+    YML_FEED_DEBOUNCE: int = env.int("YML_FEED_DEBOUNCE", 60)
+
 
 class AuthConfig(BaseModel):
     # API key to secure certain endpoints
@@ -158,6 +203,7 @@ class Settings(BaseSettings):
     TELEMETRY: TelemetryConfig = TelemetryConfig()
     AWS: AWSConfig = AWSConfig()
     SMTP: SMTPConfig = SMTPConfig()
+    WORKER: WorkerConfig = WorkerConfig()
     AUTH: AuthConfig = AuthConfig()
 
     SERVER: ServerConfig = ServerConfig()
@@ -167,7 +213,22 @@ class Settings(BaseSettings):
     DEBUG: bool = env.bool("DEBUG", False)
     PROJECT_NAME: str = env.str("PROJECT_NAME", "be-tcf")
 
-    DOCX3R_URL: str = env.str("DOCX3R_URL")
+    # Price list: offers fetched per batch, in-memory size of each file before it spills to disk
+    PRICE_LIST_BATCH_SIZE: int = env.int("PRICE_LIST_BATCH_SIZE", 2000)
+    PRICE_LIST_SPOOL_SIZE: int = env.int("PRICE_LIST_SPOOL_SIZE", 8 * 1024 * 1024)
+
+    # Entity images: local spool of pending uploads, upload workers per process,
+    # attempts per upload, seconds given to queued uploads on shutdown
+    IMAGE_SPOOL_DIR: str = env.str(
+        "IMAGE_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "be-tcf-images")
+    )
+    IMAGE_UPLOAD_WORKERS: int = env.int("IMAGE_UPLOAD_WORKERS", 4)
+    # processes rendering the resized variants
+    IMAGE_PROCESS_WORKERS: int = env.int("IMAGE_PROCESS_WORKERS", 2)
+    IMAGE_UPLOAD_RETRIES: int = env.int("IMAGE_UPLOAD_RETRIES", 5)
+    IMAGE_UPLOAD_DRAIN_TIMEOUT: int = env.int("IMAGE_UPLOAD_DRAIN_TIMEOUT", 10)
+    # largest accepted image; multipart bodies over it (+ form fields) are cut off
+    IMAGE_MAX_SIZE: int = env.int("IMAGE_MAX_SIZE", 10 * 1024 * 1024)
 
     # OpenAI (Not used yet)
     OPENAI_API_KEY: str = env.str("OPENAI_API_KEY", "")
@@ -4,6 +4,7 @@ __all__ = (
     "Category",
     "SubCategory",
     "Product",
+    "ProductSalesStat",
     "Offer",
     "Waybill",
     "WaybillOffer",
@@ -11,17 +12,25 @@ __all__ = (
     "OrderOffer",
     "AuditLog",
     "UserBalanceHistory",
+    "UserBalanceSnapshot",
+    "EmailCampaign",
+    "EmailCampaignRecipient",
+    "OutboxEvent",
 )
 
 from .audit_log import AuditLog
 from .base import Base
 from .category import Category
+from .email_campaign import EmailCampaign, EmailCampaignRecipient
 from .offer import Offer
 from .order import Order
 from .order_offer import OrderOffer
+from .outbox_event import OutboxEvent
 from .product import Product
+from .product_sales_stat import ProductSalesStat
 from .sub_category import SubCategory
 from .user import User
 from .user_balance_history import UserBalanceHistory
+from .user_balance_snapshot import UserBalanceSnapshot
 from .waybill import Waybill
 from .waybill_offer import WaybillOffer
@@ -21,9 +21,9 @@ class AuditLog(Base):
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     method: Mapped[str] = mapped_column(String, nullable=True)
     endpoint: Mapped[str] = mapped_column(String, nullable=True)
-    payload: Mapped[dict] = mapped_column(JSON, nullable=True)
+    payload: Mapped[dict | list] = mapped_column(JSON, nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship(
-        "User", back_populates="audit_log", lazy="joined"
+        "User", back_populates="audit_log", lazy="raise"
     )
@@ -4,14 +4,17 @@ from typing import Annotated, Any
 
 from asyncpg import UniqueViolationError
 from fastapi import HTTPException, status
-from sqlalchemy import MetaData, func
+from sqlalchemy import Boolean, Integer, MetaData, false, func, text
+from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
 from src.config import settings
+from src.schemas.common.enums import ImageStatus
 from src.utils.case_converter import camel_case_to_snake_case
+from src.utils.image_variants import variant_urls
 
 # Annotations
 uuid_pk = Annotated[
@@ -33,6 +36,51 @@ updated_at = Annotated[
 ]
 
 
+class Versioned:
+    """
+    Optimistic concurrency for rows edited by several employees at once:
+    `version` is bumped by every write and compared with the client's
+    If-Match (VersionConflictError on mismatch). ORM flushes bump and check it
+    as the mapper's version counter, core UPDATEs (BaseDAO.update) set it themselves.
+    """
+
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default=text("1")
+    )
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {"version_id_col": cls.__table__.c.version}
+
+
+class HasImage:
+    """
+    State of the object behind `image_url`: uploads run after the commit
+    (see ImageUploadQueue), until then the row is PENDING.
+    The upload also stores resized variants (IMAGE_VARIANT_SIZES).
+    """
+
+    image_status: Mapped[ImageStatus] = mapped_column(
+        SQLEnum(ImageStatus, native_enum=False),
+        nullable=False,
+        default=ImageStatus.READY,
+        server_default=ImageStatus.READY.name,
+    )
+    # resized WebP copies next to the original, see `image_variants`
+    has_image_variants: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
+
+    @property
+    def image_variants(self) -> dict[str, str] | None:
+        """
+        Variant -> URL, None until the variants have been uploaded
+        """
+        if not self.has_image_variants or not self.image_url:
+            return None
+        return variant_urls(self.image_url)
+
+
 class Base(DeclarativeBase):
     id: Any
     __name__: str
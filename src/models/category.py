@@ -6,10 +6,10 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.models.base import Base, uuid_pk
+from src.models.base import Base, HasImage, uuid_pk
 
 
-class Category(Base):
+class Category(HasImage, Base):
     __tablename__ = "categories"
 
     id: Mapped[uuid_pk]
@@ -19,7 +19,10 @@ class Category(Base):
 
     # Relationships
     sub_categories = relationship(
-        "SubCategory", back_populates="category", cascade="all, delete-orphan"
+        "SubCategory",
+        back_populates="category",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
 
     # Constraints
@@ -0,0 +1,66 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSON, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import Base, uuid_pk
+from src.schemas.common.enums import CampaignStatus, DeliveryStatus
+
+
+class EmailCampaign(Base):
+    """
+    One mailing to all users with `mailing` on.
+    Sent by the `email_campaign` job (EmailCampaignService), the outcome
+    of every recipient is kept in EmailCampaignRecipient.
+    """
+
+    __tablename__ = "email_campaigns"
+
+    id: Mapped[uuid_pk]
+    subject: Mapped[str] = mapped_column(String, nullable=False)
+    # file in templates/, rendered with `context`
+    template: Mapped[str] = mapped_column(String, nullable=False)
+    context: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    # plain text fallback
+    body: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    status: Mapped[CampaignStatus] = mapped_column(
+        SQLEnum(CampaignStatus, native_enum=False),
+        nullable=False,
+        default=CampaignStatus.QUEUED,
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+
+    # Relationships
+    recipients = relationship("EmailCampaignRecipient", lazy="noload")
+
+
+class EmailCampaignRecipient(Base):
+    __tablename__ = "email_campaign_recipients"
+
+    id: Mapped[uuid_pk]
+    campaign_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("email_campaigns.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    email: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[DeliveryStatus] = mapped_column(
+        SQLEnum(DeliveryStatus, native_enum=False), nullable=False
+    )
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint(
+            "campaign_id", "user_id", name="email_campaign_recipients_user_key"
+        ),
+    )
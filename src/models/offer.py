@@ -4,6 +4,7 @@ from uuid import UUID
 from sqlalchemy import (
     Boolean,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -11,7 +12,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.models.base import Base, uuid_pk
+from src.models.base import Base, HasImage, Versioned, uuid_pk
 from src.models.order_offer import OrderOffer
 
 if TYPE_CHECKING:
@@ -19,7 +20,7 @@ if TYPE_CHECKING:
     from src.models.waybill_offer import WaybillOffer
 
 
-class Offer(Base):
+class Offer(HasImage, Versioned, Base):
     id: Mapped[uuid_pk]
     sku: Mapped[str] = mapped_column(String, nullable=True)
     product_id: Mapped[UUID] = mapped_column(ForeignKey("products.id"), nullable=False)
@@ -39,11 +40,18 @@ class Offer(Base):
 
     # Relationships
     product: Mapped["Product"] = relationship(
-        "Product", back_populates="offers", lazy="joined"
+        "Product", back_populates="offers", lazy="raise"
     )
     waybill_offers: Mapped[list["WaybillOffer"]] = relationship(
-        "WaybillOffer", back_populates="offer", lazy="select"
+        "WaybillOffer", back_populates="offer", lazy="raise"
     )
     order_offers: Mapped[list["OrderOffer"]] = relationship(
-        "OrderOffer", back_populates="offer", lazy="select"
+        "OrderOffer", back_populates="offer", lazy="raise"
+    )
+
+    # Indexes
+    __table_args__ = (
+        # conditional GET watermarks: max(updated_at)/count per product and overall
+        Index("ix_offers_product_id_updated_at", "product_id", "updated_at"),
+        Index("ix_offers_updated_at", "updated_at"),
     )
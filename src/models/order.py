@@ -38,15 +38,15 @@ class Order(Base):
     phone: Mapped[str]
 
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="orders", lazy="joined")
+    user: Mapped["User"] = relationship("User", back_populates="orders", lazy="raise")
     waybill: Mapped["Waybill"] = relationship(
         "Waybill",
         back_populates="order",
         uselist=False,
-        lazy="selectin",
+        lazy="raise",
     )
     order_offers: Mapped[list["OrderOffer"]] = relationship(
-        "OrderOffer", back_populates="order", lazy="selectin"
+        "OrderOffer", back_populates="order", lazy="raise"
     )
 
     @property
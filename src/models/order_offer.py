@@ -31,8 +31,8 @@ class OrderOffer(Base):
 
     # Relationships
     order: Mapped["Order"] = relationship(
-        "Order", back_populates="order_offers", lazy="select"
+        "Order", back_populates="order_offers", lazy="raise"
     )
     offer: Mapped["Offer"] = relationship(
-        "Offer", back_populates="order_offers", lazy="joined"
+        "Offer", back_populates="order_offers", lazy="raise"
     )
@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSON, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base, uuid_pk
+from src.schemas.common.enums import OutboxTopic
+
+
+class OutboxEvent(Base):
+    """
+    Transactional outbox: a business change (waybill commit, new order,
+    offer price) and its event are written in the same transaction.
+    The side effects (caches, feed, mailing) are run from here by the
+    OutboxDispatcher once the change is committed, and only then.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id: Mapped[uuid_pk]
+    topic: Mapped[OutboxTopic] = mapped_column(
+        SQLEnum(OutboxTopic, native_enum=False), nullable=False
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    # not dispatched before (pushed back on a failed attempt)
+    available_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    # set when dispatched, or given up after OUTBOX_MAX_ATTEMPTS (with `error`)
+    processed_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+
+    # Indexes: the dispatcher only reads the pending events
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending",
+            "available_at",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
@@ -3,15 +3,16 @@ import uuid
 from sqlalchemy import (
     Boolean,
     ForeignKey,
+    Index,
     String,
     UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.models.base import Base, uuid_pk
+from src.models.base import Base, HasImage, Versioned, uuid_pk
 
 
-class Product(Base):
+class Product(HasImage, Versioned, Base):
     id: Mapped[uuid_pk]
     bitrix_id: Mapped[str] = mapped_column(String, nullable=True)
 
@@ -28,8 +29,8 @@ class Product(Base):
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relationships
-    sub_category = relationship("SubCategory", back_populates="products", lazy="joined")
-    offers = relationship("Offer", back_populates="product", lazy="select")
+    sub_category = relationship("SubCategory", back_populates="products", lazy="raise")
+    offers = relationship("Offer", back_populates="product", lazy="raise")
 
     # Vector search
     # embedding: Mapped[Vector] = mapped_column(Vector(1536), nullable=True)
@@ -37,6 +38,11 @@ class Product(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint("slug", name="products_slug_key"),
+        # conditional GET watermarks: max(updated_at)/count per sub-category and overall
+        Index(
+            "ix_products_sub_category_id_updated_at", "sub_category_id", "updated_at"
+        ),
+        Index("ix_products_updated_at", "updated_at"),
         # Index(
         #     "idx_products_embedding",
         #     "embedding",
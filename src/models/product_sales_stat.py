@@ -0,0 +1,61 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import Base, uuid_pk
+from src.schemas.common.enums import CustomerType
+
+
+class ProductSalesStat(Base):
+    """
+    Daily sales bucket per (product, brand, sub-category, customer type),
+    built from committed WAYBILL_OUT waybills.
+    Updated incrementally on waybill commit, rebuilt with `tech/rebuild_sales_stats.py`.
+    """
+
+    __tablename__ = "product_sales_stats"
+
+    id: Mapped[uuid_pk]
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # Dimensions (snapshot at the moment of sale)
+    brand: Mapped[str] = mapped_column(String, nullable=False)
+    sub_category_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("sub_categories.id", ondelete="CASCADE"), nullable=False
+    )
+    customer_type: Mapped[CustomerType] = mapped_column(
+        SQLEnum(CustomerType, native_enum=False), nullable=False
+    )
+
+    sold: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 4), nullable=False, default=0)
+
+    # Relationships
+    product = relationship("Product", lazy="noload")
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint(
+            "day",
+            "product_id",
+            "brand",
+            "sub_category_id",
+            "customer_type",
+            name="product_sales_stats_day_key",
+        ),
+        Index("ix_product_sales_stats_product_id", "product_id"),
+    )
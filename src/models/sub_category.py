@@ -7,10 +7,10 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.models.base import Base, uuid_pk
+from src.models.base import Base, HasImage, uuid_pk
 
 
-class SubCategory(Base):
+class SubCategory(HasImage, Base):
     __tablename__ = "sub_categories"
 
     id: Mapped[uuid_pk]
@@ -21,8 +21,8 @@ class SubCategory(Base):
     category_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("categories.id"))
 
     # Relationships
-    category = relationship("Category", back_populates="sub_categories", lazy="joined")
-    products = relationship("Product", back_populates="sub_category")
+    category = relationship("Category", back_populates="sub_categories", lazy="raise")
+    products = relationship("Product", back_populates="sub_category", lazy="raise")
 
     # Constraints
     __table_args__ = (UniqueConstraint("slug", name="sub_categories_slug_key"),)
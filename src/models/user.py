@@ -66,13 +66,19 @@ class User(Base):
 
     # Relationships
     created_waybills: Mapped[list["Waybill"]] = relationship(
-        "Waybill", foreign_keys="Waybill.author_id", back_populates="author"
+        "Waybill",
+        foreign_keys="Waybill.author_id",
+        back_populates="author",
+        lazy="raise",
     )
     received_waybills: Mapped[list["Waybill"]] = relationship(
-        "Waybill", foreign_keys="Waybill.customer_id", back_populates="customer"
+        "Waybill",
+        foreign_keys="Waybill.customer_id",
+        back_populates="customer",
+        lazy="raise",
     )
     orders: Mapped[list["Order"]] = relationship(
-        "Order", back_populates="user", lazy="select"
+        "Order", back_populates="user", lazy="raise"
     )
     audit_log: Mapped[list["AuditLog"]] = relationship(
         "AuditLog", back_populates="user", lazy="noload"
@@ -30,8 +30,8 @@ class UserBalanceHistory(Base):
 
     # Relationships
     user: Mapped["User"] = relationship(
-        "User", back_populates="user_balance_history", lazy="joined"
+        "User", back_populates="user_balance_history", lazy="raise"
     )
     waybill: Mapped["Waybill"] = relationship(
-        "Waybill", back_populates="user_balance_history", lazy="joined"
+        "Waybill", back_populates="user_balance_history", lazy="raise"
     )
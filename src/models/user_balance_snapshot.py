@@ -0,0 +1,43 @@
+from datetime import date
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import Base, uuid_pk
+from src.schemas.common.enums import Currency
+
+if TYPE_CHECKING:
+    from src.models import User
+
+
+class UserBalanceSnapshot(Base):
+    """
+    Daily rollup of UserBalanceHistory: one row per (user, currency, day).
+    Maintained incrementally by UserBalanceService.change_balance, so statements
+    never have to scan the raw history.
+    """
+
+    __tablename__ = "user_balance_snapshots"
+
+    id: Mapped[uuid_pk]
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    currency: Mapped[Currency] = mapped_column(String(3), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+
+    opening_balance: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    closing_balance: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    credit: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    debit: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    movements: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Relationships
+    user: Mapped["User"] = relationship("User", lazy="noload")
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "currency", "day", name="user_balance_snapshots_day_key"
+        ),
+    )
@@ -5,14 +5,14 @@ from sqlalchemy import Boolean, ForeignKey, String
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.models.base import Base, uuid_pk
+from src.models.base import Base, Versioned, uuid_pk
 from src.schemas.common.enums import WaybillType
 
 if TYPE_CHECKING:
     from src.models import Offer, Order, User, UserBalanceHistory, WaybillOffer
 
 
-class Waybill(Base):
+class Waybill(Versioned, Base):
     id: Mapped[uuid_pk]
     author_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     customer_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -32,13 +32,13 @@ class Waybill(Base):
         "User",
         foreign_keys=[author_id],
         back_populates="created_waybills",
-        lazy="joined",
+        lazy="raise",
     )
     customer: Mapped["User"] = relationship(
         "User",
         foreign_keys=[customer_id],
         back_populates="received_waybills",
-        lazy="joined",
+        lazy="raise",
     )
     order: Mapped["Order"] = relationship(
         "Order",
@@ -48,7 +48,7 @@ class Waybill(Base):
         uselist=True,
     )
     waybill_offers: Mapped[list["WaybillOffer"]] = relationship(
-        "WaybillOffer", back_populates="waybill", lazy="selectin"
+        "WaybillOffer", back_populates="waybill", lazy="raise"
     )
     user_balance_history: Mapped[list["UserBalanceHistory"]] = relationship(
         "UserBalanceHistory", back_populates="waybill", lazy="noload"
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, Integer, Numeric, String
+from sqlalchemy import BigInteger, ForeignKey, Identity, Index, Integer, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base, uuid_pk
@@ -21,6 +21,8 @@ class WaybillOffer(Base):
     waybill_id: Mapped[UUID] = mapped_column(ForeignKey("waybills.id"), nullable=False)
     offer_id: Mapped[UUID] = mapped_column(ForeignKey("offers.id"), nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    # insertion order: the lines of one request share created_at
+    position: Mapped[int] = mapped_column(BigInteger, Identity(), nullable=False)
 
     # Snapshot fields
     brand: Mapped[str] = mapped_column(String, nullable=False)
@@ -29,8 +31,14 @@ class WaybillOffer(Base):
 
     # Relationships
     waybill: Mapped["Waybill"] = relationship(
-        "Waybill", back_populates="waybill_offers", lazy="joined"
+        "Waybill", back_populates="waybill_offers", lazy="raise"
     )
     offer: Mapped["Offer"] = relationship(
-        "Offer", back_populates="waybill_offers", lazy="selectin"
+        "Offer", back_populates="waybill_offers", lazy="raise"
+    )
+
+    # Indexes
+    __table_args__ = (
+        # lines of a waybill in document order (WaybillOfferDAO.find_by_waybill)
+        Index("ix_waybill_offers_waybill_id_position", "waybill_id", "position"),
     )
@@ -1,16 +1,64 @@
-from pydantic import BaseModel
+from datetime import date
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from src.schemas.common.enums import SalesGranularity, SalesGroupBy
 
 
 class CategoryFacet(BaseModel):
+    category_id: UUID
+    category_name: str
     category_slug: str
     product_count: int
+    offer_count: int = 0
 
 
 class SubCategoryFacet(BaseModel):
+    sub_category_id: UUID
+    sub_category_name: str
     sub_category_slug: str
+    category_id: UUID
     product_count: int
+    offer_count: int = 0
+
+
+class StockFacet(BaseModel):
+    in_stock: int = 0
+    out_of_stock: int = 0
+
+
+class ImageFacet(BaseModel):
+    with_image: int = 0
+    without_image: int = 0
 
 
 class ProductFacetsSchema(BaseModel):
+    """
+    Offer counts are used for stock/image facets - same semantics as `OfferDAO.count_all`
+    """
+
+    total_products: int = 0
+    total_offers: int = 0
     categories: list[CategoryFacet]
     sub_categories: list[SubCategoryFacet]
+    stock: StockFacet = Field(default_factory=StockFacet)
+    image: ImageFacet = Field(default_factory=ImageFacet)
+
+
+class SalesPointSchema(BaseModel):
+    period: date
+    key: str
+    label: str
+    sold: int
+    revenue: float
+
+
+class SalesReportSchema(BaseModel):
+    group_by: SalesGroupBy
+    granularity: SalesGranularity
+    date_from: date
+    date_to: date
+    total_sold: int
+    total_revenue: float
+    points: list[SalesPointSchema]
@@ -19,7 +19,7 @@ class _AuditLogBaseSchema(BaseModel):
     user_id: UUID
     method: Method | str
     endpoint: HttpUrl | str
-    payload: dict | None = None
+    payload: dict | list | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,32 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from src.schemas.common.enums import CustomerType
+
+
+class CartItemSchema(BaseModel):
+    offer_id: UUID
+    qty: int = Field(..., gt=0, examples=[2])
+
+
+class CartQuoteLineSchema(BaseModel):
+    offer_id: UUID
+    name: str = Field(..., examples=["Колодки тормозные передние"])
+    brand: str = Field(..., examples=["MARKON"])
+    manufacturer_number: str = Field(..., examples=["6000180"])
+    price_rub: int = Field(..., examples=[1000])
+    qty: int = Field(..., examples=[2])
+    # stock left at quote time, the line is short if available < qty
+    available: int = Field(..., examples=[5])
+    in_stock: bool = Field(..., examples=[True])
+    line_total_rub: int = Field(..., examples=[2000])
+
+
+class CartQuoteSchema(BaseModel):
+    customer_type: CustomerType
+    lines: list[CartQuoteLineSchema]
+    # offers that were deleted or never existed
+    missing: list[UUID] = Field(default_factory=list)
+    total_rub: int = Field(..., examples=[2000])
+    is_available: bool = Field(..., examples=[True])
@@ -11,6 +11,7 @@ from pydantic import (
 from slugify import slugify
 
 from config import settings
+from src.schemas.common.enums import ImageStatus
 
 
 class _CategoryBaseSchema(BaseModel):
@@ -23,6 +24,7 @@ class CategorySchema(_CategoryBaseSchema):
     id: UUID
     slug: str = Field(..., examples=["svechi-ford"])
     image_url: str = Field(..., examples=[settings.IMAGE_PLACEHOLDER_URL])
+    image_status: ImageStatus = Field(..., examples=[ImageStatus.READY])
 
 
 class CategoryPostSchema(_CategoryBaseSchema):
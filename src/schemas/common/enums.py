@@ -63,6 +63,85 @@ class PriceListExt(StrEnum):
     CSV = "csv"
 
 
+class ImageStatus(StrEnum):
+    PENDING = "PENDING"  # stored locally, waiting for the S3 upload
+    READY = "READY"
+    FAILED = "FAILED"
+
+
+class ImageVariant(StrEnum):
+    THUMB = "thumb"
+    CARD = "card"  # catalogue grids
+    FULL = "full"
+
+
+class JobName(StrEnum):
+    PRICE_LIST = "price_list"
+    YML_FEED = "yml_feed"
+    PRICE_MAIL = "price_mail"
+    PRICING_EMAIL = "pricing_email"
+    EMAIL_CAMPAIGN = "email_campaign"
+    ORDER_EMAIL = "order_email"
+    OUTBOX_CLEANUP = "outbox_cleanup"
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"  # also waiting for a retry
+    IN_PROGRESS = "in_progress"
+    COMPLETE = "complete"
+    FAILED = "failed"  # out of retries
+
+
+class CampaignStatus(StrEnum):
+    QUEUED = "QUEUED"
+    SENDING = "SENDING"
+    DONE = "DONE"
+
+
+class DeliveryStatus(StrEnum):
+    SENT = "SENT"
+    FAILED = "FAILED"  # retried when the campaign is run again
+
+
+class OutboxTopic(StrEnum):
+    WAYBILL_COMMITTED = "WAYBILL_COMMITTED"
+    ORDER_CREATED = "ORDER_CREATED"
+    OFFER_PRICE_CHANGED = "OFFER_PRICE_CHANGED"
+
+
 class PriceListType(StrEnum):
     RETIAL = "retail"
     WHOLESALE = "wholesale"
+
+
+class StatementGranularity(StrEnum):
+    DAY = "day"
+    MONTH = "month"
+
+
+class SalesWindow(StrEnum):
+    WEEK = "7d"
+    MONTH = "30d"
+    ALL = "all"
+
+    @property
+    def days(self) -> int | None:
+        return {SalesWindow.WEEK: 7, SalesWindow.MONTH: 30}.get(self)
+
+
+class SalesGroupBy(StrEnum):
+    PRODUCT = "product"
+    BRAND = "brand"
+    SUB_CATEGORY = "sub_category"
+    CUSTOMER_TYPE = "customer_type"
+
+
+class SalesGranularity(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class ListView(StrEnum):
+    FULL = "full"
+    COMPACT = "compact"
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from src.schemas.common.enums import CampaignStatus, DeliveryStatus
+
+
+class EmailCampaignSchema(BaseModel):
+    id: UUID
+    subject: str
+    template: str
+    context: dict[str, Any]
+    status: CampaignStatus
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EmailCampaignStartedSchema(BaseModel):
+    campaign: EmailCampaignSchema
+    job_id: str
+
+
+class EmailCampaignReportSchema(EmailCampaignSchema):
+    # recipients per delivery status
+    outcomes: dict[DeliveryStatus, int]
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+from src.schemas.common.enums import JobName, JobStatus
+
+
+class JobEnqueueSchema(BaseModel):
+    kwargs: dict[str, Any] = {}
+    # the same key is queued once until the job has finished
+    key: str | None = None
+    defer_by: float = 0
+
+
+class JobSchema(BaseModel):
+    id: str
+    name: JobName
+    status: JobStatus
+    tries: int
+    kwargs: dict[str, Any] = {}
+    enqueued_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: Any = None
+    error: str | None = None
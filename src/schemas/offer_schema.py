@@ -13,7 +13,8 @@ from pydantic import (
 from pydantic_core.core_schema import ValidationInfo
 
 from config import settings
-from src.schemas.product_schema import ProductSchema
+from src.schemas.common.enums import ImageStatus, ImageVariant
+from src.schemas.product_schema import IMAGE_VARIANTS_EXAMPLE, ProductSchema
 
 
 class _OfferBase(BaseModel):
@@ -37,13 +38,23 @@ class OfferSchema(_OfferBase):
     quantity: int = Field(..., examples=[2])
     product: ProductSchema
     is_deleted: bool = Field(..., examples=[False])
+    version: int = Field(..., examples=[1])
 
     image_url: HttpUrl | str = Field(..., examples=[settings.IMAGE_PLACEHOLDER_URL])
+    image_status: ImageStatus = Field(..., examples=[ImageStatus.READY])
+    image_variants: dict[str, str] | None = Field(
+        None, examples=[IMAGE_VARIANTS_EXAMPLE]
+    )
 
     @field_validator("image_url", mode="before")
     def _default_image(cls, v: HttpUrl | str, values: ValidationInfo) -> str:
         product: ProductSchema | None = values.data.get("product")
-        fallback_image_url = product.image_url or settings.IMAGE_PLACEHOLDER_URL
+        # grid-sized variant of the product image rather than its original
+        fallback_image_url = (
+            (product.image_variants or {}).get(ImageVariant.CARD)
+            or product.image_url
+            or settings.IMAGE_PLACEHOLDER_URL
+        )
 
         # TODO: discuss the default image logic (what should be a fallback)
         return v if v else fallback_image_url
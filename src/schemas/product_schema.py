@@ -13,7 +13,13 @@ from pydantic import (
 from slugify import slugify
 
 from src.config import settings
+from src.schemas.common.enums import ImageStatus
 from src.schemas.sub_category_schema import SubCategorySchema
+from src.utils.image_variants import variant_urls
+
+IMAGE_VARIANTS_EXAMPLE = variant_urls(
+    "https://storage.yandexcloud.net/tcf-images/images/tmp/9f1c.png"
+)
 
 
 class _ProductBase(BaseModel):
@@ -35,8 +41,14 @@ class ProductSchema(_ProductBase):
     sub_category: SubCategorySchema
 
     is_deleted: bool = Field(..., examples=[False])
+    version: int = Field(..., examples=[1])
 
     image_url: HttpUrl = Field(..., examples=[settings.IMAGE_PLACEHOLDER_URL])
+    image_status: ImageStatus = Field(..., examples=[ImageStatus.READY])
+    # resized WebP copies, None until uploaded (or for images uploaded before them)
+    image_variants: dict[str, str] | None = Field(
+        None, examples=[IMAGE_VARIANTS_EXAMPLE]
+    )
 
     @field_validator("image_url", mode="before")
     def _default_image(cls, v: str | None) -> str:
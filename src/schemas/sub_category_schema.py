@@ -14,6 +14,7 @@ from slugify import slugify
 
 from src.config import settings
 from src.schemas.category_schema import CategorySchema
+from src.schemas.common.enums import ImageStatus
 
 
 class _SubCategoryBase(BaseModel):
@@ -27,6 +28,7 @@ class SubCategorySchema(_SubCategoryBase):
     id: UUID
     slug: str = Field(..., examples=["svechi-zazhiganiia"])
     image_url: HttpUrl = Field(..., examples=[settings.IMAGE_PLACEHOLDER_URL])
+    image_status: ImageStatus = Field(..., examples=[ImageStatus.READY])
 
     category: CategorySchema
 
@@ -1,9 +1,13 @@
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
-from src.schemas.common.enums import Currency, UserBalanceChangeReason
+from src.schemas.common.enums import (
+    Currency,
+    StatementGranularity,
+    UserBalanceChangeReason,
+)
 from src.schemas.waybill_schema import WaybillSchema
 
 
@@ -28,3 +32,27 @@ class UserBalanceHistorySchema(_UserBalanceHistoryBaseSchema):
 
 class UserBalanceHistoryPostSchema(_UserBalanceHistoryBaseSchema):
     pass
+
+
+class UserBalanceMovementSchema(BaseModel):
+    period: date
+    opening_balance: int
+    closing_balance: int
+    credit: int
+    debit: int
+    movements: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserBalanceStatementSchema(BaseModel):
+    user_id: UUID
+    currency: Currency
+    date_from: date
+    date_to: date
+    granularity: StatementGranularity
+    opening_balance: int
+    closing_balance: int
+    total_credit: int
+    total_debit: int
+    movements: list[UserBalanceMovementSchema]
@@ -9,7 +9,7 @@ from pydantic import (
 
 from src.schemas.common.enums import WaybillType
 from src.schemas.user_schema import UserSchema
-from src.schemas.waybill_offer_schema import WaybillOfferPostSchema
+from src.schemas.waybill_offer_schema import WaybillOfferPostSchema, WaybillOfferSchema
 
 
 class _WaybillBaseSchema(BaseModel):
@@ -29,10 +29,17 @@ class WaybillSchema(_WaybillBaseSchema):
 
     created_at: datetime
     updated_at: datetime
+    # send as If-Match on PATCH
+    version: int = Field(..., examples=[1])
 
     # offers: list[OfferSchema]
 
 
+# GET /waybills/{id}/full: header + lines in document order
+class WaybillDetailSchema(WaybillSchema):
+    waybill_offers: list[WaybillOfferSchema]
+
+
 class WaybillPostSchema(_WaybillBaseSchema):
     author_id: UUID
 
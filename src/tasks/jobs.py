@@ -0,0 +1,102 @@
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from src.api.core.integrations import YML_FEED_KEY, build_yml
+from src.api.dao.order_dao import OrderDAO
+from src.api.dao.outbox_dao import OutboxDAO
+from src.api.di.db_helper import db_helper
+from src.api.services.email_campaign_service import EmailCampaignService
+from src.api.services.price_list_service import PriceListService
+from src.common.services.job_queue import CronJob, JobDefinition
+from src.config import settings
+from src.schemas.common.enums import JobName, PriceListExt, PriceListType
+from src.tasks.mailing import send_order_email, send_price_mail, send_pricing_email
+from src.tasks.mailing.smtp_pool import SMTPPool
+
+# ctx: {"redis": Redis, "s3": S3Service}, set up by `python -m src.worker`
+
+
+async def price_list(ctx: dict[str, Any], day: str | None = None) -> dict[str, str]:
+    """
+    Build and upload all price list variants, returns their URLs
+    """
+    day = date.fromisoformat(day) if day else date.today()
+    async with db_helper.AsyncSessionFactory() as session:
+        urls = await PriceListService.publish(session, ctx["s3"], day)
+    return {f"{_type}_{_ext}": url for (_ext, _type), url in urls.items()}
+
+
+async def yml_feed(ctx: dict[str, Any]) -> dict[str, int]:
+    """
+    Rebuild the Yandex feed served by GET /integrations/yml
+    """
+    async with db_helper.AsyncSessionFactory() as session:
+        xml = await build_yml(session)
+    await ctx["redis"].set(YML_FEED_KEY, xml)
+    return {"size": len(xml)}
+
+
+async def price_mail(ctx: dict[str, Any], recipient: str) -> dict:
+    key = PriceListService.get_key(
+        PriceListExt.EXCEL, PriceListType.RETIAL, date.today()
+    )
+    return await send_price_mail(recipient, ctx["s3"].get_file_url(key))
+
+
+async def pricing_email(ctx: dict[str, Any], email: str) -> None:
+    await send_pricing_email(email)
+
+
+async def email_campaign(ctx: dict[str, Any], campaign_id: str) -> dict[str, int]:
+    """
+    Send the campaign; a retry resumes it from the recipients not reached yet
+    """
+    async with SMTPPool() as pool:
+        counts = await EmailCampaignService.run(UUID(campaign_id), pool)
+    return {str(status): count for status, count in counts.items()}
+
+
+async def order_email(ctx: dict[str, Any], order_id: str) -> None:
+    """
+    Order confirmation, queued by the outbox dispatcher (ORDER_CREATED)
+    """
+    async with db_helper.AsyncSessionFactory() as session:
+        order = await OrderDAO.find_by_id(session, UUID(order_id))
+    if order is None:
+        return  # deleted since
+    await send_order_email(order)
+
+
+async def outbox_cleanup(ctx: dict[str, Any]) -> dict[str, int]:
+    async with db_helper.AsyncSessionFactory() as session, session.begin():
+        deleted = await OutboxDAO.delete_processed(
+            session, settings.WORKER.OUTBOX_RETENTION_DAYS
+        )
+    return {"deleted": deleted}
+
+
+JOBS: dict[str, JobDefinition] = {
+    JobName.PRICE_LIST: JobDefinition(price_list, max_tries=3, timeout=30 * 60),
+    JobName.YML_FEED: JobDefinition(yml_feed, max_tries=3, timeout=10 * 60),
+    JobName.PRICE_MAIL: JobDefinition(
+        price_mail, max_tries=5, concurrency=5, timeout=60
+    ),
+    JobName.PRICING_EMAIL: JobDefinition(
+        pricing_email, max_tries=5, concurrency=5, timeout=60
+    ),
+    JobName.ORDER_EMAIL: JobDefinition(
+        order_email, max_tries=5, concurrency=5, timeout=60
+    ),
+    JobName.OUTBOX_CLEANUP: JobDefinition(outbox_cleanup, max_tries=3, timeout=10 * 60),
+    # one campaign at a time: the SMTP pool is the send rate limit
+    JobName.EMAIL_CAMPAIGN: JobDefinition(
+        email_campaign, max_tries=3, concurrency=1, timeout=2 * 60 * 60
+    ),
+}
+
+CRON_JOBS: tuple[CronJob, ...] = (
+    CronJob(JobName.PRICE_LIST, hour=settings.WORKER.PRICE_LIST_HOUR),
+    CronJob(JobName.YML_FEED, minute=settings.WORKER.YML_FEED_MINUTE),
+    CronJob(JobName.OUTBOX_CLEANUP, minute=30, hour=4),
+)
@@ -1,9 +1,13 @@
 __all__ = [
+    "send_order_email",
+    "send_price_mail",
     "send_pricing_email",
     "send_verification_email",
     "send_welcome_email",
 ]
 
+from .send_order_email import send_order_email
+from .send_price_mail import send_price_mail
 from .send_pricing_email import send_pricing_email
 from .send_verification_email import send_verification_email
 from .send_welcome_email import send_welcome_email
@@ -7,18 +7,15 @@ from src.config import settings
 from src.utils.logging import logger
 
 
-async def send_email(
+def build_message(
     recipient: EmailStr | str,
     subject: str,
     body: str,
     html: str | None = None,
-):
-    recipient = str(recipient)
-    admin_email = settings.SMTP.SMTP_USER
-
+) -> EmailMessage:
     message = EmailMessage()
-    message["From"] = admin_email
-    message["To"] = recipient
+    message["From"] = settings.SMTP.SMTP_USER
+    message["To"] = str(recipient)
     message["Subject"] = subject
 
     # Plain text (fallback)
@@ -26,9 +23,23 @@ async def send_email(
 
     if html:  # HTML Rendered override
         message.add_alternative(html, subtype="html")
+    return message
+
+
+async def send_email(
+    recipient: EmailStr | str,
+    subject: str,
+    body: str,
+    html: str | None = None,
+):
+    """
+    One-off message over its own connection; bulk mail goes through SMTPPool.
+    """
+    recipient = str(recipient)
+    admin_email = settings.SMTP.SMTP_USER
 
     await aiosmtplib.send(
-        message,
+        build_message(recipient, subject, body, html),
         sender=admin_email,
         recipients=[recipient],
         hostname=settings.SMTP.SMTP_HOST,
@@ -0,0 +1,20 @@
+from src.models import Order
+from src.tasks.mailing.send_email import send_email
+from src.tasks.mailing.templates import mail_templates
+
+ORDER_EMAIL_TEMPLATE = "order_created.html"
+ORDER_EMAIL_SUBJECT = "Заказ принят - ТЦ Форд Севастополь"
+
+
+async def send_order_email(order: Order) -> None:
+    """
+    Order confirmation; `order` with its lines loaded
+    """
+    html = mail_templates.get_template(ORDER_EMAIL_TEMPLATE).render(order=order)
+    body = f"{order.first_name}, спасибо за заказ! Сумма: {order.total_sum:.2f} ₽"
+    await send_email(
+        recipient=order.email,
+        subject=ORDER_EMAIL_SUBJECT,
+        body=body,
+        html=html,
+    )
@@ -0,0 +1,26 @@
+import asyncio
+
+import resend
+
+from src.config import settings
+from src.tasks.mailing.send_pricing_email import PRICING_EMAIL_TEMPLATE
+from src.tasks.mailing.templates import mail_templates
+from src.utils.logging import logger
+
+resend.api_key = settings.SMTP.RESEND_API_KEY
+
+
+async def send_price_mail(recipient: str, pricelist_url: str) -> dict:
+    html = mail_templates.get_template(PRICING_EMAIL_TEMPLATE).render(
+        pricelist_url=pricelist_url
+    )
+    params: resend.Emails.SendParams = {
+        "from": "info@info.eucalytics.uk",
+        "to": [f"{recipient}@gmail.com"],
+        "subject": "ТЦ Форд - рассылка",
+        "html": html,
+    }
+    # the resend client is synchronous
+    email: resend.Email = await asyncio.to_thread(resend.Emails.send, params)
+    logger.info("Price mail was sent to %r", recipient)
+    return email
@@ -1,20 +1,11 @@
-from pathlib import Path
-
 from pydantic import EmailStr
 
 from src.tasks.mailing.send_email import send_email
+from src.tasks.mailing.templates import mail_templates
 
-templates_path = Path("templates")
-
-
-async def send_pricing_email(email: EmailStr | str) -> None:
-    with open(templates_path / "pricing_email.html", "r", encoding="utf-8") as file:
-        html = file.read()
-
-    await send_email(
-        recipient=email,
-        subject="Рассылка прайсов - ТЦ Форд Севастополь",
-        body="""
+PRICING_EMAIL_TEMPLATE = "pricing_email.html"
+PRICING_EMAIL_SUBJECT = "Рассылка прайсов - ТЦ Форд Севастополь"
+PRICING_EMAIL_BODY = """
         Рассылка оптового прайс-листа от ford-parts.com.ru
 
         Скачать прайс-лист можно здесь: Прайс-лист ОПТ
@@ -26,6 +17,18 @@ async def send_pricing_email(email: EmailStr | str) -> None:
 
         E‑MAIL
         fordsevas@yandex.ru
-        """,
+        """
+
+
+async def send_pricing_email(
+    email: EmailStr | str, pricelist_url: str | None = None
+) -> None:
+    html = mail_templates.get_template(PRICING_EMAIL_TEMPLATE).render(
+        pricelist_url=pricelist_url
+    )
+    await send_email(
+        recipient=email,
+        subject=PRICING_EMAIL_SUBJECT,
+        body=PRICING_EMAIL_BODY,
         html=html,
     )
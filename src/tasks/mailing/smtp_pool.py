@@ -0,0 +1,93 @@
+import asyncio
+import time
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from src.config import settings
+from src.utils.logging import logger
+
+
+class SMTPPool:
+    """
+    Persistent SMTP sessions for bulk sending:
+    - `size` sessions, each connected (STARTTLS + login) once and reused
+    - reopened after `messages_per_connection` messages (server-side limits)
+      or when the server has dropped them
+    - throttled to `rate_limit` messages per second over all sessions
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        rate_limit: float | None = None,
+        messages_per_connection: int | None = None,
+    ) -> None:
+        self.size = size or settings.SMTP.SMTP_POOL_SIZE
+        self.rate_limit = rate_limit or settings.SMTP.SMTP_RATE_LIMIT
+        self.messages_per_connection = (
+            messages_per_connection or settings.SMTP.SMTP_MESSAGES_PER_CONNECTION
+        )
+        self._idle: asyncio.Queue[aiosmtplib.SMTP] = asyncio.Queue()
+        self._sent: dict[aiosmtplib.SMTP, int] = {}
+        self._throttle = asyncio.Lock()
+        self._next_slot = 0.0
+
+        for _ in range(self.size):
+            smtp = aiosmtplib.SMTP(
+                hostname=settings.SMTP.SMTP_HOST,
+                port=settings.SMTP.SMTP_PORT,
+                username=settings.SMTP.SMTP_USER,
+                password=settings.SMTP.SMTP_PASS,
+                start_tls=True,
+            )
+            self._sent[smtp] = 0
+            self._idle.put_nowait(smtp)
+
+    async def __aenter__(self) -> "SMTPPool":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for smtp in self._sent:
+            if smtp.is_connected:
+                try:
+                    await smtp.quit()
+                except aiosmtplib.SMTPException:
+                    smtp.close()
+
+    async def _wait_for_slot(self) -> None:
+        async with self._throttle:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + 1 / self.rate_limit
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _session(self, smtp: aiosmtplib.SMTP) -> aiosmtplib.SMTP:
+        if smtp.is_connected and self._sent[smtp] >= self.messages_per_connection:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+        if not smtp.is_connected:
+            await smtp.connect()
+            self._sent[smtp] = 0
+        return smtp
+
+    async def send(self, message: EmailMessage) -> None:
+        await self._wait_for_slot()
+        smtp = await self._idle.get()
+        try:
+            try:
+                await (await self._session(smtp)).send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # dropped while idle: reconnect once
+                logger.info("[SMTP] Session dropped, reconnecting")
+                smtp.close()
+                await (await self._session(smtp)).send_message(message)
+            self._sent[smtp] += 1
+        finally:
+            self._idle.put_nowait(smtp)
@@ -0,0 +1,8 @@
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+# compiled templates are cached by the environment: loaded from disk once
+mail_templates = Environment(
+    loader=FileSystemLoader("templates"),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
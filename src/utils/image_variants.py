@@ -0,0 +1,46 @@
+import io
+
+from PIL import Image, ImageOps
+
+from src.schemas.common.enums import ImageVariant
+
+# longest side, px: originals smaller than that are not upscaled
+IMAGE_VARIANT_SIZES = {
+    ImageVariant.THUMB: 160,
+    ImageVariant.CARD: 480,
+    ImageVariant.FULL: 1600,
+}
+WEBP_QUALITY = 80
+
+
+def variant_key(key: str, variant: ImageVariant) -> str:
+    """
+    images/tmp/<uuid>.png -> images/tmp/<uuid>/card.webp
+    Works on object keys and on their public URLs alike.
+    """
+    stem = key.rsplit(".", 1)[0] if "." in key.rsplit("/", 1)[-1] else key
+    return f"{stem}/{variant}.webp"
+
+
+def variant_urls(image_url: str) -> dict[str, str]:
+    return {variant.value: variant_key(image_url, variant) for variant in ImageVariant}
+
+
+def render_variants(path: str) -> dict[ImageVariant, bytes]:
+    """
+    Resize the image at `path` to every variant and encode it as WebP.
+    CPU-bound: run it in a process pool (ImageUploadQueue).
+    """
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        variants = {}
+        for variant, size in IMAGE_VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+            variants[variant] = buffer.getvalue()
+        return variants
@@ -1,7 +1,12 @@
-from typing import TypeVar
+import math
+import uuid
+from decimal import Decimal
+from typing import Any, Sequence, TypeVar
 
+import orjson
 from fastapi import Query
-from fastapi_pagination import Page
+from fastapi.responses import ORJSONResponse
+from fastapi_pagination import Page, resolve_params
 from fastapi_pagination.customization import CustomizedPage, UseParamsFields
 
 T = TypeVar("T")
@@ -13,3 +18,43 @@ Page = CustomizedPage[
         size=Query(300, ge=1, le=500),
     ),
 ]
+
+
+def _default(value: Any) -> Any:
+    # asyncpg returns its own UUID subclass (orjson only takes uuid.UUID exactly)
+    # and Decimal for Numeric columns
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class RowJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_page(
+    items: Sequence[dict[str, Any]], total: int, headers: dict[str, str] | None = None
+) -> RowJSONResponse:
+    """
+    Page payload for plain dict rows (compact views, compiled serializers),
+    serialized by orjson directly: no response_model validation, same shape as Page.
+    """
+    params = resolve_params()
+    return RowJSONResponse(
+        {
+            "items": items,
+            "total": total,
+            "page": params.page,
+            "size": params.size,
+            "pages": math.ceil(total / params.size) if params.size else 0,
+        },
+        headers=headers,
+    )
+
+
+def current_limit_offset() -> tuple[int, int]:
+    raw = resolve_params().to_raw_params().as_limit_offset()
+    return raw.limit, raw.offset
@@ -0,0 +1,121 @@
+import types
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Mapping, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+Row = Any
+Dumper = Callable[[Row], Any]
+
+
+class _ValidationInfo:
+    """
+    Stand-in for pydantic's ValidationInfo in `field_validator(mode="before")`:
+    `data` holds the raw (ORM) values of the fields declared before.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: dict[str, Any]):
+        self.data = data
+
+
+def _scalar(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    Coercions that orjson can't do on its own (Numeric columns come as Decimal).
+    Everything else (UUID, datetime, enums, str, int) is serialized natively.
+    """
+    if annotation is float:
+        return lambda v: float(v) if isinstance(v, Decimal) else v
+    if annotation is int:
+        return lambda v: int(v) if isinstance(v, Decimal) else v
+    return None
+
+
+def _compile_field(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    Value converter for a field annotation, None if the value is passed as is.
+    Handles nested models, `X | None` and `list[X]`.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return compile_serializer(annotation)
+
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        # only `X | None` is supported, other unions are passed as is
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1 and (inner := _compile_field(args[0])):
+            return lambda v: None if v is None else inner(v)
+        return None
+
+    if origin in (list, tuple, set, frozenset):
+        (item,) = get_args(annotation)[:1] or (Any,)
+        if inner := _compile_field(item):
+            return lambda v: [inner(i) for i in v]
+        return list
+
+    return _scalar(annotation)
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(schema: type[BaseModel]) -> Dumper:
+    """
+    Build a row -> dict function for a response schema once, from its metadata.
+    The result is what FastAPI would send for `response_model=schema`
+    (by alias, computed fields included), without validating the row.
+
+    - `field_validator(mode="before")` run on the raw ORM value
+      (e.g. image fallbacks), other validator modes are not supported
+    - `computed_field` properties are evaluated on the row itself
+    - input constraints (min_length, gt, ...) are not checked: rows come from the DB
+    """
+    validators: dict[str, list[Callable]] = {}
+    for decorator in schema.__pydantic_decorators__.field_validators.values():
+        if decorator.info.mode != "before":
+            raise TypeError(
+                f"{schema.__name__}: only mode='before' validators are supported"
+            )
+        for field in decorator.info.fields:
+            # bound to the schema class by pydantic, unwrap to call with `schema`
+            func = getattr(decorator.func, "__func__", decorator.func)
+            validators.setdefault(field, []).append(func)
+
+    steps: list[tuple[str, str, Callable[[Any], Any] | None, list[Callable]]] = []
+    for name, field in schema.model_fields.items():
+        key = field.serialization_alias or field.alias or name
+        steps.append(
+            (name, key, _compile_field(field.annotation), validators.get(name, []))
+        )
+
+    computed = [
+        (field.alias or name, field.wrapped_property.fget)
+        for name, field in schema.model_computed_fields.items()
+    ]
+
+    def dump(row: Row, overrides: Mapping[str, Any] | None = None) -> dict[str, Any]:
+        raw: dict[str, Any] = {}
+        out: dict[str, Any] = {}
+        for name, key, convert, field_validators in steps:
+            if overrides and name in overrides:
+                value = overrides[name]
+            else:
+                value = getattr(row, name)
+            raw[name] = value
+            for validator in field_validators:
+                value = _call_validator(schema, validator, value, raw)
+            out[key] = convert(value) if convert and value is not None else value
+        for key, fget in computed:
+            out[key] = fget(row)
+        return out
+
+    return dump
+
+
+def _call_validator(
+    schema: type[BaseModel], func: Callable, value: Any, raw: dict[str, Any]
+) -> Any:
+    # pydantic validators are classmethods: (cls, v) or (cls, v, info)
+    if func.__code__.co_argcount >= 3:
+        return func(schema, value, _ValidationInfo(raw))
+    return func(schema, value)
@@ -0,0 +1,51 @@
+import asyncio
+import signal
+
+from src.api.di.db_helper import db_helper
+from src.api.services.outbox_service import OutboxDispatcher
+from src.common.services.job_queue import JobQueue, Worker
+from src.common.services.redis_service import RedisService
+from src.common.services.s3_service import S3Service
+from src.config import settings
+from src.tasks.jobs import CRON_JOBS, JOBS
+from src.utils.logging import logger
+
+
+async def main() -> None:
+    logger.info("[!] Initializing worker resources...")
+    redis_service = RedisService()
+    s3 = S3Service(
+        access_key=settings.AWS.S3_ACCESS_KEY,
+        secret_key=settings.AWS.S3_SECRET_KEY,
+        region=settings.AWS.S3_DEFAULT_REGION,
+        endpoint=settings.AWS.S3_ENDPOINT_URL,
+        bucket=settings.AWS.S3_BUCKET_NAME,
+        max_pool_connections=settings.AWS.S3_MAX_POOL_CONNECTIONS,
+        keepalive_timeout=settings.AWS.S3_KEEPALIVE_TIMEOUT,
+        upload_concurrency=settings.AWS.S3_UPLOAD_CONCURRENCY,
+    )
+    await s3.open()
+
+    redis = redis_service.get_redis()
+    worker = Worker(redis, JOBS, CRON_JOBS, ctx={"s3": s3})
+    # post-commit side effects of the outbox events, fanned out to jobs and caches
+    dispatcher = OutboxDispatcher(redis, JobQueue(redis))
+
+    def stop() -> None:
+        worker.stop()
+        dispatcher.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+
+    try:
+        await asyncio.gather(worker.run(), dispatcher.run())
+    finally:
+        await redis_service.close()
+        await s3.close()
+        await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
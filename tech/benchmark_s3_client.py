@@ -0,0 +1,55 @@
+import asyncio
+import io
+import os
+import time
+
+from loguru import logger
+from src.common.services.s3_service import S3Service
+from src.config import settings
+
+UPLOADS = 50
+PAYLOAD = os.urandom(64 * 1024)  # a product image
+REMOTE_PATH = "tmp/benchmark/"
+
+
+def build_service() -> S3Service:
+    return S3Service(
+        access_key=settings.AWS.S3_ACCESS_KEY,
+        secret_key=settings.AWS.S3_SECRET_KEY,
+        region=settings.AWS.S3_DEFAULT_REGION,
+        endpoint=settings.AWS.S3_ENDPOINT_URL,
+        bucket=settings.AWS.S3_BUCKET_NAME,
+        max_pool_connections=settings.AWS.S3_MAX_POOL_CONNECTIONS,
+        keepalive_timeout=settings.AWS.S3_KEEPALIVE_TIMEOUT,
+        upload_concurrency=settings.AWS.S3_UPLOAD_CONCURRENCY,
+    )
+
+
+async def sequential_uploads(s3: S3Service) -> list[str]:
+    keys = []
+    for _ in range(UPLOADS):
+        key = s3.generate_key("image.png", REMOTE_PATH)
+        await s3.upload_file(io.BytesIO(PAYLOAD), key)
+        keys.append(key)
+    return keys
+
+
+# Sequential uploads (an image-heavy import): client per call vs the shared client
+async def benchmark_s3_client():
+    s3 = build_service()
+    for name in ("per-call", "shared"):
+        if name == "shared":
+            await s3.open()
+        start = time.perf_counter()
+        keys = await sequential_uploads(s3)
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"{name:>9}: {elapsed * 1000 / UPLOADS:.1f} ms / upload of {len(PAYLOAD)} B"
+        )
+        for key in keys:
+            await s3.remove_file(key)
+    await s3.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark_s3_client())
@@ -0,0 +1,101 @@
+import timeit
+import uuid
+from datetime import datetime
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from src.models import Category, Offer, Product, SubCategory
+from src.schemas.common.enums import ImageStatus
+from src.schemas.offer_schema import OfferSchema
+from src.utils.serializer import compile_serializer
+
+PAGE_SIZE = 300
+ROUNDS = 20
+
+
+def build_page() -> list[Offer]:
+    """
+    Transient ORM rows shaped like a GET /offers page: no database needed.
+    """
+    now = datetime.now()
+    category = Category(
+        id=uuid.uuid4(),
+        name="Тормозная система",
+        slug="brakes",
+        image_url="https://storage.yandexcloud.net/tcf-images/brakes.png",
+        image_status=ImageStatus.READY,
+    )
+    offers = []
+    for i in range(PAGE_SIZE):
+        sub_category = SubCategory(
+            id=uuid.uuid4(),
+            name=f"Колодки {i % 10}",
+            slug=f"pads-{i % 10}",
+            image_url=None,
+            image_status=ImageStatus.READY,
+            category_id=category.id,
+            category=category,
+            created_at=now,
+            updated_at=now,
+        )
+        product = Product(
+            id=uuid.uuid4(),
+            name=f"Колодки тормозные передние {i}",
+            slug=f"pads-front-{i}",
+            cross_number=f"CN-{i}",
+            image_url=None,
+            image_status=ImageStatus.READY,
+            is_deleted=False,
+            version=1,
+            sub_category_id=sub_category.id,
+            sub_category=sub_category,
+            created_at=now,
+            updated_at=now,
+        )
+        offers.append(
+            Offer(
+                id=uuid.uuid4(),
+                sku=f"AA-{i}",
+                brand="MARKON",
+                manufacturer_number=f"6000{i}",
+                internal_description=None,
+                price_rub=1000 + i,
+                super_wholesale_price_rub=500 + i,
+                quantity=i % 7,
+                is_deleted=False,
+                version=1,
+                image_url=None,
+                image_status=ImageStatus.READY,
+                product_id=product.id,
+                product=product,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    return offers
+
+
+def pydantic_page(rows: list[Offer]) -> bytes:
+    # what FastAPI does for response_model=Page[OfferSchema]
+    items = [OfferSchema.model_validate(row) for row in rows]
+    return orjson.dumps(jsonable_encoder(items))
+
+
+def compiled_page(rows: list[Offer]) -> bytes:
+    dump = compile_serializer(OfferSchema)
+    return orjson.dumps([dump(row) for row in rows])
+
+
+# Serialization cost of a 300-offer page: pydantic validation vs compiled serializer
+def benchmark_serializer():
+    rows = build_page()
+    assert orjson.loads(pydantic_page(rows)) == orjson.loads(compiled_page(rows))
+
+    for name, fn in (("pydantic", pydantic_page), ("compiled", compiled_page)):
+        best = min(timeit.repeat(lambda: fn(rows), number=1, repeat=ROUNDS))
+        logger.info(f"{name:>9}: {best * 1000:.2f} ms / {PAGE_SIZE} offers")
+
+
+if __name__ == "__main__":
+    benchmark_serializer()
@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+from datetime import timedelta
+
+from loguru import logger
+from src.api.di.db_helper import db_helper
+from src.api.services.image_gc_service import ImageGCService
+from src.common.services.redis_service import RedisService
+from src.common.services.s3_service import S3Service
+from src.config import settings
+
+
+# Remove bucket objects no category/sub-category/product/offer points at.
+# Dry run unless --apply: python -m tech.gc_images --apply --rate 2
+async def gc_images(args: argparse.Namespace):
+    s3 = S3Service(
+        access_key=settings.AWS.S3_ACCESS_KEY,
+        secret_key=settings.AWS.S3_SECRET_KEY,
+        region=settings.AWS.S3_DEFAULT_REGION,
+        endpoint=settings.AWS.S3_ENDPOINT_URL,
+        bucket=settings.AWS.S3_BUCKET_NAME,
+        max_pool_connections=settings.AWS.S3_MAX_POOL_CONNECTIONS,
+    )
+    redis_service = RedisService()
+    await s3.open()
+    try:
+        async with db_helper.AsyncSessionFactory() as session:
+            report = await ImageGCService.run(
+                session,
+                s3,
+                redis_service.get_redis(),
+                prefix=args.prefix,
+                dry_run=not args.apply,
+                min_age=timedelta(hours=args.min_age_hours),
+                rate_limit=args.rate,
+                concurrency=args.concurrency,
+                fence=timedelta(seconds=args.fence),
+            )
+    finally:
+        await s3.close()
+        await redis_service.close()
+        await db_helper.dispose()
+
+    mode = "Удалено" if args.apply else "Dry run, к удалению"
+    logger.success(
+        f"✅ {mode}: {report.deleted if args.apply else report.orphans} "
+        f"из {report.listed} объектов ({report.orphan_bytes / 2**20:.1f} MiB сирот)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prefix", default="images/")
+    parser.add_argument("--apply", action="store_true", help="delete, not just report")
+    parser.add_argument("--min-age-hours", type=float, default=24)
+    parser.add_argument("--rate", type=float, help="DeleteObjects requests per second")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel listings")
+    parser.add_argument(
+        "--fence", type=float, default=30, help="seconds before re-check"
+    )
+    asyncio.run(gc_images(parser.parse_args()))
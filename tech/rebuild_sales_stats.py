@@ -0,0 +1,18 @@
+import asyncio
+
+from loguru import logger
+from src.api.di.db_helper import db_helper
+from src.api.services.analytical_service import AnalyticalService
+
+
+# Backfill / repair `product_sales_stats` from committed WAYBILL_OUT waybills
+async def rebuild_sales_stats():
+    async with db_helper.AsyncSessionFactory() as session, session.begin():
+        buckets = await AnalyticalService.rebuild_sales_stats(session)
+
+    logger.success(f"✅ Пересчитано {buckets} дневных бакетов продаж")
+    await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_sales_stats())
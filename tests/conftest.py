@@ -12,7 +12,7 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import insert
-from src.common.services.s3_service import S3Service
+from src.api.services.catalogue_service import catalogue_service
 from src.config import settings
 from src.models import Category, Offer, Product, SubCategory, User
 from src.models.base import Base
@@ -135,6 +135,9 @@ async def setup_test_db(patch_db):
                 await session.execute(insert(model).values(data))
         await session.commit()
 
+    # the DB is re-seeded per test, drop the in-process category tree as well
+    catalogue_service.invalidate()
+
 
 # -------------------------------
 # 🧪 Client for HTTP testing
@@ -142,6 +145,36 @@ async def setup_test_db(patch_db):
 mock.patch("fastapi_cache.decorator.cache", lambda *args, **kwargs: lambda f: f).start()
 
 
+async def compute_through(*args, compute, validators=None, not_modified=None, **kwargs):
+    """
+    ResponseCache.get_or_compute that always misses: validators, then compute
+    """
+    from src.common.services.response_cache import ResponseCache
+
+    headers = await validators() if validators else {}
+    if not_modified and (res := not_modified(headers)):
+        return res
+    body = ResponseCache._body(await compute())
+    return ResponseCache._response(body, "MISS", headers)
+
+
+response_cache_patch = mock.patch(
+    "src.common.services.response_cache.ResponseCache.get_or_compute",
+    compute_through,
+)
+response_cache_patch.start()
+
+
+@pytest.fixture
+def response_cache():
+    """
+    The real ResponseCache.get_or_compute, computed through for the other tests
+    """
+    response_cache_patch.stop()
+    yield
+    response_cache_patch.start()
+
+
 @pytest.fixture(scope="session")
 async def client() -> AsyncGenerator[AsyncClient, None]:
     from src.__main__ import app
@@ -157,13 +190,7 @@ async def client() -> AsyncGenerator[AsyncClient, None]:
         # app.state.resources = ResourceModule(redis_service=RedisService())
         # app.state.redis_service = app.state.resources.get_redis_service()
         # app.state.redis = app.state.redis_service.get_redis()
-        app.state.s3 = S3Service(
-            access_key=settings.AWS.S3_ACCESS_KEY,
-            secret_key=settings.AWS.S3_SECRET_KEY,
-            region=settings.AWS.S3_DEFAULT_REGION,
-            endpoint=settings.AWS.S3_ENDPOINT_URL,
-            bucket=settings.AWS.S3_BUCKET_NAME,
-        )
+        # app.state.s3 is opened by the lifespan
         yield test_client
 
 
@@ -0,0 +1,246 @@
+from collections import Counter
+from datetime import date
+
+from httpx import AsyncClient
+from sqlalchemy import insert, select, update
+from src.api.di import db_helper
+from src.api.services.facet_service import FACETS_CACHE_KEY, FacetService
+from src.config import settings
+from src.models import Offer, Product, ProductSalesStat, SubCategory
+
+
+class TestAnalyticsRoutes:
+    ENDPOINT = "/analytics"
+    offer_id = "d33d0aad-6f47-47ea-b170-c5980a78a263"
+    product_id = "a488d937-346b-4fb5-ac87-cfadf1a7a3ec"
+    sub_category_id = "62d84dd0-4275-4784-8c01-5b6a0be9fe2c"
+
+    async def commit_waybill(
+        self,
+        client: AsyncClient,
+        lines: list[tuple[str, int]],
+        waybill_type: str = "WAYBILL_OUT",
+    ) -> float:
+        """
+        Returns the line price: lines are re-priced for the customer
+        """
+        res = await client.post(
+            "/waybills",
+            json={
+                "waybill_type": waybill_type,
+                "is_pending": True,
+                "waybill_offers": [
+                    {
+                        "offer_id": self.offer_id,
+                        "brand": brand,
+                        "manufacturer_number": f"{brand}-1",
+                        "quantity": quantity,
+                        "price_rub": 100,
+                    }
+                    for brand, quantity in lines
+                ],
+            },
+        )
+        assert res.status_code == 201, res.text
+        waybill_id = res.json()["id"]
+        res = await client.post(f"/waybills/{waybill_id}/commit")
+        assert res.status_code == 201, res.text
+        res = await client.get(f"/waybills/{waybill_id}/full")
+        return res.json()["waybill_offers"][0]["price_rub"]
+
+    @staticmethod
+    async def buckets() -> dict[str, tuple[int, float]]:
+        async with db_helper.db_helper.AsyncSessionFactory() as session:
+            rows = await session.scalars(select(ProductSalesStat))
+            return {row.brand: (row.sold, float(row.revenue)) for row in rows}
+
+    async def test_commit_upserts_todays_buckets(self, auth_client: AsyncClient):
+        # lines of the same bucket are folded into one row
+        price = await self.commit_waybill(
+            auth_client, [("BSG", 1), ("BSG", 2), ("FORD", 3)]
+        )
+        assert await self.buckets() == {"BSG": (3, 3 * price), "FORD": (3, 3 * price)}
+
+        # the next sale of the day adds to the existing bucket
+        await self.commit_waybill(auth_client, [("BSG", 1)])
+        # incoming goods are not sales
+        await self.commit_waybill(auth_client, [("BSG", 5)], "WAYBILL_IN")
+        assert await self.buckets() == {"BSG": (4, 4 * price), "FORD": (3, 3 * price)}
+
+        res = await auth_client.get(f"{self.ENDPOINT}/products/best-selling")
+        assert res.status_code == 200, res.text
+        [best] = res.json()
+        assert (best["sold"], best["revenue"]) == (7, 7 * price)
+
+    async def seed_buckets(self, *buckets: tuple[date, str, str, int]) -> None:
+        async with db_helper.db_helper.AsyncSessionFactory() as session:
+            await session.execute(
+                insert(ProductSalesStat).values(
+                    [
+                        {
+                            "day": day,
+                            "product_id": self.product_id,
+                            "brand": brand,
+                            "sub_category_id": self.sub_category_id,
+                            "customer_type": customer_type,
+                            "sold": sold,
+                            "revenue": sold * 100,
+                        }
+                        for day, brand, customer_type, sold in buckets
+                    ]
+                )
+            )
+            await session.commit()
+
+    async def test_sales_are_rebucketed_by_granularity(self, auth_client: AsyncClient):
+        await self.seed_buckets(
+            # Monday and Wednesday of the same week
+            (date(2026, 1, 5), "BSG", "USER_RETAIL", 1),
+            (date(2026, 1, 7), "BSG", "USER_WHOLESALE", 2),
+            (date(2026, 1, 7), "FORD", "USER_RETAIL", 5),
+            (date(2026, 1, 12), "BSG", "USER_RETAIL", 4),
+            # out of the period
+            (date(2026, 2, 2), "BSG", "USER_RETAIL", 8),
+        )
+        params = {"group_by": "brand", "from": "2026-01-01", "to": "2026-01-31"}
+
+        res = await auth_client.get(
+            f"{self.ENDPOINT}/sales", params={**params, "granularity": "week"}
+        )
+        assert res.status_code == 200, res.text
+        report = res.json()
+        # by period, the larger revenue first
+        assert [
+            (p["period"], p["key"], p["sold"], p["revenue"]) for p in report["points"]
+        ] == [
+            ("2026-01-05", "FORD", 5, 500),
+            ("2026-01-05", "BSG", 3, 300),
+            ("2026-01-12", "BSG", 4, 400),
+        ]
+        assert (report["total_sold"], report["total_revenue"]) == (12, 1200)
+
+        res = await auth_client.get(
+            f"{self.ENDPOINT}/sales",
+            params={**params, "group_by": "customer_type", "granularity": "month"},
+        )
+        points = {p["key"]: p["sold"] for p in res.json()["points"]}
+        assert points == {"USER_RETAIL": 10, "USER_WHOLESALE": 2}
+
+        res = await auth_client.get(
+            f"{self.ENDPOINT}/sales", params={**params, "group_by": "product"}
+        )
+        assert {p["label"] for p in res.json()["points"]} == {"2.0 ECOBOOST"}
+
+    async def test_sales_period_must_be_ordered(self, auth_client: AsyncClient):
+        res = await auth_client.get(
+            f"{self.ENDPOINT}/sales", params={"from": "2026-02-01", "to": "2026-01-01"}
+        )
+        assert res.status_code == 400
+
+    async def expected_facets(self) -> dict:
+        """
+        The facets counted one by one in Python
+        """
+        async with db_helper.db_helper.AsyncSessionFactory() as session:
+            products = {
+                p.id: p
+                for p in await session.scalars(
+                    select(Product).where(~Product.is_deleted)
+                )
+            }
+            offers = [
+                o
+                for o in await session.scalars(select(Offer).where(~Offer.is_deleted))
+                if o.product_id in products
+            ]
+            categories = {
+                s.id: s.category_id for s in await session.scalars(select(SubCategory))
+            }
+
+        placeholder = settings.IMAGE_PLACEHOLDER_URL
+        product_of = {o.id: products[o.product_id] for o in offers}
+        return {
+            "total": (len(products), len(offers)),
+            "sub_categories": (
+                Counter(p.sub_category_id for p in products.values()),
+                Counter(p.sub_category_id for p in product_of.values()),
+            ),
+            "categories": (
+                Counter(categories[p.sub_category_id] for p in products.values()),
+                Counter(categories[p.sub_category_id] for p in product_of.values()),
+            ),
+            "stock": (
+                sum(o.quantity > 0 for o in offers),
+                sum(o.quantity <= 0 for o in offers),
+            ),
+            "image": (
+                sum(
+                    (p.image_url or placeholder) != placeholder
+                    for p in product_of.values()
+                ),
+                sum(
+                    (p.image_url or placeholder) == placeholder
+                    for p in product_of.values()
+                ),
+            ),
+        }
+
+    async def test_facet_counts_match_a_plain_count(self, auth_client: AsyncClient):
+        async with db_helper.db_helper.AsyncSessionFactory() as session:
+            # deleted rows are not counted, nor the offers of a deleted product
+            await session.execute(
+                update(Product)
+                .where(Product.id == "7862dafc-79aa-4120-a258-4fcdf9dc0ed7")
+                .values(is_deleted=True)
+            )
+            # spread the products over sub-categories of two categories
+            for product_id, sub_category_id in [
+                (
+                    "53505bb5-988c-4b86-881a-a6c3af5a5b64",
+                    "c9ce04fe-ed38-4006-8e5d-629d8503a90a",
+                ),
+                (
+                    "870a7406-4517-4ea6-aaa2-3c7fa9123f21",
+                    "a3b84e36-9e03-495b-8e74-cd841405e6fe",
+                ),
+            ]:
+                await session.execute(
+                    update(Product)
+                    .where(Product.id == product_id)
+                    .values(sub_category_id=sub_category_id)
+                )
+            await session.execute(
+                update(Offer)
+                .where(Offer.id == "d8b5eb1c-5c52-4e04-9fa9-93c97f41c717")
+                .values(is_deleted=True)
+            )
+            await session.commit()
+        expected = await self.expected_facets()
+
+        async with db_helper.db_helper.AsyncSessionFactory() as session:
+            facets = await FacetService.calculate_facets(session)
+
+        assert (facets.total_products, facets.total_offers) == expected["total"]
+        assert (facets.stock.in_stock, facets.stock.out_of_stock) == expected["stock"]
+        assert (facets.image.with_image, facets.image.without_image) == expected[
+            "image"
+        ]
+        products, offers = expected["sub_categories"]
+        assert {
+            f.sub_category_id: (f.product_count, f.offer_count)
+            for f in facets.sub_categories
+        } == {_id: (count, offers[_id]) for _id, count in products.items()}
+        products, offers = expected["categories"]
+        assert {
+            f.category_id: (f.product_count, f.offer_count) for f in facets.categories
+        } == {_id: (count, offers[_id]) for _id, count in products.items()}
+
+        # the route serves the same, from Redis the second time
+        from src.__main__ import app
+
+        await app.state.redis.delete(FACETS_CACHE_KEY)
+        for _ in range(2):
+            res = await auth_client.get(f"{self.ENDPOINT}/products/facets")
+            assert res.status_code == 200, res.text
+            assert res.json() == facets.model_dump(mode="json")
+        assert await app.state.redis.exists(FACETS_CACHE_KEY)
@@ -0,0 +1,40 @@
+from httpx import AsyncClient
+
+
+class TestCartQuote:
+    ENDPOINT = "/cart/quote"
+    offer_id = "d8b5eb1c-5c52-4e04-9fa9-93c97f41c717"
+    fake_offer_id = "980940df-9615-42dd-b72a-8779ae508efa"
+
+    async def test_quote_requires_auth(self, client: AsyncClient):
+        # the session client keeps the token of an earlier auth_client test
+        client.headers.pop("Authorization", None)
+        res = await client.post(
+            self.ENDPOINT, json=[{"offer_id": self.offer_id, "qty": 1}]
+        )
+        assert res.status_code == 401
+
+    async def test_quote_prices_and_stock(self, auth_client: AsyncClient):
+        res = await auth_client.post(
+            self.ENDPOINT,
+            json=[
+                {"offer_id": self.offer_id, "qty": 1},
+                {"offer_id": self.offer_id, "qty": 2},
+                {"offer_id": self.fake_offer_id, "qty": 1},
+            ],
+        )
+        assert res.status_code == 200
+
+        response = res.json()
+        # the test user is USER_RETAIL, the offer is out of stock
+        assert response["customer_type"] == "USER_RETAIL"
+        assert response["missing"] == [self.fake_offer_id]
+        assert len(response["lines"]) == 1
+
+        line = response["lines"][0]
+        assert line["qty"] == 3
+        assert line["price_rub"] == 838
+        assert line["line_total_rub"] == 838 * 3
+        assert line["in_stock"] is False
+        assert response["total_rub"] == 838 * 3
+        assert response["is_available"] is False
@@ -124,6 +124,24 @@ class TestCategoryRoutes:
         assert response["slug"] == new_slug
         assert response["image_url"] != old_image_url
         assert response["image_url"] is not None, "Image couldn't be null"
+        # uploaded to S3 after the commit
+        assert response["image_status"] == "PENDING"
+
+    async def test_patch_category_refreshes_tree(self, auth_client: AsyncClient):
+        category_id = "2b3fb1a9-f13b-430f-a78e-94041fb0ed44"
+        # the tree is loaded and kept in process
+        res = await auth_client.get(f"{self.ENDPOINT}/{category_id}")
+        assert res.status_code == 200
+
+        auth_client.headers.pop("Content-Type", None)
+        files = {"name": (None, "tree patch", "text/plain")}
+        res = await auth_client.patch(f"{self.ENDPOINT}/{category_id}", files=files)
+        assert res.status_code == 200
+
+        # invalidated after the commit: reloaded with the new name
+        res = await auth_client.get(f"{self.ENDPOINT}/{category_id}")
+        assert res.status_code == 200
+        assert res.json()["name"] == "tree patch"
 
     async def test_unauthorized_delete_category_returns_401(self, client: AsyncClient):
         pass
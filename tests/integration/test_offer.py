@@ -0,0 +1,147 @@
+from pathlib import Path
+
+from httpx import AsyncClient
+from sqlalchemy import update
+from src.api.di import db_helper
+from src.config import settings
+from src.models import Offer, Product
+
+MOCK_DIR = Path(__file__).parent.parent / "mock"
+
+
+class TestOfferRoutes:
+    ENDPOINT = "/offers"
+    offer_id = "d8b5eb1c-5c52-4e04-9fa9-93c97f41c717"
+    product_id = "a488d937-346b-4fb5-ac87-cfadf1a7a3ec"
+
+    def _form(self, price_rub: int) -> dict:
+        return {
+            "brand": (None, "FORD", "text/plain"),
+            "manufacturer_number": (None, "1686133", "text/plain"),
+            "price_rub": (None, str(price_rub), "text/plain"),
+            "super_wholesale_price_rub": (None, "670", "text/plain"),
+            "product_id": (None, self.product_id, "text/plain"),
+        }
+
+    async def test_patch_with_stale_if_match_returns_409(
+        self, auth_client: AsyncClient
+    ):
+        auth_client.headers.pop("Content-Type", None)
+        res = await auth_client.get(f"{self.ENDPOINT}/{self.offer_id}")
+        version = res.json()["version"]
+
+        res = await auth_client.patch(
+            f"{self.ENDPOINT}/{self.offer_id}",
+            files=self._form(900),
+            headers={"If-Match": f'"{version}"'},
+        )
+        assert res.status_code == 200
+        assert res.json()["version"] == version + 1
+        assert res.headers["ETag"] == f'"{version + 1}"'
+
+        # a second editor still holding the old version
+        res = await auth_client.patch(
+            f"{self.ENDPOINT}/{self.offer_id}",
+            files=self._form(950),
+            headers={"If-Match": f'"{version}"'},
+        )
+        assert res.status_code == 409
+        assert res.headers["ETag"] == f'"{version + 1}"'
+
+        res = await auth_client.get(f"{self.ENDPOINT}/{self.offer_id}")
+        assert res.json()["price_rub"] == 900
+
+    async def test_rejected_patch_drops_the_spooled_image(
+        self, auth_client: AsyncClient, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "IMAGE_SPOOL_DIR", str(tmp_path))
+        auth_client.headers.pop("Content-Type", None)
+        res = await auth_client.get(f"{self.ENDPOINT}/{self.offer_id}")
+        stale = f'"{res.json()["version"] - 1}"'
+        image = (MOCK_DIR / "candles.webp").read_bytes()
+
+        res = await auth_client.patch(
+            f"{self.ENDPOINT}/{self.offer_id}",
+            files={
+                **self._form(900),
+                "image_blob": ("candles.webp", image, "image/webp"),
+            },
+            headers={"If-Match": stale},
+        )
+        assert res.status_code == 409
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_conditional_get_until_changed(self, auth_client: AsyncClient):
+        auth_client.headers.pop("Content-Type", None)
+        res = await auth_client.get(self.ENDPOINT)
+        etag, last_modified = res.headers["ETag"], res.headers["Last-Modified"]
+
+        res = await auth_client.get(self.ENDPOINT, headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+        res = await auth_client.get(
+            self.ENDPOINT, headers={"If-Modified-Since": last_modified}
+        )
+        assert res.status_code == 304
+
+        res = await auth_client.patch(
+            f"{self.ENDPOINT}/{self.offer_id}", files=self._form(900)
+        )
+        assert res.status_code == 200
+
+        res = await auth_client.get(self.ENDPOINT, headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["ETag"] != etag
+
+    async def test_get_etag_is_taken_by_patch_if_match(self, auth_client: AsyncClient):
+        auth_client.headers.pop("Content-Type", None)
+        res = await auth_client.get(f"{self.ENDPOINT}/{self.offer_id}")
+        etag = res.headers["ETag"]
+        assert etag == f'"{res.json()["version"]}"'
+        assert res.headers["Last-Modified"]
+
+        res = await auth_client.patch(
+            f"{self.ENDPOINT}/{self.offer_id}",
+            files=self._form(900),
+            headers={"If-Match": etag},
+        )
+        assert res.status_code == 200, res.text
+
+        # the copy the client holds is outdated now
+        res = await auth_client.get(
+            f"{self.ENDPOINT}/{self.offer_id}", headers={"If-None-Match": etag}
+        )
+        assert res.status_code == 200
+        assert res.headers["ETag"] != etag
+        res = await auth_client.patch(
+            f"{self.ENDPOINT}/{self.offer_id}",
+            files=self._form(950),
+            headers={"If-Match": etag},
+        )
+        assert res.status_code == 409
+
+    async def test_missing_offer_returns_404(self, client: AsyncClient):
+        res = await client.get(f"{self.ENDPOINT}/{self.product_id}")
+        assert res.status_code == 404
+
+    async def test_compact_image_matches_full_view(self, client: AsyncClient):
+        # no image of its own: the product's CARD variant is shown
+        async with db_helper.db_helper.AsyncSessionFactory() as session:
+            await session.execute(
+                update(Offer).where(Offer.id == self.offer_id).values(image_url=None)
+            )
+            await session.execute(
+                update(Product)
+                .where(Product.id == self.product_id)
+                .values(has_image_variants=True)
+            )
+            await session.commit()
+
+        res = await client.get(f"{self.ENDPOINT}/{self.offer_id}")
+        image_url = res.json()["image_url"]
+        assert image_url.endswith("/card.webp")
+
+        res = await client.get(self.ENDPOINT, params={"view": "compact", "size": 100})
+        assert res.status_code == 200
+        (item,) = [i for i in res.json()["items"] if i["id"] == self.offer_id]
+        assert item["image_url"] == image_url
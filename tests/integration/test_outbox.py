@@ -0,0 +1,36 @@
+from fakeredis import FakeAsyncRedis
+from sqlalchemy import select, text
+from src.api.di import db_helper
+from src.api.services import outbox_service
+from src.api.services.outbox_service import OutboxDispatcher, OutboxService
+from src.common.services.job_queue import JobQueue
+from src.models import OutboxEvent
+from src.schemas.common.enums import OutboxTopic
+
+
+async def test_db_error_of_a_topic_is_recorded(monkeypatch):
+    async def broken(dispatcher, session, payloads):
+        await session.execute(text("SELECT 1 / 0"))
+
+    async def handled(dispatcher, session, payloads):
+        await session.execute(text("SELECT 1"))
+
+    monkeypatch.setitem(outbox_service.HANDLERS, OutboxTopic.ORDER_CREATED, broken)
+    monkeypatch.setitem(
+        outbox_service.HANDLERS, OutboxTopic.OFFER_PRICE_CHANGED, handled
+    )
+    async with db_helper.db_helper.AsyncSessionFactory() as session:
+        OutboxService.add(session, OutboxTopic.ORDER_CREATED, {"order_id": "o1"})
+        OutboxService.add(session, OutboxTopic.OFFER_PRICE_CHANGED, {"tags": []})
+        await session.commit()
+
+    redis = FakeAsyncRedis(decode_responses=True)
+    assert await OutboxDispatcher(redis, JobQueue(redis)).dispatch_batch() == 2
+
+    async with db_helper.db_helper.AsyncSessionFactory() as session:
+        events = {e.topic: e for e in await session.scalars(select(OutboxEvent))}
+    # the aborted statement is rolled back to the savepoint, not the whole batch
+    failed = events[OutboxTopic.ORDER_CREATED]
+    assert (failed.attempts, failed.processed_at) == (1, None)
+    assert "division by zero" in failed.error
+    assert events[OutboxTopic.OFFER_PRICE_CHANGED].processed_at is not None
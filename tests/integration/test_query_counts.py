@@ -0,0 +1,95 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.common.services.response_cache import CACHE_PREFIX
+
+
+@pytest.fixture
+async def queries(client: AsyncClient):
+    """
+    Statements sent to the database during the test.
+    Relationships are lazy="raise": a lazy load inside a request fails it with
+    InvalidRequestError, so the counts below are exactly what the DAOs declare.
+    """
+    # first connect of the engine runs the dialect's own queries
+    await client.get("/offers/meta/count")
+
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def cache(client: AsyncClient, response_cache):
+    """
+    The real response cache, emptied: the first request of the test is a miss
+    """
+    from src.__main__ import app
+
+    redis = app.state.redis
+    keys = [key async for key in redis.scan_iter(f"{CACHE_PREFIX}:*")]
+    if keys:
+        await redis.delete(*keys)
+
+
+class TestQueryCounts:
+    offer_id = "d8b5eb1c-5c52-4e04-9fa9-93c97f41c717"
+    product_id = "7862dafc-79aa-4120-a258-4fcdf9dc0ed7"
+
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            # watermark + page + total
+            ("/offers", 3),
+            ("/offers?view=compact", 3),
+            ("/products", 3),
+            # row with its joined parents, the validators are taken from it
+            (f"/offers/{offer_id}", 1),
+            (f"/products/{product_id}", 1),
+        ],
+    )
+    async def test_read_endpoints(
+        self, client: AsyncClient, queries: list[str], url: str, expected: int
+    ):
+        res = await client.get(url)
+        assert res.status_code == 200
+        assert len(queries) == expected, queries
+
+    @pytest.mark.parametrize(
+        "url",
+        ["/offers", "/products", f"/offers/{offer_id}", f"/products/{product_id}"],
+    )
+    async def test_cache_hit_does_not_query(
+        self, client: AsyncClient, cache, queries: list[str], url: str
+    ):
+        res = await client.get(url)
+        assert res.headers["X-Cache"] == "MISS"
+        queries.clear()
+
+        res = await client.get(url)
+        assert res.headers["X-Cache"] == "HIT"
+        assert res.headers["ETag"]
+        # the validators are stored with the entry, no watermark query either
+        assert queries == []
+
+        res = await client.get(url, headers={"If-None-Match": res.headers["ETag"]})
+        assert res.status_code == 304
+        assert queries == []
+
+    async def test_catalogue_tree_is_loaded_once(
+        self, client: AsyncClient, queries: list[str]
+    ):
+        res = await client.get("/sub-categories")
+        assert res.status_code == 200
+        # categories + sub-categories with their category
+        assert len(queries) == 2, queries
+
+        res = await client.get("/categories")
+        assert res.status_code == 200
+        assert len(queries) == 2, queries
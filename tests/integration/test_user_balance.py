@@ -0,0 +1,56 @@
+from datetime import date
+
+from httpx import AsyncClient
+
+
+class TestUserBalanceRoutes:
+    ENDPOINT = "/balance"
+    user_id = "afd4fafb-86b3-4280-a829-f2fcdd9c203d"
+    fake_user_id = "980940df-9615-42dd-b72a-8779ae508efa"
+
+    async def test_statement_without_movements(self, client: AsyncClient):
+        today = date.today().isoformat()
+        res = await client.get(
+            f"{self.ENDPOINT}/statement/{self.user_id}?from={today}&to={today}"
+        )
+        assert res.status_code == 200
+
+        response = res.json()
+        assert response["opening_balance"] == 0
+        assert response["closing_balance"] == 0
+        assert response["movements"] == []
+
+    async def test_statement_reflects_adjustments(self, auth_client: AsyncClient):
+        for delta in (1000, -300):
+            res = await auth_client.post(
+                f"{self.ENDPOINT}/adjust/{self.user_id}"
+                f"?delta={delta}&reason=ADMIN_ADJUSTMENT"
+            )
+            assert res.status_code == 201
+
+        today = date.today().isoformat()
+        res = await auth_client.get(
+            f"{self.ENDPOINT}/statement/{self.user_id}"
+            f"?from={today}&to={today}&granularity=month"
+        )
+        assert res.status_code == 200
+
+        response = res.json()
+        assert response["opening_balance"] == 0
+        assert response["closing_balance"] == 700
+        assert response["total_credit"] == 1000
+        assert response["total_debit"] == 300
+        assert len(response["movements"]) == 1
+        assert response["movements"][0]["movements"] == 2
+
+    async def test_statement_invalid_period_returns_400(self, client: AsyncClient):
+        res = await client.get(
+            f"{self.ENDPOINT}/statement/{self.user_id}?from=2025-02-01&to=2025-01-01"
+        )
+        assert res.status_code == 400
+
+    async def test_statement_returns_404_if_user_missing(self, client: AsyncClient):
+        res = await client.get(
+            f"{self.ENDPOINT}/statement/{self.fake_user_id}?from=2025-01-01&to=2025-02-01"
+        )
+        assert res.status_code == 404
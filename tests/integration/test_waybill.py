@@ -0,0 +1,99 @@
+import asyncio
+
+from httpx import AsyncClient
+
+
+class TestWaybillRoutes:
+    ENDPOINT = "/waybills"
+    user_id = "afd4fafb-86b3-4280-a829-f2fcdd9c203d"
+    offer_ids = [
+        "d8b5eb1c-5c52-4e04-9fa9-93c97f41c717",
+        "d33d0aad-6f47-47ea-b170-c5980a78a263",
+        "15bbcb2a-88a1-4722-b608-ef26ae12b117",
+    ]
+
+    async def create_waybill(self, client: AsyncClient, offer_ids: list[str]) -> dict:
+        res = await client.post(
+            self.ENDPOINT,
+            json={
+                "waybill_type": "WAYBILL_IN",
+                "is_pending": True,
+                "waybill_offers": [
+                    {
+                        "offer_id": offer_id,
+                        "brand": "BSG",
+                        "manufacturer_number": f"BSG-{i}",
+                        "quantity": i + 1,
+                        "price_rub": 100,
+                    }
+                    for i, offer_id in enumerate(offer_ids)
+                ],
+            },
+        )
+        assert res.status_code == 201, res.text
+        return res.json()
+
+    async def test_commit_updates_stock_and_balance(self, auth_client: AsyncClient):
+        offer_id = self.offer_ids[1]
+        res = await auth_client.get(f"/offers/{offer_id}")
+        quantity, version = res.json()["quantity"], res.json()["version"]
+        waybill = await self.create_waybill(auth_client, [offer_id])
+        balance = waybill["customer"]["balance_rub"]
+
+        res = await auth_client.post(f"{self.ENDPOINT}/{waybill['id']}/commit")
+        assert res.status_code == 201, res.text
+        response = res.json()
+
+        # written together with the balance history, not overwritten by its reload
+        assert response["is_pending"] is False
+        assert response["customer"]["balance_rub"] > balance
+        res = await auth_client.get(f"/offers/{offer_id}")
+        assert res.json()["quantity"] == quantity + 1
+        # ORM writes bump the version too: an If-Match taken before is stale
+        assert response["version"] == waybill["version"] + 1
+        assert res.json()["version"] == version + 1
+        assert res.headers["ETag"] == f'"{version + 1}"'
+
+    async def test_commit_twice_returns_the_waybill(self, auth_client: AsyncClient):
+        waybill = await self.create_waybill(auth_client, self.offer_ids[:1])
+
+        for _ in range(2):
+            res = await auth_client.post(f"{self.ENDPOINT}/{waybill['id']}/commit")
+            assert res.status_code == 201, res.text
+            response = res.json()
+            assert response["is_pending"] is False
+            assert response["author"]["id"] == self.user_id
+            assert response["customer"]["id"] == self.user_id
+
+    async def test_concurrent_commits_count_the_stock_once(
+        self, auth_client: AsyncClient
+    ):
+        offer_id = self.offer_ids[2]
+        res = await auth_client.get(f"/offers/{offer_id}")
+        quantity = res.json()["quantity"]
+        waybill = await self.create_waybill(auth_client, [offer_id])
+
+        responses = await asyncio.gather(
+            *(
+                auth_client.post(f"{self.ENDPOINT}/{waybill['id']}/commit")
+                for _ in range(2)
+            )
+        )
+        assert [res.status_code for res in responses] == [201, 201]
+        res = await auth_client.get(f"/offers/{offer_id}")
+        assert res.json()["quantity"] == quantity + 1
+
+    async def test_full_lists_lines_in_document_order(self, auth_client: AsyncClient):
+        # one transaction: the lines share created_at
+        offer_ids = [*self.offer_ids, *reversed(self.offer_ids)]
+        waybill = await self.create_waybill(auth_client, offer_ids)
+
+        res = await auth_client.get(f"{self.ENDPOINT}/{waybill['id']}/full")
+        assert res.status_code == 200, res.text
+        lines = res.json()["waybill_offers"]
+        assert [line["offer_id"] for line in lines] == offer_ids
+        assert [line["quantity"] for line in lines] == list(range(1, 7))
+
+        res = await auth_client.get(f"{self.ENDPOINT}/{waybill['id']}/offers")
+        assert res.status_code == 200, res.text
+        assert res.json() == lines
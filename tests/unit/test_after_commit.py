@@ -0,0 +1,38 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.api.di.db_helper import after_commit, run_after_commit
+
+
+async def test_callbacks_run_only_after_commit():
+    calls = []
+    session = AsyncSession()
+
+    async with session.begin():
+        after_commit(session, calls.append, "committed")
+        await run_after_commit(session)
+        assert calls == []
+    await run_after_commit(session)
+
+    try:
+        async with session.begin():
+            after_commit(session, calls.append, "rolled back")
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    await run_after_commit(session)
+
+    assert calls == ["committed"]
+
+
+async def test_failed_callback_does_not_stop_the_others():
+    calls = []
+
+    async def fail():
+        raise ValueError("boom")
+
+    session = AsyncSession()
+    async with session.begin():
+        after_commit(session, fail)
+        after_commit(session, calls.append, "next")
+    await run_after_commit(session)
+
+    assert calls == ["next"]
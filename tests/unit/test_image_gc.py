@@ -0,0 +1,163 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from src.api.services import image_gc_service
+from src.api.services.image_gc_service import ImageGCService
+from src.api.services.image_upload_service import (
+    IMAGE_GC_KEY,
+    IMAGE_INDEX_KEY,
+    ImageUploadQueue,
+)
+from src.schemas.common.enums import ImageStatus, ImageVariant
+from src.utils.image_variants import variant_key
+
+BASE_URL = "https://s3.test/bucket/"
+OLD = datetime.now(UTC) - timedelta(days=2)
+NEW = datetime.now(UTC)
+
+
+class FakeS3:
+    def __init__(self, objects: dict[str, datetime], fail: set[str] = frozenset()):
+        self.objects = {
+            key: {"Key": key, "Size": 10, "LastModified": modified}
+            for key, modified in objects.items()
+        }
+        self.fail = fail
+        self.deletes: list[list[str]] = []
+
+    async def list_prefixes(self, prefix: str, delimiter: str = "/"):
+        rest = {
+            key: key[len(prefix) :] for key in self.objects if key.startswith(prefix)
+        }
+        prefixes = sorted(
+            {
+                prefix + tail.split(delimiter)[0] + delimiter
+                for tail in rest.values()
+                if delimiter in tail
+            }
+        )
+        objects = [
+            self.objects[key] for key, tail in rest.items() if delimiter not in tail
+        ]
+        return prefixes, objects
+
+    async def list_objects(self, prefix: str):
+        return [obj for key, obj in self.objects.items() if key.startswith(prefix)]
+
+    async def remove_files(self, keys: list[str]) -> list[str]:
+        self.deletes.append(keys)
+        for key in keys:
+            if key not in self.fail:
+                self.objects.pop(key)
+        return [key for key in keys if key in self.fail]
+
+    def get_key_from_url(self, url: str) -> str | None:
+        return url[len(BASE_URL) :] if url.startswith(BASE_URL) else None
+
+
+class FakeDAO:
+    def __init__(self, *keys: str):
+        self.urls = {BASE_URL + key for key in keys}
+
+    async def get_image_urls(self, db_session) -> set[str]:
+        return set(self.urls)
+
+
+@pytest.fixture
+def dao(monkeypatch):
+    dao = FakeDAO("images/p/kept.png")
+    dao.urls.add("https://example.com/external.png")
+    monkeypatch.setattr(image_gc_service, "IMAGE_DAOS", (dao,))
+    return dao
+
+
+@pytest.fixture
+def redis():
+    return FakeAsyncRedis(decode_responses=True)
+
+
+def run(s3, redis, **kwargs):
+    kwargs.setdefault("fence", timedelta(0))
+    return ImageGCService.run(None, s3, redis, dry_run=False, **kwargs)
+
+
+async def test_orphans_are_diffed_against_rows_and_their_variants(dao, redis):
+    s3 = FakeS3(
+        {
+            "images/p/kept.png": OLD,
+            variant_key("images/p/kept.png", ImageVariant.CARD): OLD,
+            "images/p/replaced.png": OLD,
+            variant_key("images/p/replaced.png", ImageVariant.CARD): OLD,
+            # not committed yet, maybe
+            "images/p/fresh.png": NEW,
+            "images/root.png": OLD,
+        }
+    )
+
+    report = await ImageGCService.run(None, s3, redis)
+    assert (report.listed, report.referenced, report.orphans) == (6, 2, 3)
+    assert s3.deletes == []
+
+    report = await run(s3, redis)
+    assert report.deleted == 3
+    assert sorted(s3.objects) == [
+        "images/p/fresh.png",
+        "images/p/kept.png",
+        variant_key("images/p/kept.png", ImageVariant.CARD),
+    ]
+
+
+async def test_deletes_in_batches(dao, redis, monkeypatch):
+    monkeypatch.setattr(image_gc_service, "DELETE_BATCH_SIZE", 2)
+    orphans = [f"images/p/{i}.png" for i in range(5)]
+    s3 = FakeS3(dict.fromkeys(orphans, OLD), fail={orphans[4]})
+    await redis.hset(IMAGE_INDEX_KEY, mapping=dict.fromkeys(orphans, 1))
+
+    report = await run(s3, redis)
+
+    assert [len(batch) for batch in s3.deletes] == [2, 2, 1]
+    assert (report.deleted, report.failed) == (4, 1)
+    # a failed key is uploaded again next time, not reused
+    assert not await redis.hlen(IMAGE_INDEX_KEY)
+    assert not await redis.exists(IMAGE_GC_KEY)
+
+
+async def test_row_committed_during_the_fence_keeps_its_image(dao, redis):
+    key = "images/p/reused.png"
+    s3 = FakeS3({key: OLD})
+    await redis.hset(IMAGE_INDEX_KEY, key, 1)
+    uploads = ImageUploadQueue()
+    uploads._redis = redis
+    # a request read the index before the GC started
+    assert (await uploads.image_state(key))["image_status"] == ImageStatus.READY
+
+    gc = asyncio.create_task(run(s3, redis, fence=timedelta(seconds=0.1)))
+    await asyncio.sleep(0.05)
+    # tombstoned: a new request uploads it again instead
+    assert (await uploads.image_state(key))["image_status"] == ImageStatus.PENDING
+    # ...while the first one commits its row
+    dao.urls.add(BASE_URL + key)
+
+    report = await gc
+    assert report.deleted == 0
+    assert key in s3.objects
+    assert not await redis.exists(IMAGE_GC_KEY)
+
+
+async def test_upload_of_a_tombstoned_key_waits_for_the_gc(redis, monkeypatch):
+    monkeypatch.setattr(
+        "src.api.services.image_upload_service.IMAGE_GC_POLL_INTERVAL", 0.01
+    )
+    key = "images/p/reused.png"
+    await redis.sadd(IMAGE_GC_KEY, key)
+    uploads = ImageUploadQueue()
+    uploads._redis = redis
+
+    waiting = asyncio.create_task(uploads._wait_collected(key))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    await redis.srem(IMAGE_GC_KEY, key)
+    await asyncio.wait_for(waiting, 1)
@@ -0,0 +1,23 @@
+import io
+
+from PIL import Image
+from src.schemas.common.enums import ImageVariant
+from src.utils.image_variants import IMAGE_VARIANT_SIZES, render_variants, variant_key
+
+
+def test_variant_key_is_derived_from_the_original():
+    assert variant_key("images/tmp/ab12.png", ImageVariant.CARD) == (
+        "images/tmp/ab12/card.webp"
+    )
+
+
+def test_render_variants_downscales_only(tmp_path):
+    path = tmp_path / "original.png"
+    Image.new("RGB", (1000, 500), "red").save(path)
+
+    variants = render_variants(str(path))
+
+    for variant, data in variants.items():
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.format == "WEBP"
+            assert image.width == min(IMAGE_VARIANT_SIZES[variant], 1000)
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from src.common.services.job_queue import CronJob, JobDefinition, JobQueue, Worker
+from src.config import settings
+from src.schemas.common.enums import JobStatus
+
+
+@pytest.fixture
+def redis():
+    return FakeAsyncRedis(decode_responses=True)
+
+
+async def wait_for_status(queue: JobQueue, job_id: str, status: JobStatus) -> dict:
+    for _ in range(200):
+        job = await queue.get_job(job_id)
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{job_id} is {job['status']}, not {status}")
+
+
+async def test_failed_job_is_retried(redis, monkeypatch):
+    monkeypatch.setattr(settings.WORKER, "WORKER_POLL_DELAY", 0.01)
+    monkeypatch.setattr(settings.WORKER, "JOB_RETRY_BACKOFF", 0)
+    calls = []
+
+    async def flaky(ctx, value):
+        calls.append(value)
+        if len(calls) < 2:
+            raise RuntimeError("boom")
+        return value * 2
+
+    worker = Worker(redis, {"flaky": JobDefinition(flaky, max_tries=3)})
+    running = asyncio.create_task(worker.run())
+    job_id, _ = await worker.queue.enqueue("flaky", {"value": 21})
+
+    job = await wait_for_status(worker.queue, job_id, JobStatus.COMPLETE)
+    worker.stop()
+    await running
+
+    assert job["result"] == 42
+    assert job["tries"] == 2
+    assert job["error"] == "RuntimeError: boom"
+
+
+async def test_job_key_is_queued_once(redis):
+    queue = JobQueue(redis)
+    first, queued = await queue.enqueue("feed", key="daily")
+    second, queued_again = await queue.enqueue("feed", key="daily")
+    assert (first, queued, queued_again) == (second, True, False)
+
+
+async def test_backlog_of_a_saturated_type_does_not_starve_others(redis, monkeypatch):
+    monkeypatch.setattr(settings.WORKER, "WORKER_MAX_JOBS", 2)
+    release = asyncio.Event()
+
+    async def mail(ctx, n):
+        await release.wait()
+
+    async def feed(ctx):
+        return "built"
+
+    worker = Worker(redis, {"mail": JobDefinition(mail), "feed": JobDefinition(feed)})
+    for n in range(50):
+        await worker.queue.enqueue("mail", {"n": n})
+    job_id, _ = await worker.queue.enqueue("feed")
+
+    await worker._poll()
+    job = await wait_for_status(worker.queue, job_id, JobStatus.COMPLETE)
+    assert job["result"] == "built"
+    assert worker._running["mail"] == 1
+
+    release.set()
+    await asyncio.gather(*worker._tasks)
+
+
+def test_cron_next_run():
+    now = datetime(2025, 1, 1, 3, 30)
+    assert CronJob("feed", minute=15).next_run(now) == datetime(2025, 1, 1, 4, 15)
+    assert CronJob("price", hour=3).next_run(now) == datetime(2025, 1, 2, 3, 0)
@@ -0,0 +1,21 @@
+from fakeredis import FakeAsyncRedis
+from src.api.services.outbox_service import OutboxDispatcher
+from src.common.services.job_queue import JOBS_QUEUE_KEY, JobQueue
+from src.config import settings
+
+
+async def test_events_are_fanned_out_to_deduplicated_jobs(monkeypatch):
+    # all in one debounce window
+    monkeypatch.setattr(settings.WORKER, "YML_FEED_DEBOUNCE", 10**9)
+    redis = FakeAsyncRedis(decode_responses=True)
+    dispatcher = OutboxDispatcher(redis, JobQueue(redis))
+
+    # the same order delivered twice: one confirmation email
+    await dispatcher._on_order_created(None, [{"order_id": "o1"}, {"order_id": "o1"}])
+    await dispatcher._on_order_created(None, [{"order_id": "o1"}])
+    # a burst of price changes: one deferred feed rebuild
+    for _ in range(3):
+        await dispatcher._on_offer_price_changed(None, [{"tags": ["offers:1"]}])
+
+    for name in ("order_email", "yml_feed"):
+        assert await redis.zcard(f"{JOBS_QUEUE_KEY}:{name}") == 1
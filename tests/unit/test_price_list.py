@@ -0,0 +1,37 @@
+import io
+
+from openpyxl import load_workbook
+from src.api.services.price_list_service import PriceListWriter
+from src.schemas.common.enums import PriceListExt, PriceListType
+
+ROWS = [
+    (
+        "Тормоза",
+        "Колодки",
+        "Колодки передние",
+        "CN-1",
+        "MARKON",
+        "6000",
+        "AA-1",
+        1001,
+        500,
+        3,
+    ),
+]
+
+
+def test_wholesale_csv_has_both_wholesale_tiers():
+    writer = PriceListWriter(PriceListExt.CSV, PriceListType.WHOLESALE)
+    writer.write(ROWS)
+    lines = writer.close().read().decode("utf-8-sig").splitlines()
+    assert (
+        lines[1] == "Тормоза;Колодки;Колодки передние;CN-1;MARKON;6000;AA-1;750;500;3"
+    )
+
+
+def test_retail_xlsx():
+    writer = PriceListWriter(PriceListExt.EXCEL, PriceListType.RETIAL)
+    writer.write(ROWS)
+    rows = list(load_workbook(io.BytesIO(writer.close().read())).active.values)
+    assert len(rows) == 2
+    assert rows[1][-2:] == (1001, 3)
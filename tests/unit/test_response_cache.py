@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import Response
+from redis.exceptions import RedisError
+from src.common.services.response_cache import ResponseCache
+
+KEY = "be-tcf:rc:test"
+TAGS = ["offers", "products:1"]
+
+
+@pytest.fixture
+def redis(response_cache):
+    return FakeAsyncRedis(decode_responses=True)
+
+
+def counter(body: bytes = b'{"n": 1}', delay: float = 0):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return Response(content=body, media_type="application/json")
+
+    return compute, calls
+
+
+async def test_second_request_is_a_hit(redis):
+    compute, calls = counter()
+
+    first = await ResponseCache.get_or_compute(redis, KEY, TAGS, compute)
+    second = await ResponseCache.get_or_compute(redis, KEY, TAGS, compute)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.body == b'{"n": 1}'
+    assert len(calls) == 1
+
+
+def conditional(etag: str = 'W/"1"'):
+    calls = []
+
+    async def validators():
+        calls.append(1)
+        return {"ETag": etag}
+
+    def not_modified(headers):
+        if headers["ETag"] == etag:
+            return Response(status_code=304, headers=headers)
+        return None
+
+    return validators, not_modified, calls
+
+
+async def test_validators_are_stored_with_the_entry(redis):
+    compute, calls = counter()
+    validators, _, validator_calls = conditional()
+
+    first = await ResponseCache.get_or_compute(
+        redis, KEY, TAGS, compute, validators=validators
+    )
+    second = await ResponseCache.get_or_compute(
+        redis, KEY, TAGS, compute, validators=validators
+    )
+
+    assert first.headers["ETag"] == second.headers["ETag"] == 'W/"1"'
+    assert second.headers["X-Cache"] == "HIT"
+    assert len(validator_calls) == 1
+
+
+async def test_not_modified_is_answered_from_the_entry(redis):
+    compute, calls = counter()
+    validators, not_modified, validator_calls = conditional()
+
+    # miss: validators first, the page isn't computed for a current client copy
+    res = await ResponseCache.get_or_compute(
+        redis, KEY, TAGS, compute, validators=validators, not_modified=not_modified
+    )
+    assert res.status_code == 304
+    assert calls == []
+
+    await ResponseCache.get_or_compute(redis, KEY, TAGS, compute, validators=validators)
+    res = await ResponseCache.get_or_compute(
+        redis, KEY, TAGS, compute, validators=validators, not_modified=not_modified
+    )
+    assert res.status_code == 304
+    assert len(calls) == 1
+    assert len(validator_calls) == 2
+
+
+async def test_tag_invalidation_is_a_miss(redis):
+    compute, calls = counter()
+    await ResponseCache.get_or_compute(redis, KEY, TAGS, compute)
+
+    # a tag the entry doesn't depend on
+    await ResponseCache.invalidate(redis, ["users"])
+    res = await ResponseCache.get_or_compute(redis, KEY, TAGS, compute)
+    assert res.headers["X-Cache"] == "HIT"
+
+    await ResponseCache.invalidate(redis, ["products:1"])
+    res = await ResponseCache.get_or_compute(redis, KEY, TAGS, compute)
+    assert res.headers["X-Cache"] == "MISS"
+    assert len(calls) == 2
+
+
+async def test_stale_entry_is_served_while_revalidating(redis):
+    compute, calls = counter()
+    await ResponseCache.get_or_compute(redis, KEY, TAGS, compute, ttl=0)
+
+    # another request holds the lock: the stale entry is served
+    await redis.set(f"{KEY}:lock", 1)
+    res = await ResponseCache.get_or_compute(redis, KEY, TAGS, compute, ttl=0)
+    assert res.headers["X-Cache"] == "STALE"
+    assert len(calls) == 1
+
+    # the lock is free: this request revalidates
+    await redis.delete(f"{KEY}:lock")
+    res = await ResponseCache.get_or_compute(redis, KEY, TAGS, compute, ttl=0)
+    assert res.headers["X-Cache"] == "MISS"
+    assert len(calls) == 2
+
+
+async def test_concurrent_misses_compute_once(redis, monkeypatch):
+    monkeypatch.setattr(ResponseCache, "POLL_INTERVAL", 0.01)
+    compute, calls = counter(delay=0.05)
+
+    responses = await asyncio.gather(
+        *(ResponseCache.get_or_compute(redis, KEY, TAGS, compute) for _ in range(5))
+    )
+
+    assert len(calls) == 1
+    assert sorted(res.headers["X-Cache"] for res in responses) == [
+        "HIT",
+        "HIT",
+        "HIT",
+        "HIT",
+        "MISS",
+    ]
+    assert not await redis.exists(f"{KEY}:lock")
+
+
+async def test_compute_error_is_raised_and_releases_the_lock(redis):
+    async def compute():
+        raise RedisError("the endpoint's own Redis call")
+
+    with pytest.raises(RedisError):
+        await ResponseCache.get_or_compute(redis, KEY, TAGS, compute)
+    assert not await redis.exists(f"{KEY}:lock")
+
+
+async def test_store_error_still_serves_the_body(redis, monkeypatch):
+    async def store(*args):
+        raise RedisError("write failed")
+
+    monkeypatch.setattr(ResponseCache, "_store", store)
+    compute, calls = counter()
+
+    res = await ResponseCache.get_or_compute(redis, KEY, TAGS, compute)
+    assert (res.headers["X-Cache"], res.body) == ("MISS", b'{"n": 1}')
@@ -0,0 +1,20 @@
+import orjson
+from src.schemas.offer_schema import OfferSchema
+from src.utils.serializer import compile_serializer
+from tech.benchmark_serializer import build_page
+
+
+def test_compiled_serializer_matches_pydantic():
+    dump = compile_serializer(OfferSchema)
+    for row in build_page()[:10]:
+        expected = orjson.loads(OfferSchema.model_validate(row).model_dump_json())
+        assert orjson.loads(orjson.dumps(dump(row))) == expected
+
+
+def test_compiled_serializer_overrides():
+    row = build_page()[0]
+    res = compile_serializer(OfferSchema)(row, overrides={"brand": "BSG"})
+    assert res["brand"] == "BSG"
+    assert res["wholesale_price_rub"] == int(
+        (row.price_rub + row.super_wholesale_price_rub) / 2
+    )
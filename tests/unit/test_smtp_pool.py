@@ -0,0 +1,42 @@
+import asyncio
+from email.message import EmailMessage
+
+from src.tasks.mailing import smtp_pool
+from src.tasks.mailing.smtp_pool import SMTPPool
+
+
+class FakeSMTP:
+    instances: list["FakeSMTP"] = []
+
+    def __init__(self, **_) -> None:
+        self.is_connected = False
+        self.connects = 0
+        self.sent = 0
+        FakeSMTP.instances.append(self)
+
+    async def connect(self) -> None:
+        self.is_connected = True
+        self.connects += 1
+
+    async def quit(self) -> None:
+        self.is_connected = False
+
+    def close(self) -> None:
+        self.is_connected = False
+
+    async def send_message(self, message: EmailMessage) -> None:
+        await asyncio.sleep(0)
+        self.sent += 1
+
+
+async def test_sessions_are_reused_and_reopened(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(smtp_pool.aiosmtplib, "SMTP", FakeSMTP)
+
+    async with SMTPPool(size=2, rate_limit=1000, messages_per_connection=5) as pool:
+        await asyncio.gather(*(pool.send(EmailMessage()) for _ in range(20)))
+
+    assert sum(smtp.sent for smtp in FakeSMTP.instances) == 20
+    # 20 messages, 5 per connection: 4 connects over the 2 sessions
+    assert sum(smtp.connects for smtp in FakeSMTP.instances) == 4
+    assert not any(smtp.is_connected for smtp in FakeSMTP.instances)
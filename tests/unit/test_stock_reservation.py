@@ -0,0 +1,93 @@
+from uuid import uuid4
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from src.api.dao.offer_dao import OfferDAO
+from src.api.services.stock_service import STOCK_EXPIRY_KEY, StockReservationService
+from src.common.exceptions.exceptions import InsufficientStockError
+
+OFFER_A = uuid4()
+OFFER_B = uuid4()
+
+
+@pytest.fixture
+def redis():
+    return FakeAsyncRedis(decode_responses=True)
+
+
+async def seed(redis):
+    await StockReservationService.reconcile(redis, {OFFER_A: 5, OFFER_B: 1})
+
+
+async def test_reserve_holds_every_line(redis):
+    await seed(redis)
+    order_id = uuid4()
+    assert await StockReservationService.reserve(
+        None, redis, order_id, {OFFER_A: 2, OFFER_B: 1}
+    )
+    # the same order again: nothing more is held
+    assert await StockReservationService.reserve(
+        None, redis, order_id, {OFFER_A: 2, OFFER_B: 1}
+    )
+
+    available = await StockReservationService.get_available(redis, [OFFER_A, OFFER_B])
+    assert available == {OFFER_A: 3, OFFER_B: 0}
+    assert await redis.zscore(STOCK_EXPIRY_KEY, str(order_id))
+
+
+async def test_reserve_is_all_or_nothing(redis):
+    await seed(redis)
+    with pytest.raises(InsufficientStockError) as e:
+        await StockReservationService.reserve(
+            None, redis, uuid4(), {OFFER_A: 2, OFFER_B: 3}
+        )
+
+    assert e.value.detail["offers"] == [
+        {"offer_id": str(OFFER_B), "requested": 3, "available": 1}
+    ]
+    available = await StockReservationService.get_available(redis, [OFFER_A, OFFER_B])
+    assert available == {OFFER_A: 5, OFFER_B: 1}
+
+
+async def test_missing_offer_is_short(redis, monkeypatch):
+    await seed(redis)
+
+    async def get_quantities(session, offer_ids):
+        return {}
+
+    monkeypatch.setattr(OfferDAO, "get_quantities", get_quantities)
+    missing = uuid4()
+
+    with pytest.raises(InsufficientStockError) as e:
+        await StockReservationService.reserve(
+            None, redis, uuid4(), {OFFER_A: 1, missing: 1}
+        )
+    assert e.value.detail["offers"] == [
+        {"offer_id": str(missing), "requested": 1, "available": 0}
+    ]
+
+
+async def test_release_is_idempotent(redis):
+    await seed(redis)
+    order_id = uuid4()
+    await StockReservationService.reserve(None, redis, order_id, {OFFER_A: 4})
+
+    await StockReservationService.release(redis, order_id)
+    await StockReservationService.release(redis, order_id)
+
+    available = await StockReservationService.get_available(redis, [OFFER_A])
+    assert available == {OFFER_A: 5}
+    assert not await redis.exists(StockReservationService._reservation_key(order_id))
+    assert await redis.zcard(STOCK_EXPIRY_KEY) == 0
+
+
+async def test_reconcile_consumes_fulfilled_orders(redis):
+    await seed(redis)
+    order_id = uuid4()
+    await StockReservationService.reserve(None, redis, order_id, {OFFER_A: 4})
+
+    # the waybill of the order took its 4 from the stock
+    await StockReservationService.reconcile(redis, {OFFER_A: 1}, [order_id])
+
+    available = await StockReservationService.get_available(redis, [OFFER_A])
+    assert available == {OFFER_A: 1}